@@ -0,0 +1,79 @@
+"""
+Compares memory use and lookups/sec of the DuplicatesPipeline dedup stores.
+
+    python benchmarks/dedup_benchmark.py --keys 1000000
+
+Every store sees each key twice (first insert, then a duplicate lookup), like a polling crawl re-scraping
+the same quotes. "set" is the unbounded set DuplicatesPipeline used to keep, MemoryDedupStore is sized to
+hold every key so no eviction skews the comparison. Memory is the tracemalloc peak while filling the store.
+"""
+import argparse
+import time
+import tracemalloc
+
+import synthetic  # noqa: F401 (puts the project root on sys.path)
+
+from diamond_scraper.utils.dedup_store import BloomDedupStore, MemoryDedupStore
+
+
+class SetStore:
+    def __init__(self):
+        self.keys = set()
+
+    def seen(self, key):
+        if key in self.keys:
+            return True
+        self.keys.add(key)
+        return False
+
+
+def make_keys(count):
+    return [("StockItem", synthetic.TICKERS[i % len(synthetic.TICKERS)], str(i)) for i in range(count)]
+
+
+def run(name, make_store, keys):
+    # tracemalloc slows every allocation down, so memory and speed are measured on separate stores
+    tracemalloc.start()
+    store = make_store()
+    for key in keys:
+        store.seen(key)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    store = make_store()
+    start = time.perf_counter()
+    for key in keys:
+        store.seen(key)
+    insert_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    duplicates = sum(store.seen(key) for key in keys)
+    lookup_seconds = time.perf_counter() - start
+
+    print(f"{name:<8} {peak / 2 ** 20:>10.1f} {len(keys) / insert_seconds:>14,.0f} "
+          f"{len(keys) / lookup_seconds:>14,.0f} {duplicates / len(keys):>10.2%}")
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dedup store memory and throughput benchmark")
+    parser.add_argument("--keys", type=int, default=1000000, help="Number of distinct item keys")
+    parser.add_argument("--error-rate", type=float, default=0.001, help="Bloom filter false positive rate")
+    args = parser.parse_args()
+
+    keys = make_keys(args.keys)
+    print(f"{'store':<8} {'peak MiB':>10} {'inserts/sec':>14} {'lookups/sec':>14} {'dup hits':>10}")
+    run("set", SetStore, keys)
+    run("memory", lambda: MemoryDedupStore(max_entries=args.keys), keys)
+    bloom = run("bloom", lambda: BloomDedupStore(capacity=args.keys, error_rate=args.error_rate), keys)
+
+    # Fresh keys that were never inserted, every hit is a false positive
+    estimated = bloom.stats()["bloom_estimated_fp_rate"]
+    unseen = [("StockItem", "UNSEEN", str(i)) for i in range(min(args.keys, 100000))]
+    false_positives = sum(bloom.seen(key) for key in unseen)
+    print(f"\nbloom false positive rate: {false_positives / len(unseen):.4%} measured, "
+          f"{estimated:.4%} estimated")
+
+
+if __name__ == "__main__":
+    main()
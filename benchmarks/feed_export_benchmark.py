@@ -0,0 +1,95 @@
+"""
+Compares feed export throughput and output size of the JSON Lines exporters and storage options.
+
+    python benchmarks/feed_export_benchmark.py --items 100000
+
+- "jsonlines": Scrapy's JsonLinesItemExporter, the format FEEDS used so far (it ignores the indent option)
+- "fastjsonlines": FastJsonLinesItemExporter (orjson if installed, stdlib otherwise), plain file
+- "fastjsonlines+gzip/zstd": the same through RotatingFileFeedStorage, compressed segments
+Items are normalized StockItems, written to a temporary directory.
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from synthetic import make_stock_items
+
+from scrapy import Spider
+from scrapy.exporters import JsonLinesItemExporter
+from scrapy.utils.test import get_crawler
+
+from diamond_scraper.exporters import fast_exporters
+from diamond_scraper.exporters.fast_exporters import FastJsonLinesItemExporter
+from diamond_scraper.exporters.rotating_storage import RotatingFileFeedStorage, zstandard
+from diamond_scraper.pipelines.core_pipelines import NormalizationPipeline
+
+
+class PlainFile:
+    """
+    Plain file opened like a feed storage would, counting what reaches the disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def open(self):
+        return open(self.path, "wb")
+
+    def size(self, file):
+        return os.path.getsize(self.path)
+
+
+class RotatingStorage:
+    def __init__(self, path, compression):
+        self.storage = RotatingFileFeedStorage(f"rotating:{path}", feed_options={
+            "compression": compression, "rotate_bytes": 64 * 1024 * 1024})
+
+    def open(self):
+        return self.storage.open(None)
+
+    def size(self, file):
+        return file.bytes_written
+
+
+def run(name, exporter_class, target, items, **options):
+    file = target.open()
+    exporter = exporter_class(file, encoding="utf8", **options)
+    start = time.perf_counter()
+    exporter.start_exporting()
+    for item in items:
+        exporter.export_item(item)
+    exporter.finish_exporting()
+    file.close()
+    elapsed = time.perf_counter() - start
+    size = target.size(file) / 1024 / 1024
+    print(f"{name:<26} {len(items) / elapsed:>12.0f} {size:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feed export benchmark")
+    parser.add_argument("--items", type=int, default=100000, help="Number of StockItems to export")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    crawler = get_crawler(Spider)
+    spider = Spider.from_crawler(crawler, name="benchmark")
+    pipeline = NormalizationPipeline()
+    items = [pipeline.process_item(item, spider) for item in make_stock_items(args.items)]
+
+    encoder = "orjson" if fast_exporters.orjson is not None else "stdlib json"
+    print(f"{len(items)} items, fastjsonlines encodes with {encoder}\n")
+    print(f"{'mode':<26} {'items/sec':>12} {'MiB':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        run("jsonlines", JsonLinesItemExporter, PlainFile(os.path.join(directory, "a.jl")), items)
+        run("fastjsonlines", FastJsonLinesItemExporter, PlainFile(os.path.join(directory, "b.jl")), items)
+        run("fastjsonlines+gzip", FastJsonLinesItemExporter,
+            RotatingStorage(os.path.join(directory, "c.jl"), "gzip"), items)
+        if zstandard is not None:
+            run("fastjsonlines+zstd", FastJsonLinesItemExporter,
+                RotatingStorage(os.path.join(directory, "d.jl"), "zstd"), items)
+
+
+if __name__ == "__main__":
+    main()
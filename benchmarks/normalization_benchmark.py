@@ -0,0 +1,73 @@
+"""
+Measures normalization throughput on StockItems shaped like MarketWatch quotes.
+
+    python benchmarks/normalization_benchmark.py --items 50000
+
+- "legacy": DiamondScraperPipeline's string clean-up (lowercase, index slicing), whose output is still text
+- "normalization": NormalizationPipeline, typed values from the Field(normalizer=...) declarations
+Followed by values/sec of every parse_utils normalizer on the raw strings of its fields.
+"""
+import argparse
+import logging
+import time
+
+from synthetic import make_stock_items
+
+from scrapy import Spider
+from scrapy.utils.test import get_crawler
+
+from diamond_scraper.items import StockItem
+from diamond_scraper.pipelines.core_pipelines import DiamondScraperPipeline, NormalizationPipeline
+from diamond_scraper.utils import parse_utils
+
+
+def time_pipeline(pipeline, spider, items):
+    copies = [StockItem(item) for item in items]
+    start = time.perf_counter()
+    for item in copies:
+        pipeline.process_item(item, spider)
+    return len(items) / (time.perf_counter() - start), copies
+
+
+def time_normalizer(normalizer, values, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for value in values:
+            normalizer(value)
+    return len(values) * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quote normalization benchmark")
+    parser.add_argument("--items", type=int, default=50000, help="Number of synthetic StockItems")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes per normalizer")
+    args = parser.parse_args()
+
+    logging.getLogger("normalization").setLevel(logging.WARNING)
+    crawler = get_crawler(Spider)
+    spider = Spider.from_crawler(crawler, name="normalization")
+    items = make_stock_items(args.items)
+
+    legacy, _ = time_pipeline(DiamondScraperPipeline(), spider, items)
+    normalized, outputs = time_pipeline(NormalizationPipeline(), spider, items)
+    print(f"{'pipeline':<14} {'items/s':>12}")
+    print(f"{'legacy':<14} {legacy:>12,.0f}")
+    print(f"{'normalization':<14} {normalized:>12,.0f}")
+    print(f"\nsample: {dict(items[0])}\n     -> {dict(outputs[0])}")
+
+    print(f"\n{'normalizer':<12} {'fields':<40} {'values/s':>12}")
+    by_normalizer = {}
+    for field, meta in StockItem.fields.items():
+        if meta.get("normalizer"):
+            by_normalizer.setdefault(meta["normalizer"], []).append(field)
+    for name, fields in by_normalizer.items():
+        values = [item[field] for item in items for field in fields if field in item]
+        rate = time_normalizer(parse_utils.NORMALIZERS[name], values, args.repeat)
+        print(f"{name:<12} {', '.join(fields):<40} {rate:>12,.0f}")
+
+    ranges = [f"{item['dayLow']} - {item['dayHigh']}" for item in items]
+    print(f"{'range':<12} {'dayLow - dayHigh':<40} {time_normalizer(parse_utils.parse_range, ranges, args.repeat):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
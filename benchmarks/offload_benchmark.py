@@ -0,0 +1,112 @@
+"""
+Measures MarketWatch extraction throughput inline vs. offloaded to the process pool, per worker count.
+
+    python benchmarks/offload_benchmark.py --pages 400 --workers 1 2 4 8
+
+Every mode runs under the reactor, the way spider callbacks do:
+- "inline": extract_market_watch() on the reactor thread, one page per reactor iteration
+- "pool/N": ProcessOffloader with N spawned workers, at most 2*N pages in flight (workers are warmed up first)
+"reactor lag" is the worst delay of a 10ms LoopingCall during the run, i.e. how long other reactor work
+(downloads, Playwright I/O, pipelines) is held up by parsing. Scaling past one worker needs as many free cores.
+"""
+import argparse
+import os
+import time
+
+from synthetic import make_market_watch_pages
+
+from scrapy.http import HtmlResponse
+from twisted.internet import defer, task
+
+from diamond_scraper.spiders.base_spider import extract_market_watch
+from diamond_scraper.utils.offload import ProcessOffloader, run_extractor
+
+TICK = 0.01
+
+
+class LagMonitor:
+    """
+    Records the worst lateness of a LoopingCall firing every TICK seconds.
+    """
+
+    def __init__(self):
+        self.max_lag = 0.0
+        self.last = None
+        self.loop = task.LoopingCall(self.tick)
+
+    def tick(self):
+        now = time.perf_counter()
+        if self.last is not None:
+            self.max_lag = max(self.max_lag, now - self.last - TICK)
+        self.last = now
+
+    def start(self):
+        self.loop.start(TICK)
+
+    def stop(self):
+        self.loop.stop()
+
+
+@defer.inlineCallbacks
+def run_inline(reactor, pages):
+    monitor = LagMonitor()
+    monitor.start()
+    start = time.perf_counter()
+    for url, body in pages:
+        extract_market_watch(HtmlResponse(url=url, body=body, encoding="utf-8"))
+        yield task.deferLater(reactor, 0, lambda: None)  # Yield to the reactor between callbacks
+    elapsed = time.perf_counter() - start
+    monitor.stop()
+    return elapsed, monitor.max_lag
+
+
+@defer.inlineCallbacks
+def run_pool(pages, workers):
+    offloader = ProcessOffloader(max_workers=workers)
+    # Spawn and import in every worker before timing
+    yield defer.DeferredList([offloader.submit(run_extractor, extract_market_watch, url, body, "utf-8")
+                              for url, body in pages[:workers * 2]])
+
+    monitor = LagMonitor()
+    monitor.start()
+    start = time.perf_counter()
+    results = yield defer.DeferredList([offloader.submit(run_extractor, extract_market_watch, url, body, "utf-8")
+                                        for url, body in pages], consumeErrors=True)
+    elapsed = time.perf_counter() - start
+    monitor.stop()
+    offloader.shutdown()
+
+    failures = [result for success, result in results if not success]
+    if failures:
+        failures[0].raiseException()
+    return elapsed, monitor.max_lag, offloader.peak_in_flight
+
+
+@defer.inlineCallbacks
+def benchmark(reactor, args):
+    pages = make_market_watch_pages(args.pages, filler=args.filler)
+    size = sum(len(body) for _, body in pages) / len(pages) / 1024
+    print(f"{len(pages)} pages, {size:.0f} KiB on average, {os.cpu_count()} CPU cores\n")
+    print(f"{'mode':<10} {'pages/sec':>10} {'speedup':>8} {'reactor lag ms':>15} {'peak in flight':>15}")
+
+    elapsed, lag = yield run_inline(reactor, pages)
+    baseline = len(pages) / elapsed
+    print(f"{'inline':<10} {baseline:>10.1f} {1.0:>7.2f}x {lag * 1000:>15.1f} {'-':>15}")
+
+    for workers in args.workers:
+        elapsed, lag, peak = yield run_pool(pages, workers)
+        rate = len(pages) / elapsed
+        print(f"{f'pool/{workers}':<10} {rate:>10.1f} {rate / baseline:>7.2f}x {lag * 1000:>15.1f} {peak:>15}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process pool offload benchmark")
+    parser.add_argument("--pages", type=int, default=400, help="Number of synthetic quote pages")
+    parser.add_argument("--filler", type=int, default=300, help="Unrelated blocks per page (page size)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to run")
+    args = parser.parse_args()
+    task.react(benchmark, (args,))
+
+
+if __name__ == "__main__":
+    main()
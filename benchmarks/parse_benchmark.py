@@ -0,0 +1,132 @@
+"""
+Measures MarketWatch quote extraction over a corpus of saved HTML pages.
+
+    python benchmarks/parse_benchmark.py --fixtures benchmarks/fixtures/marketwatch --repeat 200
+
+- "css": the per-field response.css() extraction BaseSpider used before (kept below as a reference)
+- "compiled": extract_market_watch(), one pass to find the page regions, then lxml XPath objects compiled at
+  import run inside them, key data mapped by label
+Both run on already parsed pages (the parse is shared and reported separately) and must return the same
+fields for every fixture. "peak KiB/page" is the tracemalloc peak while extracting one page, measured in a
+separate run so tracing doesn't skew pages/sec.
+
+The bundled fixtures are synthetic pages with the MarketWatch markup BaseSpider relies on, saved quote pages
+(File > Save as, .html) can be dropped into the same directory.
+--min-pages-per-sec makes the run fail when compiled extraction is slower than the given rate.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+from synthetic import abs_path
+
+from scrapy.http import HtmlResponse
+
+from diamond_scraper.spiders.base_spider import extract_market_watch
+from diamond_scraper.utils.parse_utils import split_range
+
+DEFAULT_FIXTURES = os.path.join(abs_path, "benchmarks", "fixtures", "marketwatch")
+
+
+def css_extract_market_watch(response):
+    """
+    Extraction as BaseSpider.parse_market_watch did it before the compiled selectors.
+    """
+    table_items = response.css("div.region.region--primary ul.list.list--kv.list--col50 li.kv__item "
+                               "span.primary::text").getall()
+    dayLow, dayHigh = split_range(table_items[1]) or (None, None)
+    return dict(
+        tickerSymbol=response.css("span.company__ticker::text").get(),
+        name=response.css("h1.company__name::text").get(),
+        currency=response.css("h2.intraday__price sup.character::text").get(),
+        timestamp=response.css("span.timestamp__time bg-quote::text").get(),
+        timezone=response.css("span.timestamp__time::text").getall()[-1],
+        price=response.css("h2.intraday__price bg-quote::text").get(),
+        priceChange=response.css("h2.intraday__price sup.character::text").get(),
+        percentChange=response.css("h2.intraday__price bg-quote::text").get(),
+        open=table_items[0],
+        dayLow=dayLow,
+        dayHigh=dayHigh,
+        volume=response.css("div.range__header span.primary::text").get(),
+        avgVolume=table_items[15],
+        marketCap=table_items[3],
+        peRatio=table_items[8],
+        eps=table_items[9],
+    )
+
+
+def load_fixtures(directory):
+    responses = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, "rb") as fixture:
+            body = fixture.read()
+        responses.append(HtmlResponse(url=f"file://{os.path.abspath(path)}", body=body, encoding="utf-8"))
+    return responses
+
+
+def time_parse(responses, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for response in responses:
+            response.replace(body=response.body).selector  # noqa: B018 (a fresh response parses again)
+    return len(responses) * repeat / (time.perf_counter() - start)
+
+
+def time_extract(extractor, responses, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for response in responses:
+            extractor(response)
+    return len(responses) * repeat / (time.perf_counter() - start)
+
+
+def peak_memory(extractor, responses):
+    peaks = []
+    tracemalloc.start()
+    for response in responses:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        extractor(response)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    return sum(peaks) / len(peaks) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MarketWatch extraction benchmark")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="Directory of saved quote pages (*.html)")
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over the fixture corpus")
+    parser.add_argument("--min-pages-per-sec", type=float, default=0,
+                        help="Exit with an error if compiled extraction is slower than this")
+    args = parser.parse_args()
+
+    responses = load_fixtures(args.fixtures)
+    if not responses:
+        parser.error(f"No *.html fixtures in {args.fixtures}")
+    for response in responses:
+        response.selector  # noqa: B018 (parse once up front, both extractors share it)
+        expected, actual = css_extract_market_watch(response), extract_market_watch(response)
+        if expected != actual:
+            raise AssertionError(f"{response.url}: compiled extraction differs\n{expected}\n{actual}")
+
+    size = sum(len(response.body) for response in responses) / len(responses) / 1024
+    print(f"{len(responses)} fixtures, {size:.0f} KiB on average, {args.repeat} passes")
+    print(f"HTML parse: {time_parse(responses, max(1, args.repeat // 10)):.0f} pages/sec\n")
+    print(f"{'extractor':<10} {'pages/sec':>10} {'peak KiB/page':>14}")
+
+    rates = {}
+    for name, extractor in (("css", css_extract_market_watch), ("compiled", extract_market_watch)):
+        rates[name] = time_extract(extractor, responses, args.repeat)
+        print(f"{name:<10} {rates[name]:>10.0f} {peak_memory(extractor, responses):>14.1f}")
+    print(f"\nspeedup: {rates['compiled'] / rates['css']:.2f}x")
+
+    if args.min_pages_per_sec and rates["compiled"] < args.min_pages_per_sec:
+        print(f"compiled extraction below {args.min_pages_per_sec:.0f} pages/sec")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compares PostgreSQL write throughput for the row-insert path and the COPY bulk loader.
+
+Start a local Postgres container and point the DB_* environment variables at it:
+
+    docker run --rm -d -p 5432:5432 -e POSTGRES_PASSWORD=secret -e POSTGRES_DB=DWS_db postgres:16
+    DB_BACKEND=postgres python benchmarks/postgres_copy_benchmark.py --rows 20000
+
+Each mode writes into its own scratch table, which is dropped afterwards, and the row count is checked
+so the benchmark also serves as a smoke test of copy_items() against a real server.
+"""
+import argparse
+import os
+import time
+
+from synthetic import make_stock_items
+
+from diamond_scraper.utils import db_utils
+
+
+def run_mode(connection, mode, items, batch_size):
+    table_name = f"bench_stockitem_{mode}"
+    cursor = connection.cursor()
+    cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+
+    registry = db_utils.SchemaRegistry()
+    schema = registry.get_schema(cursor, items[0], table_name, backend="postgres")
+
+    start = time.perf_counter()
+    if mode == "row":
+        # Current path: one autocommitted INSERT per item
+        for item in items:
+            db_utils.insert_item(cursor, item, table_name, log=False, backend="postgres", schema=schema)
+    else:
+        for offset in range(0, len(items), batch_size):
+            batch = items[offset:offset + batch_size]
+            if mode == "executemany":
+                db_utils.insert_items(cursor, batch, table_name, log=False, backend="postgres", schema=schema)
+            else:
+                db_utils.copy_items(cursor, batch, table_name, schema, log=False)
+    elapsed = time.perf_counter() - start
+
+    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+    written = cursor.fetchone()[0]
+    cursor.execute(f"DROP TABLE {table_name}")
+
+    if written != len(items):
+        raise AssertionError(f"{mode}: expected {len(items)} rows, found {written}")
+    return len(items) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PostgreSQL COPY loader benchmark")
+    parser.add_argument("--rows", type=int, default=10000, help="Number of synthetic StockItems to write")
+    parser.add_argument("--batch-size", type=int, default=500, help="Items per executemany/COPY batch")
+    parser.add_argument("--modes", nargs="+", default=["row", "executemany", "copy"],
+                        choices=["row", "executemany", "copy"])
+    args = parser.parse_args()
+
+    if os.getenv("DB_BACKEND") != "postgres":
+        parser.error("set DB_BACKEND=postgres and the DB_* connection variables first")
+
+    items = make_stock_items(args.rows)
+    connection = db_utils.get_db_connection()
+    try:
+        for mode in args.modes:
+            rate = run_mode(connection, mode, items, args.batch_size)
+            print(f"{mode:<12} {rate:>12,.0f} rows/sec")
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
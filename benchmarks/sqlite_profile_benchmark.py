@@ -0,0 +1,74 @@
+"""
+Reports SQLite inserts/sec for each PRAGMA profile in db_utils.SQLITE_PROFILES.
+
+Rows are synthetic StockItem/IntoliItem values written into DWS_scraper.db-style tables (one table per item
+class, created through SchemaRegistry) in a scratch directory:
+
+    python benchmarks/sqlite_profile_benchmark.py --rows 20000 --batch-size 500 --commit-every 1
+
+"row" mode mirrors the unbatched pipeline (one INSERT per item, committed every --commit-every rows, like the
+pooled pipeline commits each write), "batch" mode mirrors DB_BATCH_ENABLED (executemany inside one transaction per
+batch). Only commits hit the journal and fsync, so "row" mode is where the synchronous/journal_mode profiles differ.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from synthetic import make_intoli_items, make_stock_items
+
+from diamond_scraper.utils import db_utils
+
+
+def run_profile(profile, items, batch_size, mode, commit_every=1):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "DWS_scraper.db")
+        connection = db_utils.get_db_connection(db_path=db_path,
+                                                sqlite_pragmas=db_utils.resolve_sqlite_pragmas(profile))
+        cursor = connection.cursor()
+        registry = db_utils.SchemaRegistry()
+
+        start = time.perf_counter()
+        if mode == "row":
+            for count, item in enumerate(items, 1):
+                schema = registry.get_schema(cursor, item)
+                db_utils.insert_item(cursor, item, schema.table_name, log=False, schema=schema)
+                if count % commit_every == 0:
+                    connection.commit()
+            connection.commit()
+        else:
+            for offset in range(0, len(items), batch_size):
+                batch = items[offset:offset + batch_size]
+                schema = registry.get_schema(cursor, batch[0])
+                with db_utils.batch_transaction(connection):
+                    db_utils.insert_items(cursor, batch, schema.table_name, log=False, schema=schema)
+        elapsed = time.perf_counter() - start
+
+        connection.close()
+    return len(items) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite profile benchmark")
+    parser.add_argument("--rows", type=int, default=10000, help="Rows per item class")
+    parser.add_argument("--batch-size", type=int, default=500, help="Items per batch transaction")
+    parser.add_argument("--commit-every", type=int, default=1, help="Rows per commit in row mode")
+    parser.add_argument("--profiles", nargs="+", default=list(db_utils.SQLITE_PROFILES),
+                        choices=list(db_utils.SQLITE_PROFILES))
+    args = parser.parse_args()
+
+    datasets = {
+        "stockitem": make_stock_items(args.rows),
+        "intoliitem": make_intoli_items(args.rows),
+    }
+
+    print(f"{'profile':<10} {'table':<12} {'row':>14} {'batch':>14}   (inserts/sec)")
+    for profile in args.profiles:
+        for table_name, items in datasets.items():
+            row_rate = run_profile(profile, items, args.batch_size, "row", args.commit_every)
+            batch_rate = run_profile(profile, items, args.batch_size, "batch")
+            print(f"{profile:<10} {table_name:<12} {row_rate:>14,.0f} {batch_rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
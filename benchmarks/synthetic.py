@@ -0,0 +1,155 @@
+import os
+import random
+import sys
+import datetime
+
+# Ensure the project root is on the module search path when run as a script
+abs_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if abs_path not in sys.path:
+    sys.path.append(abs_path)
+
+from diamond_scraper.items import StockItem, IntoliItem
+
+TICKERS = ["TSLA", "AAPL", "MSFT", "NVDA", "AMZN", "GOOG", "META", "AMD", "INTC", "NFLX"]
+
+
+def make_stock_items(count, seed=0):
+    """
+    Builds StockItems shaped like the raw MarketWatch values scraped by BaseSpider.
+    """
+    rng = random.Random(seed)
+    start = datetime.datetime(2025, 1, 2, 9, 30)
+    items = []
+    for i in range(count):
+        price = rng.uniform(5, 900)
+        low = price * rng.uniform(0.95, 1.0)
+        high = price * rng.uniform(1.0, 1.05)
+        timestamp = start + datetime.timedelta(seconds=15 * i)
+        items.append(StockItem(
+            tickerSymbol=rng.choice(TICKERS),
+            name="Synthetic Corp.",
+            currency="$",
+            timestamp=timestamp.strftime("%b %d, %Y %I:%M %p"),
+            timezone="EDT",
+            price=f"{price:.2f}",
+            priceChange=f"{rng.uniform(-20, 20):.2f}",
+            percentChange=f"{rng.uniform(-5, 5):.2f}%",
+            open=f"${price * rng.uniform(0.98, 1.02):.2f}",
+            dayLow=f"{low:.2f} ",
+            dayHigh=f" {high:.2f}",
+            volume=f"Volume: {rng.uniform(1, 150):.1f}M",
+            avgVolume=f"{rng.uniform(1, 150):.1f}M",
+            marketCap=f"${rng.uniform(1, 900):.1f}B",
+            peRatio=f"{rng.uniform(5, 120):.2f}",
+            eps=f"${rng.uniform(-2, 15):.2f}",
+        ))
+    return items
+
+
+def make_intoli_items(count, seed=0):
+    """
+    Builds IntoliItems with the {"status", "value"} dicts produced by IntoliSpider.
+    """
+    rng = random.Random(seed)
+    items = []
+    for _ in range(count):
+        item = IntoliItem()
+        for field_name in IntoliItem.fields:
+            status = rng.choice(["passed", "failed", "warn"])
+            item[field_name] = {"status": status, "value": rng.choice(["ok", "missing", "Mozilla/5.0", "1920x1080"])}
+        items.append(item)
+    return items
+
+
+# Labels of the MarketWatch key data list, in page order (BaseSpider reads entries by position)
+MARKET_WATCH_KEY_DATA = ["Open", "Day Range", "52 Week Range", "Market Cap", "Shares Outstanding", "Public Float",
+                         "Beta", "Rev. per Employee", "P/E Ratio", "EPS", "Yield", "Dividend", "Ex-Dividend Date",
+                         "Short Interest", "% of Float Shorted", "Average Volume"]
+
+
+def make_market_watch_pages(count, seed=0, filler=300):
+    """
+    Builds (url, body) pairs shaped like the MarketWatch quote pages parsed by BaseSpider.
+    filler adds that many unrelated news/navigation blocks, so pages have a realistic size to parse.
+    """
+    rng = random.Random(seed)
+    pages = []
+    for i in range(count):
+        ticker = rng.choice(TICKERS)
+        price = rng.uniform(5, 900)
+        values = [f"${price * rng.uniform(0.98, 1.02):.2f}",
+                  f"{price * 0.97:.2f} - {price * 1.03:.2f}",
+                  f"{price * 0.6:.2f} - {price * 1.4:.2f}",
+                  f"${rng.uniform(1, 900):.1f}B",
+                  f"{rng.uniform(1, 10):.2f}B", f"{rng.uniform(1, 10):.2f}B", f"{rng.uniform(0.5, 2):.2f}",
+                  f"${rng.randint(100, 900)}K",
+                  f"{rng.uniform(5, 120):.2f}", f"${rng.uniform(-2, 15):.2f}", "N/A", "N/A", "N/A",
+                  f"{rng.uniform(1, 90):.2f}M", f"{rng.uniform(0, 5):.2f}%", f"{rng.uniform(1, 150):.1f}M"]
+        key_data = "".join(f'<li class="kv__item"><small class="label">{label}</small>'
+                           f'<span class="primary">{value}</span></li>'
+                           for label, value in zip(MARKET_WATCH_KEY_DATA, values))
+        news = "".join(f'<div class="article__content"><h3 class="article__headline"><a href="/story/{i}-{n}">'
+                       f'Story {n} about {rng.choice(TICKERS)}</a></h3><p class="article__summary">'
+                       f'{"Markets moved as investors weighed earnings. " * 3}</p>'
+                       f'<span class="article__timestamp">{n} min ago</span></div>'
+                       for n in range(filler))
+        body = f"""<html><head><title>{ticker} Stock Price</title></head><body>
+<nav>{"".join(f'<a class="nav__link" href="/section/{n}">Section {n}</a>' for n in range(50))}</nav>
+<div class="region region--intraday">
+  <span class="company__ticker">{ticker}</span><h1 class="company__name">Synthetic Corp.</h1>
+  <h2 class="intraday__price"><sup class="character">$</sup><bg-quote class="value">{price:.2f}</bg-quote></h2>
+  <span class="timestamp__time">Last Updated: <bg-quote>Jan 2, 2025 {9 + i % 7}:30 a.m.</bg-quote> EDT</span>
+  <div class="range__header"><span class="primary">Volume: {rng.uniform(1, 150):.1f}M</span></div>
+</div>
+<div class="region region--primary"><ul class="list list--kv list--col50">{key_data}</ul></div>
+<div class="region region--secondary">{news}</div>
+</body></html>"""
+        pages.append((f"https://www.marketwatch.com/investing/stock/{ticker.lower()}?page={i}",
+                      body.encode("utf-8")))
+    return pages
+
+
+# Row labels of the bot.sannysoft.com tables, in page order
+INTOLI_GENERAL_LABELS = ["User Agent <span>(Old)</span>", "WebDriver <span>(New)</span>", "WebDriver Advanced",
+                         "Chrome <span>(New)</span>", "Permissions <span>(New)</span>",
+                         "Plugins Length <span>(Old)</span>", "Plugins is of type PluginArray",
+                         "Languages <span>(Old)</span>", "WebGL Vendor", "WebGL Renderer", "Broken Image Dimensions"]
+INTOLI_FINGERPRINT_LABELS = ["PHANTOM_UA", "PHANTOM_PROPERTIES", "PHANTOM_ETSL", "PHANTOM_LANGUAGE",
+                             "PHANTOM_WEBSOCKET", "MQ_SCREEN", "PHANTOM_OVERFLOW", "PHANTOM_WINDOW_HEIGHT",
+                             "HEADCHR_UA", "HEADCHR_CHROME_OBJ", "HEADCHR_PERMISSIONS", "HEADCHR_PLUGINS",
+                             "HEADCHR_IFRAME", "CHR_DEBUG_TOOLS", "SELENIUM_DRIVER", "CHR_BATTERY", "CHR_MEMORY",
+                             "TRANSPARENT_PIXEL", "SEQUENTUM", "VIDEO_CODECS"]
+
+
+def make_intoli_pages(count, seed=0, shuffle=False):
+    """
+    Builds (url, body) pairs shaped like the rendered bot.sannysoft.com page parsed by IntoliSpider:
+    the general tests table (header row first), the fp-collect table (#fp2) and a few unrelated tables.
+    shuffle randomizes the row order within both tables, the rows themselves are the same as without it.
+    """
+    rng = random.Random(seed)
+    shuffler = random.Random(seed)
+    pages = []
+    for i in range(count):
+        general = [f'<tr><td>{label}</td><td class="{rng.choice(["passed", "failed", "warn"])}">'
+                   f'{rng.choice(["present", "missing", "Mozilla/5.0 (X11; Linux x86_64)", "Intel Inc."])}</td></tr>'
+                   for label in INTOLI_GENERAL_LABELS]
+        fingerprint = [f'<tr><td>{label}</td><td class="{status.lower()}">{status}</td>'
+                       f'<td>{rng.choice(["ok", "1920x1080", "[object PluginArray]", "true"])}</td></tr>'
+                       for label, status in ((label, rng.choice(["ok", "WARN", "FAIL"]))
+                                             for label in INTOLI_FINGERPRINT_LABELS)]
+        if shuffle:
+            shuffler.shuffle(general)
+            shuffler.shuffle(fingerprint)
+        other = "".join(f'<table class="details"><tr><th>Property {n}</th><th>Value</th></tr>'
+                        f'{"".join(f"<tr><td>prop{n}.{m}</td><td>{rng.random():.6f}</td></tr>" for m in range(20))}'
+                        f'</table>' for n in range(5))
+        body = f"""<html><head><title>Antibot</title></head><body>
+<h1>Intoli.com tests + additions</h1>
+<table><tr><th>Test Name</th><th>Result</th></tr>{"".join(general)}</table>
+<h2>Fingerprint Scanner tests</h2>
+<table id="fp2">{"".join(fingerprint)}</table>
+{other}
+</body></html>"""
+        pages.append((f"https://bot.sannysoft.com/?page={i}", body.encode("utf-8")))
+    return pages
@@ -0,0 +1,114 @@
+"""
+Measures IntoliSpider table extraction, per-row CSS queries by position vs. the single-pass TableMapper.
+
+    python benchmarks/table_mapper_benchmark.py --pages 200 --repeat 20
+
+- "positional": the extraction IntoliSpider used before (kept below as a reference), three CSS queries per row
+  and fields taken by row index
+- "mapper": extract_intoli_tests(), one walk over each result table's rows mapping them to fields by label
+Both must return the same fields on pages in the original row order. The run is repeated on pages with
+shuffled rows, where "wrong fields" counts the fields that no longer match the row they belong to.
+"""
+import argparse
+import time
+
+from synthetic import make_intoli_pages
+
+from scrapy.http import HtmlResponse
+
+from diamond_scraper.spiders.intoli_spider import extract_intoli_tests
+
+GENERAL_FIELDS = ["userAgentTest", "webDriverTest", "webDriverAdvancedTest", "chromeTest", "permissionsTest",
+                  "pluginsLengthTest", "pluginsTypeTest", "languageTest", "webGLVendorTest", "webGLRendererTest",
+                  "brokenImageDimensionsTest"]
+FINGERPRINT_FIELDS = ["phantomUaTest", "phantomPropertiesTest", "phantomEtslTest", "phantomLanguageTest",
+                      "phantomWebsocketTest", "MQ_ScreenTest", "phantomOverflowTest", "phantomWindowHeightTest",
+                      "headchrUaTest", "headchrChromeObjTest", "headchrPermissionsTest", "headchrPluginsTest",
+                      "headchrIframeTest", "chromeDebugToolsTest", "seleniumDriverTest", "batteryTest", "memoryTest",
+                      "transparentPixelTest", "sequentumTest", "videoCodecsTest"]
+
+
+def extract_general_table_elements(snippet, default=None):
+    result_cell = snippet.css('td:nth-child(2)')
+    status_class = result_cell.attrib.get('class', '').strip()
+    value = result_cell.css('::text').get()
+    return {
+        "status": status_class if status_class else default,
+        "value": value.strip() if value else default
+    }
+
+
+def extract_fingerprint_table_elements(snippet, default=None):
+    status = snippet.css('td:nth-child(2)').css('::text').get()
+    value = snippet.css('td:nth-child(3)').css('::text').get()
+    return {
+        "status": status if status else default,
+        "value": value.strip() if value else default
+    }
+
+
+def positional_extract_intoli_tests(response):
+    """
+    Extraction as IntoliSpider did it before the TableMapper: rows 1-11 of "table tr", rows 0-19 of "#fp2 tr".
+    """
+    general_rows = response.css('table tr')
+    fields = {field: extract_general_table_elements(general_rows[index + 1])
+              for index, field in enumerate(GENERAL_FIELDS)}
+    fingerprint_rows = response.css('[id=fp2] tr')
+    fields.update({field: extract_fingerprint_table_elements(fingerprint_rows[index])
+                   for index, field in enumerate(FINGERPRINT_FIELDS)})
+    return fields
+
+
+def make_responses(pages):
+    responses = [HtmlResponse(url=url, body=body, encoding="utf-8") for url, body in pages]
+    for response in responses:
+        response.selector  # noqa: B018 (parse up front, only extraction is timed)
+    return responses
+
+
+def time_extract(extractor, responses, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for response in responses:
+            extractor(response)
+    return len(responses) * repeat / (time.perf_counter() - start)
+
+
+def count_wrong_fields(extractor, responses, ordered):
+    """
+    Fields differing from the ordered page with the same rows (same seed, see make_intoli_pages).
+    """
+    wrong = 0
+    for response, ordered_response in zip(responses, ordered):
+        reference = extract_intoli_tests(ordered_response)
+        wrong += sum(value != reference[field] for field, value in extractor(response).items())
+    return wrong
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IntoliSpider table extraction benchmark")
+    parser.add_argument("--pages", type=int, default=200, help="Number of synthetic result pages")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the pages")
+    args = parser.parse_args()
+
+    ordered = make_responses(make_intoli_pages(args.pages))
+    shuffled = make_responses(make_intoli_pages(args.pages, shuffle=True))
+    for response in ordered:
+        expected, actual = positional_extract_intoli_tests(response), extract_intoli_tests(response)
+        if expected != actual:
+            raise AssertionError(f"{response.url}: mapped extraction differs\n{expected}\n{actual}")
+
+    print(f"{args.pages} pages, {args.repeat} passes\n")
+    print(f"{'extractor':<12} {'rows':<9} {'pages/sec':>10} {'wrong fields':>13}")
+    rates = {}
+    for name, extractor in (("positional", positional_extract_intoli_tests), ("mapper", extract_intoli_tests)):
+        for rows, responses in (("ordered", ordered), ("shuffled", shuffled)):
+            rates[name, rows] = time_extract(extractor, responses, args.repeat)
+            wrong = count_wrong_fields(extractor, responses, ordered)
+            print(f"{name:<12} {rows:<9} {rates[name, rows]:>10.0f} {wrong:>13}")
+    print(f"\nspeedup: {rates['mapper', 'ordered'] / rates['positional', 'ordered']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
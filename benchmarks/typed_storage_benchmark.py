@@ -0,0 +1,80 @@
+"""
+Measures table size and numeric range query speed for TEXT-only vs typed StockItem storage in SQLite.
+
+    python benchmarks/typed_storage_benchmark.py --rows 50000
+
+The TEXT table is what generate_create_table() infers from raw scraped strings, the typed table uses the
+Field(sql_type=...) declarations on StockItem (DB_TYPED_COLUMNS). TEXT queries need CAST and can't see
+through "$" or magnitude suffixes at all, so the typed range queries are also the only correct ones.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from synthetic import make_stock_items
+
+from diamond_scraper.utils import db_utils
+
+QUERIES = {
+    "price range": {
+        "text": "SELECT COUNT(*) FROM stockitem WHERE CAST(price AS REAL) BETWEEN 100 AND 200",
+        "typed": "SELECT COUNT(*) FROM stockitem WHERE price BETWEEN 100 AND 200",
+    },
+    "avg price per ticker": {
+        "text": "SELECT tickerSymbol, AVG(CAST(price AS REAL)) FROM stockitem GROUP BY tickerSymbol",
+        "typed": "SELECT tickerSymbol, AVG(price) FROM stockitem GROUP BY tickerSymbol",
+    },
+    "volume > 50M": {
+        # Raw volume strings ("Volume: 95.3M") have no SQL-side numeric form
+        "text": "SELECT COUNT(*) FROM stockitem WHERE volume LIKE '%M' AND "
+                "CAST(REPLACE(REPLACE(volume, 'Volume: ', ''), 'M', '') AS REAL) > 50",
+        "typed": "SELECT COUNT(*) FROM stockitem WHERE volume > 50000000",
+    },
+}
+
+
+def build_table(db_path, items, typed):
+    connection = db_utils.get_db_connection(db_path=db_path)
+    cursor = connection.cursor()
+    override_types = db_utils.get_column_types(items[0]) if typed else None
+    schema = db_utils.SchemaRegistry().get_schema(cursor, items[0], override_types=override_types)
+    with db_utils.batch_transaction(connection):
+        db_utils.insert_items(cursor, items, schema.table_name, log=False, schema=schema)
+    connection.execute("VACUUM")
+    return connection
+
+
+def time_query(connection, sql, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        connection.execute(sql).fetchall()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Typed vs TEXT StockItem storage benchmark")
+    parser.add_argument("--rows", type=int, default=50000, help="Number of synthetic StockItems")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query")
+    args = parser.parse_args()
+
+    items = make_stock_items(args.rows)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        connections = {}
+        for layout in ("text", "typed"):
+            db_path = os.path.join(tmp_dir, f"{layout}.db")
+            connections[layout] = build_table(db_path, items, typed=(layout == "typed"))
+            print(f"{layout:<6} table size: {os.path.getsize(db_path) / 1024:,.0f} KiB")
+
+        print(f"\n{'query':<22} {'text ms':>10} {'typed ms':>10}")
+        for name, sql in QUERIES.items():
+            text_ms = time_query(connections["text"], sql["text"], args.repeat)
+            typed_ms = time_query(connections["typed"], sql["typed"], args.repeat)
+            print(f"{name:<22} {text_ms:>10.2f} {typed_ms:>10.2f}")
+
+        for connection in connections.values():
+            connection.close()
+
+
+if __name__ == "__main__":
+    main()
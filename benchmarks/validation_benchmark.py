@@ -0,0 +1,179 @@
+"""
+Measures ValidationLogger.process_item throughput with compiled rule chains against the previous
+per-field implementation, and checks both produce the same items, flagged/invalid dicts and drop decisions.
+
+    python benchmarks/validation_benchmark.py --items 50000
+
+Modes:
+- "logging off": ValidationLogger(enable_logging=False)
+- "default rules": InvalidDataPipeline's setup, default logging rules with the logger at INFO (debug events discarded)
+Log records go to a NullHandler, so enabled events still pay for formatting and record creation.
+
+The batch section compares per-item validation with BatchValidator micro-batches (VALIDATION_BATCH_ENABLED),
+which checks InvalidDataPipeline.numeric_constraints column-wise with NumPy.
+"""
+import argparse
+import logging
+import time
+
+from synthetic import make_stock_items
+
+from itemadapter import ItemAdapter
+from scrapy import Spider
+from scrapy.utils.test import get_crawler
+
+import diamond_scraper.utils.stats_util as stats_util
+from diamond_scraper.pipelines.core_pipelines import InvalidDataPipeline
+from diamond_scraper.utils.batch_validation import BatchValidator
+from diamond_scraper.utils.validation_logger import ValidationLogger
+
+
+class PreviousValidationLogger(ValidationLogger):
+    """
+    validate_item() and log_event() as they were before rule compilation, kept as the baseline.
+    """
+
+    def validate_item(self, item, rules, use_universal_default_rules=True):
+        self.log_event("ITEM_INPUT", "Item input before validation: {}", item)
+
+        if self.logging_rules.get("ITEM_INPUT", {}).get("store", False):
+            stats_util.append_to_stat(self.spider, "ITEM_INPUT", item)
+
+        adapter = ItemAdapter(item)
+        flagged_values = {}
+        invalid_values = {}
+
+        def _process_validation_result(field, result):
+            if isinstance(result, tuple):
+                is_valid, new_value = result
+                if is_valid is None:
+                    flagged_values[field] = adapter[field]
+                    self.log_event("FIELD_FLAGGED", "Field {} has been flagged as suspicious", field)
+                elif not is_valid:
+                    invalid_values[field] = adapter[field]
+                    self.log_event("FIELD_FAILURE", "Field {} has failed validation", field)
+                else:
+                    adapter[field] = new_value
+            elif isinstance(result, bool):
+                if not result:
+                    invalid_values[field] = adapter[field]
+                    self.log_event("FIELD_FAILURE", "Field {} has failed validation", field)
+            elif result is None:
+                flagged_values[field] = adapter[field]
+                self.log_event("FIELD_FLAGGED", "Field {} has been flagged as suspicious", field)
+            else:
+                raise ValueError(f"Invalid return type from validation rule for {field}")
+
+        for key, value in adapter.items():
+            try:
+                if key in rules:
+                    if use_universal_default_rules:
+                        for function in self.default_rules.values():
+                            _process_validation_result(key, function(value))
+
+                    _process_validation_result(key, rules[key](value))
+
+                elif not use_universal_default_rules:
+                    for function in self.default_rules.values():
+                        _process_validation_result(key, function(value))
+
+            except Exception as e:
+                self.spider.logger.error(f"Error validating item {key}: {value}, Exception: {e}")
+                invalid_values[key] = value
+
+        item = dict(adapter)
+        self.log_event("ITEM_OUTPUT", "Item output after validation: {}", item)
+
+        if self.logging_rules.get("ITEM_OUTPUT", {}).get("store", False):
+            stats_util.append_to_stat(self.spider, "ITEM_OUTPUT", item)
+
+        return item, {"flagged": flagged_values, "invalid": invalid_values}
+
+    def log_event(self, event_name, message_template, *args, **kwargs):
+        if not self.enable_logging:
+            return
+
+        log_config = self.logging_rules.get(event_name, {"log": False, "level": "info"})
+
+        if log_config.get("log", False):
+            log_level = log_config.get("level", "info")
+            formatted_message = message_template.format(*args, **kwargs)
+            getattr(self.spider.logger, log_level, self.spider.logger.info)(formatted_message)
+
+
+def make_items(count):
+    """
+    StockItem fields after DiamondScraperPipeline cleaning, every tenth item with a negative price.
+    """
+    items = []
+    for i, stock_item in enumerate(make_stock_items(count)):
+        item = dict(stock_item)
+        item["volume"] = item["volume"].split(":")[1].strip().rstrip("M")
+        item["open"] = item["open"].lstrip("$")
+        item["eps"] = item["eps"].lstrip("$")
+        if i % 10 == 0:
+            item["price"] = "-" + item["price"]
+        items.append(item)
+    return items
+
+
+def run(logger_class, spider, items, rules, enable_logging):
+    validation_logger = logger_class(spider, enable_logging=enable_logging)
+    outputs = []
+    start = time.perf_counter()
+    for item in items:
+        # Same steps as process_item(), keeping the results to compare. The copy keeps the input identical
+        # for every run, since rules write cleaned values back into the item
+        item, validation_results = validation_logger.validate_item(dict(item), rules)
+        validation_logger.log_validation_results(validation_results)
+        outputs.append((item, validation_results, validation_logger.should_drop_item(validation_results)))
+    return len(items) / (time.perf_counter() - start), outputs
+
+
+def run_batches(spider, items, pipeline, enable_logging, batch_size):
+    validation_logger = ValidationLogger(spider, enable_logging=enable_logging)
+    validator = BatchValidator(validation_logger, pipeline.validation_rules, pipeline.numeric_constraints)
+    outputs = []
+    start = time.perf_counter()
+    for offset in range(0, len(items), batch_size):
+        batch = [dict(item) for item in items[offset:offset + batch_size]]
+        for item, validation_results in validator.validate_batch(batch):
+            validation_logger.log_validation_results(validation_results)
+            outputs.append((item, validation_results, validation_logger.should_drop_item(validation_results)))
+    return len(items) / (time.perf_counter() - start), outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ValidationLogger throughput benchmark")
+    parser.add_argument("--items", type=int, default=50000, help="Number of synthetic items")
+    parser.add_argument("--batch-size", type=int, default=100, help="Items per micro-batch")
+    args = parser.parse_args()
+
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    spider = Spider("benchmark")
+    spider.crawler = get_crawler(Spider)
+    items = make_items(args.items)
+    pipeline = InvalidDataPipeline()
+    rules = pipeline.validation_rules
+
+    print(f"{'mode':<14} {'before items/s':>15} {'after items/s':>15} {'speedup':>8}")
+    for mode, enable_logging in (("logging off", False), ("default rules", True)):
+        before, before_outputs = run(PreviousValidationLogger, spider, items, rules, enable_logging)
+        after, after_outputs = run(ValidationLogger, spider, items, rules, enable_logging)
+        assert before_outputs == after_outputs, f"Outputs differ in mode {mode!r}"
+        print(f"{mode:<14} {before:>15,.0f} {after:>15,.0f} {after / before:>7.1f}x")
+
+    print(f"\n{'mode':<14} {'per-item/s':>15} {'batched/s':>15} {'speedup':>8}")
+    for mode, enable_logging in (("logging off", False), ("default rules", True)):
+        per_item, per_item_outputs = run(ValidationLogger, spider, items, rules, enable_logging)
+        batched, batched_outputs = run_batches(spider, items, pipeline, enable_logging, args.batch_size)
+        assert per_item_outputs == batched_outputs, f"Batched outputs differ in mode {mode!r}"
+        print(f"{mode:<14} {per_item:>15,.0f} {batched:>15,.0f} {batched / per_item:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+
+from diamond_scraper.utils.latency import LatencyRecorder, register_recorder
+
+
+class LatencyStatsExtension:
+    """
+    Collects per-component latency histograms while LATENCY_STATS_ENABLED is set.
+
+    - Pipelines and middlewares decorated with utils.latency.timed, spider callbacks (LatencySpiderMiddleware)
+      and download latency record into one LatencyRecorder per crawler
+    - At spider close every component is written to crawler stats as latency/<component>/<stat>
+      (count, total_s, max_ms, p50_ms, p95_ms, p99_ms) and logged, slowest components first
+    """
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+        self.recorder = LatencyRecorder()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('LATENCY_STATS_ENABLED'):
+            raise NotConfigured
+        extension = cls(crawler)
+        register_recorder(crawler, extension.recorder)
+        crawler.signals.connect(extension.spider_closed, signal=signals.spider_closed)
+        return extension
+
+    def spider_closed(self, spider):
+        summary = self.recorder.summary()
+        if not summary:
+            return
+
+        stats = self.crawler.stats
+        spider.logger.info("==== Latency by component ====")
+        for name, component_stats in summary.items():
+            for stat, value in component_stats.items():
+                stats.set_value(f"latency/{name}/{stat}", value)
+            spider.logger.info("%s: count=%d total=%.3fs p50=%.3fms p95=%.3fms p99=%.3fms max=%.3fms", name,
+                               component_stats["count"], component_stats["total_s"], component_stats["p50_ms"],
+                               component_stats["p95_ms"], component_stats["p99_ms"], component_stats["max_ms"])
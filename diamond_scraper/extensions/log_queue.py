@@ -0,0 +1,84 @@
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller: records arriving while the queue is full are counted and dropped.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class QueueLoggingExtension:
+    """
+    Moves log output (file and console handlers on the root logger) off the reactor thread.
+
+    - The root logger's stream/file handlers are replaced by a QueueHandler, a QueueListener thread
+      runs the original handlers, so disk and console writes never stall the reactor
+    - Other root handlers (e.g. Scrapy's log_count stats handler) stay in place, they do no I/O
+    - LOG_QUEUE_SIZE bounds the queue (0 for unbounded), records over it are dropped and counted
+      in custom/log_queue_dropped instead of blocking
+    - Handlers are moved once the engine starts, then flushed and restored once the engine stops
+    """
+
+    def __init__(self, crawler, queue_size=10000):
+        self.crawler = crawler
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.queue_handler = DroppingQueueHandler(self.queue)
+        self.handlers = []
+        self.listener = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('LOG_QUEUE_ENABLED'):
+            raise NotConfigured
+        extension = cls(crawler, queue_size=crawler.settings.getint('LOG_QUEUE_SIZE', 10000))
+        # Scrapy reinstalls its root handler after building extensions, so handlers are only moved once running
+        crawler.signals.connect(extension.engine_started, signal=signals.engine_started)
+        crawler.signals.connect(extension.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(extension.engine_stopped, signal=signals.engine_stopped)
+        return extension
+
+    def start(self):
+        root = logging.getLogger()
+        self.handlers = [handler for handler in root.handlers if isinstance(handler, logging.StreamHandler)]
+        if not self.handlers:
+            return
+        for handler in self.handlers:
+            root.removeHandler(handler)
+        root.addHandler(self.queue_handler)
+
+        self.listener = QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self):
+        if self.listener is None:
+            return
+        root = logging.getLogger()
+        root.removeHandler(self.queue_handler)
+        self.listener.stop()  # Handles every record still queued before returning
+        self.listener = None
+        for handler in self.handlers:
+            root.addHandler(handler)
+
+    def engine_started(self):
+        self.start()
+
+    def spider_closed(self, spider):
+        self.crawler.stats.set_value("custom/log_queue_dropped", self.queue_handler.dropped)
+
+    def engine_stopped(self):
+        self.stop()
@@ -0,0 +1,39 @@
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+
+from diamond_scraper.utils.offload import ProcessOffloader, register_offloader
+
+
+class ProcessOffloadExtension:
+    """
+    Owns the process pool spider callbacks offload extraction to while PROCESS_OFFLOAD_ENABLED is set
+    (see utils.offload.extract).
+
+    - PROCESS_OFFLOAD_WORKERS worker processes (0 for one per CPU core)
+    - PROCESS_OFFLOAD_MAX_IN_FLIGHT responses in the pool at once (0 for twice the workers)
+    - Pool usage is reported as custom/offload_* stats at spider close, the pool is shut down once the engine stops
+    """
+
+    def __init__(self, crawler, offloader):
+        self.crawler = crawler
+        self.offloader = offloader
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool('PROCESS_OFFLOAD_ENABLED'):
+            raise NotConfigured
+        offloader = ProcessOffloader(max_workers=settings.getint('PROCESS_OFFLOAD_WORKERS', 0) or None,
+                                     max_in_flight=settings.getint('PROCESS_OFFLOAD_MAX_IN_FLIGHT', 0) or None)
+        extension = cls(crawler, offloader)
+        register_offloader(crawler, offloader)
+        crawler.signals.connect(extension.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(extension.engine_stopped, signal=signals.engine_stopped)
+        return extension
+
+    def spider_closed(self, spider):
+        for name, value in self.offloader.stats().items():
+            self.crawler.stats.set_value(f"custom/offload_{name}", value)
+
+    def engine_stopped(self):
+        self.offloader.shutdown()
@@ -9,29 +9,35 @@ class DiamondScraperItem(scrapy.Item):
 
 
 class StockItem(scrapy.Item):
+    # Fields identifying a unique quote, used for database-level dedup (DB_UPSERT_ENABLED)
+    natural_key = ("tickerSymbol", "timestamp")
+
     # Basic Identifiers
-    tickerSymbol = scrapy.Field()
-    name = scrapy.Field()
-    currency = scrapy.Field()
+    # normalizer picks the parse_utils.NORMALIZERS entry NormalizationPipeline applies to the scraped string
+    tickerSymbol = scrapy.Field(normalizer="symbol")
+    name = scrapy.Field(normalizer="text")
+    currency = scrapy.Field(normalizer="text")
 
     # Market Data
-    timestamp = scrapy.Field()
-    timezone = scrapy.Field()
-    price = scrapy.Field()
-    priceChange = scrapy.Field()
-    percentChange = scrapy.Field()
+    # sql_type declares the typed column used when DB_TYPED_COLUMNS is enabled
+    timestamp = scrapy.Field(normalizer="text")
+    timezone = scrapy.Field(normalizer="text")
+    scrapedAt = scrapy.Field()  # UTC ISO time, stamped by DatabasePipeline when time partitioning is enabled
+    price = scrapy.Field(sql_type="REAL", normalizer="currency")
+    priceChange = scrapy.Field(sql_type="REAL", normalizer="number")
+    percentChange = scrapy.Field(sql_type="REAL", normalizer="percent")  # Stored in percent units, "1.5%" -> 1.5
 
     # Trading Data
-    open = scrapy.Field()
-    dayLow = scrapy.Field()
-    dayHigh = scrapy.Field()
-    volume = scrapy.Field()
-    avgVolume = scrapy.Field()
+    open = scrapy.Field(sql_type="REAL", normalizer="currency")
+    dayLow = scrapy.Field(sql_type="REAL", normalizer="currency")
+    dayHigh = scrapy.Field(sql_type="REAL", normalizer="currency")
+    volume = scrapy.Field(sql_type="INTEGER", normalizer="integer")  # "Volume: 95.3M" -> 95300000
+    avgVolume = scrapy.Field(sql_type="INTEGER", normalizer="integer")
 
     # Company Valuation Metrics
-    marketCap = scrapy.Field()
-    peRatio = scrapy.Field()
-    eps = scrapy.Field()
+    marketCap = scrapy.Field(sql_type="REAL", normalizer="magnitude")
+    peRatio = scrapy.Field(sql_type="REAL", normalizer="number")
+    eps = scrapy.Field(sql_type="REAL", normalizer="currency")
 
 
 class IntoliItem(scrapy.Item):
@@ -3,11 +3,17 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import time
+from collections import deque
+
 from scrapy import signals
+from scrapy.exceptions import NotConfigured
 
 # useful for handling different item types with a single interface
 from itemadapter import is_item, ItemAdapter
 
+from diamond_scraper.utils import latency
+
 
 class DiamondScraperSpiderMiddleware:
     # Not all methods need to be defined. If a method is not defined,
@@ -37,6 +43,11 @@ class DiamondScraperSpiderMiddleware:
         for i in result:
             yield i
 
+    async def process_spider_output_async(self, response, result, spider):
+        # Same as process_spider_output(), for callbacks that are async generators.
+        async for i in result:
+            yield i
+
     def process_spider_exception(self, response, exception, spider):
         # Called when a spider or process_spider_input() method
         # (from other spider middleware) raises an exception.
@@ -72,6 +83,7 @@ class DiamondScraperDownloaderMiddleware:
         crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
         return s
 
+    @latency.timed("downloader")
     def process_request(self, request, spider):
         # Called for each request that goes through the downloader
         # middleware.
@@ -84,6 +96,7 @@ class DiamondScraperDownloaderMiddleware:
         #   installed downloader middleware will be called
         return None
 
+    @latency.timed("downloader")
     def process_response(self, request, response, spider):
         # Called with the response returned from the downloader.
 
@@ -93,6 +106,7 @@ class DiamondScraperDownloaderMiddleware:
         # - or raise IgnoreRequest
         return response
 
+    @latency.timed("downloader")
     def process_exception(self, request, exception, spider):
         # Called when a download handler or a process_request()
         # (from other downloader middleware) raises an exception.
@@ -122,5 +136,79 @@ class SessionStatsLoggerMiddleware:
 
         spider.logger.info("==== Scrapy Session Stats ====")
         for key, value in session_stats.items():
+            if isinstance(value, deque):
+                value = list(value)  # Ring buffer stats, without the deque(..., maxlen=) wrapper
             spider.logger.info(f"{key}: {value}")
         spider.logger.info("==== End of Scrapy Session ====")
+
+
+class LatencySpiderMiddleware:
+    """
+    Times spider callbacks for LatencyStatsExtension, enabled with LATENCY_STATS_ENABLED.
+
+    Should sit closest to the spider (highest order), so the output it times is the callback's own generator:
+    callback/<name> is the time spent producing its results, summed over every result the callback yields.
+    The downloader's request-to-response time is recorded as download/response.
+    """
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('LATENCY_STATS_ENABLED'):
+            raise NotConfigured
+        return cls(crawler)
+
+    def process_spider_input(self, response, spider):
+        recorder = latency.get_recorder(spider)
+        download_latency = response.meta.get("download_latency")
+        if recorder is not None and download_latency is not None:
+            recorder.record("download/response", download_latency)
+        return None
+
+    def process_spider_output(self, response, result, spider):
+        recorder = latency.get_recorder(spider)
+        if recorder is None:
+            yield from result
+            return
+
+        name = self.callback_name(response, spider)
+        elapsed = 0.0
+        iterator = iter(result)
+        while True:
+            start = time.perf_counter()
+            try:
+                output = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                elapsed += time.perf_counter() - start
+            yield output
+        recorder.record(name, elapsed)
+
+    async def process_spider_output_async(self, response, result, spider):
+        recorder = latency.get_recorder(spider)
+        if recorder is None:
+            async for output in result:
+                yield output
+            return
+
+        name = self.callback_name(response, spider)
+        elapsed = 0.0
+        iterator = result.__aiter__()
+        while True:
+            start = time.perf_counter()
+            try:
+                output = await iterator.__anext__()
+            except StopAsyncIteration:
+                break
+            finally:
+                elapsed += time.perf_counter() - start
+            yield output
+        recorder.record(name, elapsed)
+
+    @staticmethod
+    def callback_name(response, spider):
+        callback = response.request.callback if response.request is not None else None
+        return f"callback/{spider.name}.{getattr(callback, '__name__', 'parse')}"
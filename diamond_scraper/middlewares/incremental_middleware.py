@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+
+from scrapy import signals
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+
+from diamond_scraper.utils import latency
+
+
+class IncrementalCrawlMiddleware:
+    """
+    Skips pages that haven't changed since the previous run, enabled with INCREMENTAL_ENABLED.
+
+    - Sends If-None-Match / If-Modified-Since with the ETag / Last-Modified stored for the URL,
+      a 304 Not Modified response is dropped (IgnoreRequest) before it reaches the spider
+    - Hashes the spider's incremental_region (CSS selector, the whole body without it) of 200 responses,
+      a page whose region hash matches the stored one is dropped the same way
+    - A page's new state is only committed once an item scraped from it went through the pipelines
+      (item_scraped / item_dropped), so a failed parse is retried on the next run
+    - State is a JSON file (INCREMENTAL_STATE_PATH, or incremental_state.json inside JOBDIR), loaded on open
+      and saved on close
+    - Requests with meta["incremental"] = False are left alone
+
+    Reports custom/incremental_* in crawler stats: not_modified (304s), unchanged (same hash), changed,
+    hit_rate (skipped pages / checked responses) and bytes_saved (stored body size of every 304).
+    """
+
+    # File name of the persisted state inside JOBDIR
+    state_file = "incremental_state.json"
+
+    def __init__(self, crawler, state_path):
+        self.stats = crawler.stats
+        self.state_path = state_path
+        self.state = {}  # url -> {"etag", "last_modified", "hash", "length"}
+        self.pending = {}  # url -> state of a changed page, until an item from it is processed
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool('INCREMENTAL_ENABLED'):
+            raise NotConfigured
+        job_dir = settings.get('JOBDIR')
+        state_path = os.path.join(job_dir, cls.state_file) if job_dir else settings.get('INCREMENTAL_STATE_PATH')
+        middleware = cls(crawler, state_path)
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(middleware.item_processed, signal=signals.item_scraped)
+        crawler.signals.connect(middleware.item_processed, signal=signals.item_dropped)
+        return middleware
+
+    @latency.timed("downloader")
+    def process_request(self, request, spider):
+        if request.method != "GET" or request.meta.get("incremental") is False:
+            return None
+        entry = self.state.get(request.url)
+        if entry is None:
+            return None
+        if entry.get("etag"):
+            request.headers.setdefault(b"If-None-Match", entry["etag"])
+        if entry.get("last_modified"):
+            request.headers.setdefault(b"If-Modified-Since", entry["last_modified"])
+        return None
+
+    @latency.timed("downloader")
+    def process_response(self, request, response, spider):
+        if request.method != "GET" or request.meta.get("incremental") is False:
+            return response
+        entry = self.state.get(request.url)
+
+        if response.status == 304 and entry is not None:
+            self.stats.inc_value("custom/incremental_checked")
+            self.stats.inc_value("custom/incremental_not_modified")
+            self.stats.inc_value("custom/incremental_bytes_saved", count=entry.get("length", 0))
+            raise IgnoreRequest(f"Not modified since the last crawl: {request.url}")
+        if response.status != 200:
+            return response
+
+        self.stats.inc_value("custom/incremental_checked")
+        content_hash = self.content_hash(response, spider)
+        if entry is not None and entry.get("hash") == content_hash:
+            self.stats.inc_value("custom/incremental_unchanged")
+            self.update_validators(entry, response)
+            raise IgnoreRequest(f"Content unchanged since the last crawl: {request.url}")
+
+        self.stats.inc_value("custom/incremental_changed")
+        new_entry = {"hash": content_hash, "length": len(response.body)}
+        self.update_validators(new_entry, response)
+        self.pending[request.url] = new_entry
+        return response
+
+    @staticmethod
+    def content_hash(response, spider):
+        """
+        SHA-1 of the HTML matched by spider.incremental_region, or of the whole body.
+        Parsing here isn't extra work, the response keeps its selector for the spider callback.
+        A region matching nothing (selector drift, error pages) falls back to the body, so every such page
+        doesn't hash the same empty string and get skipped as unchanged.
+        """
+        region = getattr(spider, "incremental_region", None)
+        content = None
+        if region and hasattr(response, "css"):
+            content = "".join(response.css(region).getall()).encode("utf-8")
+        if not content:
+            content = response.body
+        return hashlib.sha1(content).hexdigest()
+
+    @staticmethod
+    def update_validators(entry, response):
+        for key, header in (("etag", b"ETag"), ("last_modified", b"Last-Modified")):
+            value = response.headers.get(header)
+            if value is not None:
+                entry[key] = value.decode("latin-1")
+
+    def item_processed(self, item, response, spider, **kwargs):
+        if response is not None and response.url in self.pending:
+            self.state[response.url] = self.pending.pop(response.url)
+
+    def spider_opened(self, spider):
+        if self.state_path and os.path.exists(self.state_path):
+            with open(self.state_path, "r", encoding="utf-8") as state_file:
+                self.state = json.load(state_file)
+            spider.logger.info(f"Loaded incremental crawl state for {len(self.state)} URLs from {self.state_path}")
+
+    def spider_closed(self, spider):
+        checked = self.stats.get_value("custom/incremental_checked", 0)
+        skipped = self.stats.get_value("custom/incremental_not_modified", 0) \
+            + self.stats.get_value("custom/incremental_unchanged", 0)
+        if checked:
+            self.stats.set_value("custom/incremental_hit_rate", round(skipped / checked, 4))
+
+        if self.state_path:
+            os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+            # Written next to the old state and swapped in, so an interrupted save keeps the previous state
+            temp_path = self.state_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as state_file:
+                json.dump(self.state, state_file)
+            os.replace(temp_path, self.state_path)
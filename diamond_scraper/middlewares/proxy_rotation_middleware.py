@@ -2,6 +2,7 @@ import random
 from scrapy import signals
 from collections import defaultdict
 import diamond_scraper.utils.stats_util as stats_util
+from diamond_scraper.utils import latency, log_utils
 
 class ProxyRotationMiddleware:
     """
@@ -30,6 +31,7 @@ class ProxyRotationMiddleware:
         crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
         return middleware
 
+    @latency.timed("downloader")
     def process_request(self, request, spider):
         """
         :param request: outgoing request
@@ -52,10 +54,11 @@ class ProxyRotationMiddleware:
             spider.logger.warning("No viable proxies provided. Request will not use a proxy.")
 
         if proxy:
-            spider.logger.info(f"Using proxy: {proxy}")
+            log_utils.get_event_logger(spider).debug("proxy_used", "Using proxy %s", proxy)
             self.proxy_uses[proxy] += 1
             request.meta['proxy'] = proxy
 
+    @latency.timed("downloader")
     def process_exception(self, request, exception, spider):
         """
         Increments failure count if a proxy is used and the request fails.
@@ -0,0 +1,119 @@
+from collections import defaultdict
+from urllib.parse import urlparse
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from scrapy_playwright.page import PageMethod
+
+from diamond_scraper.utils import latency
+
+
+def url_pattern(url):
+    """
+    Groups URLs by host and parent path, e.g. www.marketwatch.com/investing/stock for every quote page.
+    """
+    parsed = urlparse(url)
+    return f"{parsed.netloc}{parsed.path.rsplit('/', 1)[0]}"
+
+
+class RenderOnDemandMiddleware:
+    """
+    Fetches pages over plain HTTP first and escalates to Playwright only when needed, enabled with
+    RENDER_ON_DEMAND_ENABLED.
+
+    - Requests the spider marks itself (meta["playwright"] set, True or False) are left alone
+    - Otherwise a static response missing any of the spider's render_selectors (CSS, or
+      meta["render_selectors"]) is retried with meta["playwright"] = True, waiting for the first selector
+    - Per URL pattern (see url_pattern()) it learns which path works: once RENDER_ON_DEMAND_LEARN_AFTER static
+      fetches of a pattern needed rendering and none worked, its requests go to Playwright directly, with a
+      static probe every RENDER_ON_DEMAND_PROBE_INTERVAL requests in case the site changes back
+    - Spiders without render_selectors are unaffected
+
+    Reports custom/render_static (served without a browser), custom/render_playwright, custom/render_escalated,
+    custom/render_direct (sent to Playwright by what was learned) and custom/render_selectors_missing
+    (still missing after rendering) in crawler stats, and custom/render_share, the rendered fraction of responses.
+    """
+
+    def __init__(self, crawler, learn_after, probe_interval):
+        self.stats = crawler.stats
+        self.learn_after = learn_after
+        self.probe_interval = probe_interval
+        self.patterns = defaultdict(lambda: {"static": 0, "escalated": 0, "direct": 0, "learned": 0})
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool('RENDER_ON_DEMAND_ENABLED'):
+            raise NotConfigured
+        middleware = cls(crawler, settings.getint('RENDER_ON_DEMAND_LEARN_AFTER', 3),
+                         settings.getint('RENDER_ON_DEMAND_PROBE_INTERVAL', 50))
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    @staticmethod
+    def render_selectors(request, spider):
+        return request.meta.get("render_selectors", getattr(spider, "render_selectors", None))
+
+    def needs_render(self, pattern):
+        """
+        True if static fetches of this pattern only ever needed rendering, except for the periodic probe.
+        """
+        counts = self.patterns[pattern]
+        if counts["static"] or counts["escalated"] < self.learn_after:
+            return False
+        counts["learned"] += 1  # Requests since the pattern was learned, every probe_interval-th one is a probe
+        return not (self.probe_interval and counts["learned"] % self.probe_interval == 0)
+
+    @latency.timed("downloader")
+    def process_request(self, request, spider):
+        if "playwright" in request.meta or not self.render_selectors(request, spider):
+            return None
+        request.meta["render_on_demand"] = True
+        pattern = url_pattern(request.url)
+        if self.needs_render(pattern):
+            self.patterns[pattern]["direct"] += 1
+            self.stats.inc_value("custom/render_direct")
+            request.meta["playwright"] = True
+            request.meta.setdefault("playwright_page_methods", self.page_methods(request, spider))
+        return None
+
+    @latency.timed("downloader")
+    def process_response(self, request, response, spider):
+        if request.meta.get("playwright"):
+            self.stats.inc_value("custom/render_playwright")
+            if request.meta.get("render_on_demand") and not self.has_selectors(request, response, spider):
+                self.stats.inc_value("custom/render_selectors_missing")
+            return response
+        if not request.meta.get("render_on_demand") or response.status != 200:
+            return response
+
+        counts = self.patterns[url_pattern(request.url)]
+        if self.has_selectors(request, response, spider):
+            counts["static"] += 1
+            self.stats.inc_value("custom/render_static")
+            return response
+
+        counts["escalated"] += 1
+        self.stats.inc_value("custom/render_escalated")
+        spider.logger.debug(f"Required selectors missing from the static response, rendering {request.url}")
+        meta = dict(request.meta, playwright=True)
+        meta.setdefault("playwright_page_methods", self.page_methods(request, spider))
+        return request.replace(meta=meta, dont_filter=True)
+
+    def has_selectors(self, request, response, spider):
+        if not hasattr(response, "css"):
+            return False
+        return all(response.css(selector) for selector in self.render_selectors(request, spider))
+
+    def page_methods(self, request, spider):
+        return [PageMethod("wait_for_selector", self.render_selectors(request, spider)[0])]
+
+    def spider_closed(self, spider):
+        static = self.stats.get_value("custom/render_static", 0)
+        rendered = self.stats.get_value("custom/render_playwright", 0)
+        if static + rendered:
+            self.stats.set_value("custom/render_share", round(rendered / (static + rendered), 4))
+        for pattern, counts in self.patterns.items():
+            path = "playwright" if counts["learned"] else "static"
+            spider.logger.info(f"Render on demand: {pattern} -> {path} ({counts['static']} static, "
+                               f"{counts['escalated']} escalated, {counts['direct']} direct)")
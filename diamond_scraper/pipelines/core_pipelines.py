@@ -1,7 +1,11 @@
+import os
+
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
 from scrapy.exceptions import DropItem
-from diamond_scraper.utils import validation_logger
+from scrapy.utils.misc import load_object
+from twisted.internet import defer
+from diamond_scraper.utils import latency, log_utils, parse_utils, validation_logger
 
 
 class DiamondScraperPipeline:
@@ -10,14 +14,17 @@ class DiamondScraperPipeline:
         self.items_processed = 0
 
     # Generalized pipeline for testing and development purposes, will be removed/replaced with modular pipeline
+    @latency.timed("pipeline")
     def process_item(self, item, spider):
         adapter = ItemAdapter(item)
 
-        # Logged after adapter transformation to ensure proper formatting
-        spider.logger.debug(f"Raw item before {self.__class__.__name__} processing: {adapter.item}")
+        # Logged after adapter transformation to ensure proper formatting, the item is only formatted at DEBUG level
+        log_utils.get_event_logger(spider).debug("raw_item", "Raw item before %s processing",
+                                                 self.__class__.__name__, item=adapter.item)
 
         for key, value in adapter.items():
-            adapter.update({key: value.lower().strip().replace(' ', '_')})
+            if isinstance(value, str):
+                adapter.update({key: value.lower().strip().replace(' ', '_')})
 
         # Remove leading currency symbol in open and eps
         if "currency" in adapter:
@@ -30,8 +37,6 @@ class DiamondScraperPipeline:
         # Remove leading 'Volume: ' string in volume value
         if "volume" in adapter and ":" in adapter["volume"]:
             adapter["volume"] = adapter["volume"].split(":")[1].strip()
-        for key, value in adapter.items():
-            print(key, value)
         self.items_processed += 1
         return adapter.item
 
@@ -45,33 +50,123 @@ class DiamondScraperPipeline:
         spider.crawler.stats.inc_value("custom/items_processed", count=self.items_processed)
 
 
+class NormalizationPipeline:
+    """
+    Turns scraped strings into typed values, per field, as declared with Field(normalizer=...) on the item class.
+
+    - Normalizers come from parse_utils.NORMALIZERS (text, symbol, number, integer, currency, percent,
+      magnitude, range) and are resolved once per item class
+    - Values a normalizer can't parse are kept as scraped, so InvalidDataPipeline still sees (and rejects) them,
+      and are counted in custom/normalization_failed/<field>
+    - Item types without field metadata (e.g. dicts) pass through unchanged
+    """
+
+    def __init__(self):
+        self.normalizers = {}  # item class -> {field: normalizer}
+        self.items_processed = 0
+
+    def get_normalizers(self, item):
+        normalizers = self.normalizers.get(item.__class__)
+        if normalizers is None:
+            fields = getattr(item.__class__, "fields", {})
+            normalizers = {}
+            for field, meta in fields.items():
+                name = meta.get("normalizer")
+                if name is None:
+                    continue
+                if name not in parse_utils.NORMALIZERS:
+                    raise KeyError(f"Unknown normalizer {name!r} on {item.__class__.__name__}.{field}")
+                normalizers[field] = parse_utils.NORMALIZERS[name]
+            self.normalizers[item.__class__] = normalizers
+        return normalizers
+
+    @latency.timed("pipeline")
+    def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        for field, normalizer in self.get_normalizers(item).items():
+            value = adapter.get(field)
+            if value is None:
+                continue
+            normalized = normalizer(value)
+            if normalized is None:
+                spider.crawler.stats.inc_value(f"custom/normalization_failed/{field}")
+            else:
+                adapter[field] = normalized
+        self.items_processed += 1
+        return item
+
+    def open_spider(self, spider):
+        spider.logger.info(f"Starting {self.__class__.__name__} normalization")
+
+    def close_spider(self, spider):
+        spider.logger.info(f"Finished {self.__class__.__name__} normalization")
+        spider.logger.info(f"Items normalized: {self.items_processed}")
+
+        spider.crawler.stats.inc_value("custom/items_processed", count=self.items_processed)
+
+
 class DuplicatesPipeline:
+    """
+    Drops items whose key was already seen.
+
+    - The key is built from DEDUP_KEY_FIELDS for the item class, else its natural_key, else ("timestamp",),
+      items missing any key field pass through
+    - Seen keys live in a pluggable store (DEDUP_STORE_CLASS), bounded by DEDUP_MAX_ENTRIES and DEDUP_TTL
+    - With JOBDIR set, the store is saved on close and loaded on open, so resumed runs keep their dedup state
+    """
+
     def __init__(self):
-        self.timestamps_seen = set()
+        self.store = None
+        self.state_path = None
+        self.key_fields = {}  # item class name -> key field override
         self.items_processed = 0
         self.items_dropped = 0
         self.dropped_items = {}
 
+    @latency.timed("pipeline")
     def process_item(self, item, spider):
         adapter = ItemAdapter(item)
 
-        # Logged after adapter transformation to ensure proper formatting
-        spider.logger.debug(f"Raw item before {self.__class__.__name__} processing: {adapter.item}")
+        # Logged after adapter transformation to ensure proper formatting, the item is only formatted at DEBUG level
+        log_utils.get_event_logger(spider).debug("raw_item", "Raw item before %s processing",
+                                                 self.__class__.__name__, item=adapter.item)
 
-        adapter = ItemAdapter(item)
-        if "timestamp" in adapter:
-            if adapter["timestamp"] in self.timestamps_seen:
-                spider.logger.warning(f"Item timestamp already seen: {adapter['timestamp']}")
-                self.items_dropped += 1
-                raise DropItem(f"Item timestamp already seen: {adapter['timestamp']}")
-            else:
-                self.timestamps_seen.add(adapter["timestamp"])
-                return adapter.item
+        key = self.get_key(item, adapter)
+        if key is None:
+            return adapter.item
+        if self.store.seen(key):
+            log_utils.get_event_logger(spider).warning("duplicate_item", "Item key already seen", key=key)
+            self.items_dropped += 1
+            raise DropItem(f"Item key already seen: {key}")
         return adapter.item
 
+    def get_key(self, item, adapter):
+        """
+        Returns the dedup key (item class name followed by the key field values), or None if a field is missing.
+        """
+        item_class_name = item.__class__.__name__
+        fields = self.key_fields.get(item_class_name) or getattr(item.__class__, "natural_key", None) \
+            or ("timestamp",)
+        if any(field not in adapter for field in fields):
+            return None
+        return (item_class_name,) + tuple(str(adapter[field]) for field in fields)
+
     def open_spider(self, spider):
         spider.logger.info(f"Starting {self.__class__.__name__} validation")
 
+        settings = spider.settings
+        self.key_fields = settings.getdict('DEDUP_KEY_FIELDS')
+        store_class = load_object(settings.get('DEDUP_STORE_CLASS',
+                                               "diamond_scraper.utils.dedup_store.MemoryDedupStore"))
+        self.store = store_class.from_settings(settings)
+
+        job_dir = settings.get('JOBDIR')
+        if job_dir:
+            self.state_path = os.path.join(job_dir, store_class.state_file)
+            if os.path.exists(self.state_path):
+                self.store.load(self.state_path)
+                spider.logger.info(f"Loaded dedup state from {self.state_path}")
+
     def close_spider(self, spider):
         spider.logger.info(f"Finished {self.__class__.__name__} validation")
         spider.logger.info(f"Items processed: {self.items_processed}")
@@ -79,9 +174,23 @@ class DuplicatesPipeline:
 
         spider.crawler.stats.inc_value("custom/items_processed", count=self.items_processed)
         spider.crawler.stats.inc_value("custom/items_dropped", count=self.items_dropped)
+        for name, value in self.store.stats().items():
+            spider.crawler.stats.set_value(f"custom/dedup_{name}", value)
+
+        if self.state_path:
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            self.store.save(self.state_path)
 
 
 class InvalidDataPipeline:
+    """
+    Validates items against validation_rules and drops those exceeding the ValidationLogger thresholds.
+
+    With VALIDATION_BATCH_ENABLED set, items are held in micro-batches of VALIDATION_BATCH_SIZE (or for at most
+    VALIDATION_BATCH_TIMEOUT seconds) and numeric_constraints are checked column-wise with NumPy.
+    Each item is released with the same validation results and drop decision as in per-item mode.
+    """
+
     def __init__(self):
         self.validation_logger = None  # Must be initialized after pipeline init, as spider does not exist yet
         self.validation_rules = {
@@ -92,19 +201,89 @@ class InvalidDataPipeline:
             "peRatio": lambda x: (float(x) > 0, x),
             "eps": lambda x: (float(x) >= 0, x),
         }
+        # Column-wise equivalents of the numeric validation_rules, used in batch mode
+        self.numeric_constraints = {
+            "price": (">=", 0),
+            "volume": (">=", 0),
+            "peRatio": (">", 0),
+            "eps": (">=", 0),
+        }
+
+        # Batch mode, configured from settings in open_spider
+        self.batch_validator = None
+        self.batch_size = 100
+        self.batch_timeout = 0.5
+        self.pending = []  # (item, deferred) pairs waiting for their batch
+        self.pending_call = None
 
     def open_spider(self, spider):
         self.validation_logger = validation_logger.ValidationLogger(spider, enable_logging=True)
+        if spider.settings.getbool('VALIDATION_BATCH_ENABLED', False):
+            try:
+                # numpy is an optional dependency, only imported when batch mode is enabled
+                from diamond_scraper.utils.batch_validation import BatchValidator
+            except ImportError:
+                spider.logger.warning("VALIDATION_BATCH_ENABLED requires numpy, validating items one at a time")
+            else:
+                self.batch_validator = BatchValidator(self.validation_logger, self.validation_rules,
+                                                      self.numeric_constraints)
+                self.batch_size = spider.settings.getint('VALIDATION_BATCH_SIZE', 100)
+                self.batch_timeout = spider.settings.getfloat('VALIDATION_BATCH_TIMEOUT', 0.5)
         spider.logger.info(f"Starting {self.__class__.__name__} validation")
 
+    @latency.timed("pipeline")
     def process_item(self, item, spider):
+        if self.batch_validator is not None:
+            return self.queue_item(item, spider)
+
         try:
             return self.validation_logger.process_item(item, self.validation_rules)
         except DropItem as e:
             spider.logger.warning(str(e))
             raise
 
+    def queue_item(self, item, spider):
+        """
+        Adds an item to the current batch, returning a Deferred that fires once the batch is validated.
+        """
+        d = defer.Deferred()
+        self.pending.append((item, d))
+        if len(self.pending) >= self.batch_size:
+            self.validate_pending(spider)
+        elif self.pending_call is None:
+            from twisted.internet import reactor  # Imported late so Scrapy can install its reactor first
+            self.pending_call = reactor.callLater(self.batch_timeout, self.validate_pending, spider)
+        return d
+
+    def validate_pending(self, spider):
+        """
+        Validates the current batch and releases its items (or drops them), in arrival order.
+        """
+        if self.pending_call is not None and self.pending_call.active():
+            self.pending_call.cancel()
+        self.pending_call = None
+        batch, self.pending = self.pending, []
+        if not batch:
+            return
+
+        try:
+            results = self.batch_validator.validate_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, d in batch:
+                d.errback(e)
+            return
+
+        for (_, d), (item, validation_results) in zip(batch, results):
+            self.validation_logger.log_validation_results(validation_results)
+            if self.validation_logger.should_drop_item(validation_results):
+                drop = DropItem(f"Dropping item due to invalid values: {validation_results}")
+                spider.logger.warning(str(drop))
+                d.errback(drop)
+            else:
+                d.callback(item)
+
     def close_spider(self, spider):
+        self.validate_pending(spider)
         spider.logger.info(f"Finished {self.__class__.__name__} validation")
 
 class TestPipeline:
@@ -1,51 +1,648 @@
+import contextlib
 import sqlite3
-from diamond_scraper.utils import db_utils
+import datetime
+import threading
+import time
+from collections import defaultdict, deque
+from twisted.internet import defer, task, threads
+from twisted.python.threadpool import ThreadPool
+from diamond_scraper import items as item_classes
+from diamond_scraper.utils import db_utils, latency
+from diamond_scraper.utils.db_writer import DatabaseWriter
+from diamond_scraper.utils.spool import ItemSpool
+import diamond_scraper.utils.stats_util as stats_util
+from diamond_scraper.utils.validation_logger import StatEnum
 import os
 from itemadapter import ItemAdapter
 class DatabasePipeline:
     """
     Pipeline to store items into a database.
     Uses SQLite by default. PostgreSQL support planned.
+
+    When DB_BATCH_ENABLED is set, items are buffered per table and written with executemany
+    once a buffer reaches DB_BATCH_SIZE items or DB_BATCH_FLUSH_INTERVAL seconds of age.
+    With DB_BACKEND=postgres and DB_COPY_ENABLED set, batches are streamed with COPY instead.
+    With DB_POOL_ENABLED set, a connection is borrowed from the process-wide pool in db_utils for every write
+    (single insert or batch flush) and returned right after, so pipelines share connections. Pooled writes run
+    off the reactor thread (or on the writer thread), waiting for a free connection never blocks the crawl.
+    With DB_WRITER_THREAD_ENABLED set, items are queued and written in batches by a DatabaseWriter thread,
+    keeping all database work off the reactor thread.
+    With DB_UPSERT_ENABLED set, items with a natural key are written with INSERT ... ON CONFLICT against a
+    unique index, so duplicates are dropped (or updated) by the database and survive restarts.
+    With DB_TYPED_COLUMNS set, fields declared with Field(sql_type=...) get REAL/INTEGER columns and their
+    scraped strings ("$1.2B", "95.3M", "1.5%") are parsed into numbers before insert.
+    DB_INDEXES declares secondary indexes per item class, DB_PARTITIONS splits tables by time: one table per
+    day/month on SQLite, native range partitions of the parent table on PostgreSQL.
+    With DB_SPOOL_ENABLED set, items the database can't take (connection down, failed batch, full writer queue)
+    are appended to a local ItemSpool file and replayed once the database is back, and at the next start.
     """
 
     def __init__(self):
         self.connection = None
         self.cursor = None
+        self.pool = None
+        self.pool_lock = defer.DeferredLock()  # One pooled write in flight per pipeline, in item order
+        self.threadpool = None  # Runs pooled writes, see run_db_work()
         self.auto_create = True  # TODO Can be toggled in settings.py
         self.backend = os.getenv("DB_BACKEND", "sqlite")
+        self.db_path = None
+        self.sqlite_pragmas = None
+
+        # Tables are created once per item class, later items reuse the cached INSERT template
+        self.schema_registry = db_utils.SchemaRegistry()
+
+        # Database-level dedup, configured from settings in open_spider
+        self.upsert_enabled = False
+        self.upsert_mode = "ignore"
+        self.natural_keys = {}  # item class name -> natural key override
+
+        # Typed columns, configured from settings in open_spider
+        self.typed_columns = False
+        self.column_type_overrides = {}  # item class name -> {field: SQL type}
+        self.column_types = {}  # item class -> resolved {field: SQL type}
+
+        # Indexes and time partitioning, configured from settings in open_spider
+        self.indexes = {}  # item class name -> list of index column lists
+        self.partitions = {}  # item class name -> {"column": ..., "interval": ...}
+        self.partitions_created = set()
+
+        # Batching mode, configured from settings in open_spider
+        self.batch_enabled = False
+        self.batch_size = 100
+        self.flush_interval = 5.0
+        self.copy_enabled = False
+        self.buffers = defaultdict(list)  # table name -> pending items
+        self.buffer_started = {}  # table name -> monotonic time of the oldest pending item
+        self.buffer_schemas = {}  # table name -> TableSchema used to write the buffer
+        self.flush_loop = None
+
+        # Writer thread mode, items wait in `waiting` while the writer queue is full
+        self.writer = None
+        self.waiting = deque()  # (item, deferred) pairs released as the writer drains its queue
+        self.waiting_lock = threading.Lock()  # Guards submit-or-wait against the writer thread's dequeue check
+
+        # Local spool for items the database can't take, configured from settings in open_spider
+        self.spool = None
+        self.spool_on_backpressure = True
+        self.spool_retry_interval = 10.0
+        self.last_connect_attempt = 0.0
+        self.offline = False  # Set while the last connection attempt failed
+        self.replaying = False
 
     def open_spider(self, spider):
         """
         Establish database connection.
         - Load DB path from Scrapy settings or use default
+        - Open a dedicated connection, unless connections are borrowed per write from the shared pool
         - Create a cursor for executing SQL
+        - Replay items spooled by a previous run
+        - Start the writer thread or the periodic flush loop if batching is enabled
+        """
+        self.db_path = spider.settings.get('DB_PATH', "DWS_scraper.db")
+        writer_enabled = spider.settings.getbool('DB_WRITER_THREAD_ENABLED', False)
+        self.sqlite_pragmas = db_utils.resolve_sqlite_pragmas(spider.settings.get('DB_SQLITE_PROFILE', "default"),
+                                                              spider.settings.getdict('DB_SQLITE_PRAGMAS'))
+        if spider.settings.getbool('DB_POOL_ENABLED', False):
+            self.pool = db_utils.get_connection_pool(
+                self.db_path,
+                max_size=spider.settings.getint('DB_POOL_SIZE', 4),
+                timeout=spider.settings.getfloat('DB_POOL_TIMEOUT', 30.0),
+                health_check_interval=spider.settings.getfloat('DB_POOL_HEALTH_CHECK_INTERVAL', 30.0),
+                sqlite_pragmas=self.sqlite_pragmas,
+            )
+            # pool_lock keeps one write in flight, so a single thread is enough
+            self.threadpool = ThreadPool(minthreads=0, maxthreads=1, name=f"{self.__class__.__name__}-{spider.name}")
+            self.threadpool.start()
+        if spider.settings.getbool('DB_SPOOL_ENABLED', False):
+            self.spool = ItemSpool(spider.settings.get('DB_SPOOL_PATH', "DWS_spool.bin"),
+                                   fsync=spider.settings.getbool('DB_SPOOL_FSYNC', False))
+            self.spool_on_backpressure = spider.settings.getbool('DB_SPOOL_ON_BACKPRESSURE', True)
+            self.spool_retry_interval = spider.settings.getfloat('DB_SPOOL_RETRY_INTERVAL', 10.0)
+        if self.pool is None:
+            self.connect(spider)
+
+        # The writer thread always commits in batches
+        self.batch_enabled = writer_enabled or spider.settings.getbool('DB_BATCH_ENABLED', False)
+        self.batch_size = spider.settings.getint('DB_BATCH_SIZE', 100)
+        self.flush_interval = spider.settings.getfloat('DB_BATCH_FLUSH_INTERVAL', 5.0)
+        self.copy_enabled = self.backend == "postgres" and spider.settings.getbool('DB_COPY_ENABLED', False)
+
+        self.upsert_enabled = spider.settings.getbool('DB_UPSERT_ENABLED', False)
+        self.upsert_mode = spider.settings.get('DB_UPSERT_MODE', "ignore")
+        self.natural_keys = spider.settings.getdict('DB_NATURAL_KEYS')
+
+        self.typed_columns = spider.settings.getbool('DB_TYPED_COLUMNS', False)
+        self.column_type_overrides = spider.settings.getdict('DB_COLUMN_TYPES')
+
+        self.indexes = spider.settings.getdict('DB_INDEXES')
+        self.partitions = spider.settings.getdict('DB_PARTITIONS')
+        self.check_partition_keys()
+
+        if self.spool is not None:
+            # Leftovers from a previous run go in before any new item
+            d = self.run_db_work(spider, self.replay_spool, spider)
+            if d is not None:
+                d.addCallback(lambda _: self.start_writing(spider))
+                return d
+        self.start_writing(spider)
+
+    def start_writing(self, spider):
+        """
+        Starts the writer thread, or the periodic flush loop if batching is enabled.
         """
-        db_path = spider.settings.get('DB_PATH', "DWS_scraper.db")
-        self.connection = db_utils.get_db_connection(db_path=db_path)
-        self.cursor = self.connection.cursor()
+        if spider.settings.getbool('DB_WRITER_THREAD_ENABLED', False):
+            # The writer thread flushes aged buffers itself while its queue is idle
+            self.writer = DatabaseWriter(
+                store_item=lambda item: self.run_pooled(spider, self.store_item, item, spider),
+                flush_expired=lambda: self.run_pooled(spider, self.flush_expired, spider),
+                flush_all=lambda: self.run_pooled(spider, self.flush_all, spider),
+                flush_interval=self.flush_interval,
+                queue_size=spider.settings.getint('DB_WRITER_QUEUE_SIZE', 1000),
+                on_dequeue=lambda: self.on_writer_dequeue(spider),
+            )
+            self.writer.start()
+        elif self.batch_enabled and self.flush_interval > 0:
+            # Flushes aged buffers even when no new items arrive to trigger the check
+            self.flush_loop = task.LoopingCall(self.run_db_work, spider, self.flush_expired, spider)
+            self.flush_loop.start(self.flush_interval, now=False)
 
     def close_spider(self, spider):
         """
-        Commit any changes and close the database connection.
+        Flush pending batches, commit any changes and close (or return to the pool) the database connection.
+        In writer thread mode, the queue is drained off the reactor thread first.
+        """
+        if self.writer is not None:
+            d = threads.deferToThread(self.writer.stop)
+            d.addCallback(lambda _: self.run_db_work(spider, self.close_writes, spider))
+            d.addBoth(self.stop_threadpool)
+            return d
+
+        if self.flush_loop is not None and self.flush_loop.running:
+            self.flush_loop.stop()
+        d = self.run_db_work(spider, self.close_writes, spider)
+        if d is not None:
+            d.addBoth(self.stop_threadpool)
+        return d
+
+    def stop_threadpool(self, result):
+        if self.threadpool is not None:
+            self.threadpool.stop()
+            self.threadpool = None
+        return result
+
+    def close_writes(self, spider):
+        self.flush_all(spider)
+        self.close_connection(spider)
+
+    def run_db_work(self, spider, function, *args):
+        """
+        Runs function(*args) directly, or with the pool enabled in a thread with a borrowed connection.
+        Pooled work returns a Deferred, so the reactor thread never waits for a free connection; the lock keeps
+        one call per pipeline in flight and runs them in order.
+        The thread is the pipeline's own (self.threadpool), not the reactor's: waiting up to DB_POOL_TIMEOUT for a
+        connection there would starve DNS lookups and other deferToThread work.
+        """
+        if self.pool is None:
+            function(*args)
+            return None
+        from twisted.internet import reactor  # Imported late so Scrapy can install its reactor first
+        return self.pool_lock.run(threads.deferToThreadPool, reactor, self.threadpool,
+                                  self.run_pooled, spider, function, *args)
+
+    def run_pooled(self, spider, function, *args):
+        """
+        Calls function(*args) with a connection borrowed from the pool for its duration (if enabled).
+        Blocks while the pool is exhausted, only call it off the reactor thread.
+        """
+        with self.borrowed_connection(spider):
+            function(*args)
+
+    @contextlib.contextmanager
+    def borrowed_connection(self, spider):
+        """
+        Borrows a pooled connection for the block and commits and returns it afterwards.
+        Without the pool, or with a connection already borrowed (nested work), the current connection is used.
+        If the database can't be reached and the spool is enabled, the block runs offline (items are spooled).
         """
+        if self.pool is None or self.connection is not None:
+            yield
+            return
+
+        was_offline = self.offline
+        if self.connect(spider) and was_offline and self.spool is not None:
+            spider.logger.info('Database connection restored, replaying spooled items.')
+            self.replay_spool(spider)
+        try:
+            yield
+        finally:
+            self.return_connection(spider)
+
+    def return_connection(self, spider):
+        """
+        Commits the work done on a borrowed connection and hands it back to the pool.
+        A connection failing to commit is discarded and the error raised.
+        """
+        connection, self.connection, self.cursor = self.connection, None, None
+        if connection is None:
+            return
+        try:
+            connection.commit()
+        except Exception:
+            self.pool.release(connection, discard=True)
+            raise
+        else:
+            self.pool.release(connection)
+        finally:
+            self.record_pool_stats(spider)
+
+    def close_connection(self, spider):
+        unparsed_values = sum(schema.unparsed_values for schema in self.schema_registry.schemas.values())
+        if unparsed_values:
+            stats_util.increment_stat(spider, StatEnum.DB_VALUES_UNPARSED.value, unparsed_values)
+
+        if self.spool is not None:
+            if self.connection is None:
+                # Last chance to hand the spool over before the run ends
+                self.last_connect_attempt = 0.0
+                self.try_reconnect(spider)
+            stats_util.max_stat(spider, StatEnum.DB_SPOOL_PENDING.value, len(self.spool))
+            if len(self.spool):
+                spider.logger.warning(f"{len(self.spool)} items left in {self.spool.path}, "
+                                      f"they will be replayed on the next run.")
+        if self.connection is None:
+            return
+
+        if self.pool is not None:
+            # Borrowed for this write only, returned by borrowed_connection()
+            return
+
         self.connection.commit()
         self.connection.close()
         spider.logger.info('Database connection closed.')
 
+    def connect(self, spider):
+        """
+        Opens a dedicated connection, or borrows one from the pool (see borrowed_connection()).
+        With the spool enabled, a failure is logged instead of raised and the pipeline stays offline
+        (items are spooled) until try_reconnect() succeeds. Returns True once connected.
+        """
+        self.last_connect_attempt = time.monotonic()
+        try:
+            if self.pool is not None:
+                self.connection = self.borrow_connection(spider)
+            else:
+                # The writer thread takes over the connection once the spider is open
+                self.connection = db_utils.get_db_connection(
+                    db_path=self.db_path,
+                    check_same_thread=not spider.settings.getbool('DB_WRITER_THREAD_ENABLED', False),
+                    sqlite_pragmas=self.sqlite_pragmas,
+                )
+            self.cursor = self.connection.cursor()
+            self.offline = False
+            return True
+        except Exception as e:
+            self.offline = True
+            if self.spool is None:
+                raise
+            spider.logger.warning(f"Database unavailable, spooling items to {self.spool.path}: {e}")
+            self.connection = None
+            self.cursor = None
+            return False
+
+    def try_reconnect(self, spider):
+        """
+        Reconnects an offline pipeline, at most once every DB_SPOOL_RETRY_INTERVAL seconds,
+        and replays the spool once the database is back.
+        """
+        if time.monotonic() - self.last_connect_attempt < self.spool_retry_interval:
+            return False
+        if not self.connect(spider):
+            return False
+        spider.logger.info('Database connection restored, replaying spooled items.')
+        self.replay_spool(spider)
+        return True
+
+    def borrow_connection(self, spider):
+        """
+        Borrows a connection from the shared pool, recording how long the pipeline waited for it.
+        """
+        start = time.perf_counter()
+        connection = self.pool.acquire()
+        wait_ms = (time.perf_counter() - start) * 1000
+
+        stats_util.increment_stat(spider, StatEnum.DB_POOL_WAIT_MS_TOTAL.value, wait_ms)
+        stats_util.max_stat(spider, StatEnum.DB_POOL_WAIT_MS_MAX.value, wait_ms)
+        stats_util.max_stat(spider, StatEnum.DB_POOL_UTILISATION.value, self.pool.utilisation())
+        return connection
+
+    def connection_lost(self, spider):
+        """
+        Drops a broken connection and tries to replace it right away (through the pool if enabled).
+        If that fails too, the pipeline stays offline and spools items until try_reconnect() succeeds.
+        """
+        spider.logger.warning('Database connection failed, reconnecting.')
+        if self.pool is not None:
+            self.pool.release(self.connection, discard=True)
+        else:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+        self.connection = None
+        self.cursor = None
+
+        if self.connect(spider) and self.pool is not None:
+            self.pool.record_reconnect()
+            stats_util.increment_stat(spider, StatEnum.DB_POOL_RECONNECTS.value)
+
+    def spool_items(self, items, spider):
+        """
+        Appends items the database couldn't take to the local spool.
+        """
+        written = self.spool.append(items)
+        stats_util.increment_stat(spider, StatEnum.DB_ITEMS_SPOOLED.value, len(items))
+        stats_util.increment_stat(spider, StatEnum.DB_SPOOL_BYTES.value, written)
+
+    def replay_spool(self, spider):
+        """
+        Feeds every spooled item back through store_item() and flushes the resulting batches.
+        Items failing again are spooled again, for the next replay.
+        """
+        if self.replaying or self.connection is None or not len(self.spool):
+            return
+        self.replaying = True
+        try:
+            replayed = 0
+            for item in self.spool.drain():
+                self.store_item(item, spider)
+                replayed += 1
+            self.flush_all(spider)
+        finally:
+            self.replaying = False
+        stats_util.increment_stat(spider, StatEnum.DB_ITEMS_REPLAYED.value, replayed)
+        spider.logger.info(f"Replayed {replayed} spooled items.")
+
+    def record_pool_stats(self, spider):
+        stats_util.max_stat(spider, StatEnum.DB_POOL_UTILISATION.value, self.pool.utilisation())
+        stats_util.max_stat(spider, StatEnum.DB_POOL_SIZE.value, self.pool.size)
+        stats_util.max_stat(spider, StatEnum.DB_POOL_PEAK_IN_USE.value, self.pool.peak_in_use)
+
+    @latency.timed("pipeline")
     def process_item(self, item, spider):
+        """
+        Stores the item directly, or hands it to the writer thread if writer mode is enabled.
+        With the pool enabled, the item is stored in a thread and the returned Deferred fires once it is written.
+        """
+        if self.writer is not None:
+            return self.enqueue_item(item, spider)
+        if self.pool is not None:
+            d = self.run_db_work(spider, self.store_item, item, spider)
+            d.addCallback(lambda _: item)
+            return d
+
+        self.store_item(item, spider)
+        return item
+
+    def enqueue_item(self, item, spider):
+        """
+        Queues an item for the writer thread.
+        If the queue is full, returns a Deferred that fires once the item fits, so Scrapy holds back
+        further items (backpressure) without blocking the reactor.
+        """
+        with self.waiting_lock:
+            if not self.waiting and self.writer.submit(item):
+                return item
+
+            if self.spool is not None and self.spool_on_backpressure:
+                # Keep crawling at full speed, the items are replayed once the writer catches up
+                self.spool_items([item], spider)
+                return item
+
+            # Appended under the lock, so a dequeue between the failed submit and here still sees the item
+            stats_util.increment_stat(spider, StatEnum.DB_WRITER_BACKPRESSURE.value)
+            d = defer.Deferred()
+            self.waiting.append((item, d))
+        return d
+
+    def on_writer_dequeue(self, spider):
+        """
+        Called from the writer thread whenever it takes an item, wakes up waiting items on the reactor thread.
+        """
+        stats_util.max_stat(spider, StatEnum.DB_WRITER_QUEUE_MAX.value, self.writer.queue.qsize() + 1)
+        with self.waiting_lock:
+            waiting = bool(self.waiting)
+        if waiting:
+            from twisted.internet import reactor  # Imported late so Scrapy can install its reactor first
+            reactor.callFromThread(self.release_waiting)
+
+    def release_waiting(self):
+        """
+        Moves waiting items into the writer queue, in arrival order, while there is room.
+        Their Deferreds fire outside the lock, the callbacks hand Scrapy's next items to enqueue_item().
+        """
+        released = []
+        with self.waiting_lock:
+            while self.waiting and self.writer.submit(self.waiting[0][0]):
+                released.append(self.waiting.popleft())
+        for item, d in released:
+            d.callback(item)
+
+    def store_item(self, item, spider):
         """
         For each item:
-        - Ensure table exists (if auto_create is enabled)
-        - Insert the item into the appropriate table
+        - Route it to its time partition (if partitioning is configured for its class)
+        - Ensure table exists (if auto_create is enabled, only on the first item of its class)
+        - Insert the item into the appropriate table, or buffer it if batching is enabled
+        - Spool it instead if the database is unavailable (if the spool is enabled)
+        """
+        if self.connection is None and not self.try_reconnect(spider):
+            self.spool_items([item], spider)
+            return
+
+        item_class_name = item.__class__.__name__
+        table_name = item_class_name.lower()
+
+        partition_config = self.partitions.get(item_class_name)
+        partition = None
+        if partition_config:
+            partition = self.get_partition(item, table_name, partition_config, spider)
+            if self.backend != "postgres":
+                # SQLite has no native partitioning, each partition is its own table
+                table_name = partition[0]
+
+        natural_key = db_utils.get_natural_key(item, self.natural_keys) if self.upsert_enabled else None
+        partition_column = partition_config.get("column", "scrapedAt") \
+            if partition_config and self.backend == "postgres" else None
+        override_types = self.get_column_types(item)
+        if partition_column:
+            # Range bounds are compared as points in time, not as strings
+            override_types = {**(override_types or {}), partition_column: "TIMESTAMPTZ"}
+        schema = self.schema_registry.get_schema(self.cursor, item, table_name, backend=self.backend,
+                                                 override_types=override_types,
+                                                 spider=spider, create=self.auto_create,
+                                                 natural_key=natural_key, conflict_action=self.upsert_mode,
+                                                 indexes=self.indexes.get(item_class_name),
+                                                 partition_column=partition_column)
+
+        if partition_column and partition[0] not in self.partitions_created:
+            # PostgreSQL routes rows inserted into the parent, the partition only has to exist
+            db_utils.create_partition(self.cursor, table_name, *partition, spider=spider)
+            self.partitions_created.add(partition[0])
+
+        if self.batch_enabled:
+            self.buffer_item(item, table_name, spider, schema)
+            return
+
+        try:
+            if not db_utils.insert_item(self.cursor, item, table_name, spider=spider, backend=self.backend,
+                                        schema=schema, raise_errors=self.spool is not None):
+                stats_util.increment_stat(spider, StatEnum.DB_INSERT_FAILED.value)
+        except Exception as e:
+            self.write_failed([item], table_name, e, spider)
+
+    def check_partition_keys(self):
         """
+        PostgreSQL only accepts unique indexes on a partitioned table if they include the partition column.
+        Raises ValueError for an upsert natural key without it, instead of silently falling back to plain inserts
+        (and duplicate rows) once the index fails.
+        """
+        if self.backend != "postgres" or not self.upsert_enabled:
+            return
+        for class_name, partition_config in self.partitions.items():
+            item_class = getattr(item_classes, class_name, None)
+            natural_key = self.natural_keys.get(class_name, getattr(item_class, "natural_key", None))
+            column = partition_config.get("column", "scrapedAt")
+            if natural_key and column not in natural_key:
+                raise ValueError(f"{class_name} is partitioned on {column}, which its natural key "
+                                 f"{tuple(natural_key)} lacks: PostgreSQL can't enforce the upsert key on a "
+                                 f"partitioned table. Add {column} to DB_NATURAL_KEYS['{class_name}'], "
+                                 f"partition on a key column or disable DB_UPSERT_ENABLED.")
+
+    def get_partition(self, item, table_name, partition_config, spider):
+        """
+        Returns (partition_table, range_start, range_end) for the item.
+        The partition column is stamped with the current UTC time if the item doesn't carry it yet.
+        """
+        column = partition_config.get("column", "scrapedAt")
+        interval = partition_config.get("interval", "daily")
+
         adapter = ItemAdapter(item)
-        table_name = item.__class__.__name__.lower()
+        when = adapter.get(column)
+        if not when:
+            when = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            adapter[column] = when
 
-        if self.auto_create:
-            db_utils.initialize_table(self.cursor, item, table_name)
+        try:
+            return db_utils.get_partition(table_name, when, interval)
+        except ValueError as e:
+            spider.logger.warning(f"Unable to partition {table_name} on {column}={when!r}, using current date: {e}")
+            return db_utils.get_partition(table_name, datetime.datetime.now(datetime.timezone.utc), interval)
 
-        db_utils.insert_item(self.cursor, item, table_name, spider=spider, backend=self.backend)
-        return item
+    def get_column_types(self, item):
+        """
+        Returns the declared column types for the item class, resolved once per class.
+        """
+        if not self.typed_columns:
+            return None
+        column_types = self.column_types.get(item.__class__)
+        if column_types is None:
+            column_types = db_utils.get_column_types(item, self.column_type_overrides)
+            self.column_types[item.__class__] = column_types
+        return column_types
+
+    def buffer_item(self, item, table_name, spider, schema=None):
+        """
+        Adds an item to its table buffer, flushing the buffer once it is full or too old.
+        """
+        buffer = self.buffers[table_name]
+        if not buffer:
+            self.buffer_started[table_name] = time.monotonic()
+        buffer.append(item)
+        self.buffer_schemas[table_name] = schema
+
+        buffer_age = time.monotonic() - self.buffer_started[table_name]
+        if len(buffer) >= self.batch_size or 0 < self.flush_interval <= buffer_age:
+            self.flush_table(table_name, spider)
+
+    def flush_table(self, table_name, spider):
+        """
+        Writes all pending items of a table with executemany (or COPY) inside one transaction per batch.
+        Records row counts, batch sizes and flush latency in crawler stats.
+        """
+        items = self.buffers.pop(table_name, None)
+        self.buffer_started.pop(table_name, None)
+        schema = self.buffer_schemas.pop(table_name, None)
+        if not items:
+            return
+        if self.connection is None:
+            self.spool_items(items, spider)
+            return
+
+        start = time.perf_counter()
+        spooling = self.spool is not None
+        try:
+            with db_utils.batch_transaction(self.connection):
+                if self.copy_enabled and schema is not None:
+                    inserted = db_utils.copy_items(self.cursor, items, table_name, schema, spider=spider,
+                                                   raise_errors=spooling)
+                else:
+                    inserted = db_utils.insert_items(self.cursor, items, table_name, spider=spider,
+                                                     backend=self.backend, schema=schema, raise_errors=spooling)
+        except Exception as e:
+            if self.pool is None and not spooling:
+                raise
+            inserted = 0
+            self.write_failed(items, table_name, e, spider)
+        else:
+            if inserted < len(items):
+                # Rows rejected for permanent errors, logged by insert_items() / copy_items()
+                stats_util.increment_stat(spider, StatEnum.DB_INSERT_FAILED.value, len(items) - inserted)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        stats_util.increment_stat(spider, StatEnum.DB_ROWS_INSERTED.value, inserted)
+        stats_util.increment_stat(spider, StatEnum.DB_BATCHES_FLUSHED.value)
+        stats_util.max_stat(spider, StatEnum.DB_BATCH_SIZE_MAX.value, len(items))
+        stats_util.increment_stat(spider, StatEnum.DB_FLUSH_LATENCY_MS_TOTAL.value, latency_ms)
+        stats_util.max_stat(spider, StatEnum.DB_FLUSH_LATENCY_MS_MAX.value, latency_ms)
+
+        if inserted and spooling and len(self.spool):
+            # The database takes writes again, catch up on what was spooled meanwhile
+            self.replay_spool(spider)
+
+    def write_failed(self, items, table_name, error, spider):
+        """
+        Handles a failed write and replaces the connection if it broke.
+        - Transient errors (see db_utils.is_transient_error()) spool the items, if the spool is enabled
+        - Anything else (schema, constraint, syntax errors) fails the same way on replay, so the rows are dropped
+          and counted as failed
+        """
+        if self.spool is not None and db_utils.is_transient_error(error):
+            spider.logger.error(f"Write of {len(items)} {table_name} rows failed, spooling them: {error}")
+            self.spool_items(items, spider)
+        else:
+            spider.logger.error(f"Write of {len(items)} {table_name} rows failed permanently: {error}")
+            stats_util.increment_stat(spider, StatEnum.DB_INSERT_FAILED.value, len(items))
+        if not db_utils.is_connection_alive(self.connection):
+            self.connection_lost(spider)
+
+    def flush_expired(self, spider):
+        """
+        Flushes every buffer older than the configured flush interval.
+        An offline pipeline also retries its connection here, so the spool is replayed even while no items arrive.
+        """
+        if self.connection is None and self.spool is not None:
+            self.try_reconnect(spider)
+        now = time.monotonic()
+        for table_name, started in list(self.buffer_started.items()):
+            if now - started >= self.flush_interval:
+                self.flush_table(table_name, spider)
+
+    def flush_all(self, spider):
+        """
+        Flushes every pending buffer regardless of size or age.
+        """
+        for table_name in list(self.buffers):
+            self.flush_table(table_name, spider)
 
     def insert_item_into(self, item, spider, table_name):
         """
@@ -36,6 +36,15 @@ DOWNLOAD_TIMEOUT = 30
 # CONCURRENT_REQUESTS_PER_DOMAIN = 16
 # CONCURRENT_REQUESTS_PER_IP = 16
 
+# Per-domain limits, BaseSpider watchlist refreshes send every request to marketwatch.com.
+# Raise concurrency together with BaseSpider's AUTOTHROTTLE_TARGET_CONCURRENCY
+DOWNLOAD_SLOTS = {
+    "www.marketwatch.com": {"concurrency": 8, "delay": 0.25},
+}
+
+# Seconds a watchlist refresh (one shard) should finish within, slower refreshes are logged as a warning (0 disables)
+WATCHLIST_REFRESH_INTERVAL = 300
+
 # AUTOTHROTTLE
 AUTOTHROTTLE_ENABLED = True
 AUTOTHROTTLE_START_DELAY = 5
@@ -66,6 +75,8 @@ SPIDER_MIDDLEWARES = {
     # Session stats only executes on close, so order doesn't affect it much
     "diamond_scraper.middlewares.core_middlewares.SessionStatsLoggerMiddleware": 100,
     "diamond_scraper.middlewares.core_middlewares.DiamondScraperSpiderMiddleware": 543,
+    # Closest to the spider so it times the callbacks themselves, not configured unless LATENCY_STATS_ENABLED
+    "diamond_scraper.middlewares.core_middlewares.LatencySpiderMiddleware": 999,
 }
 
 # ─────────────────────────────────────────────────────────────
@@ -75,40 +86,116 @@ SPIDER_MIDDLEWARES = {
 DOWNLOADER_MIDDLEWARES = {
     "diamond_scraper.middlewares.core_middlewares.DiamondScraperDownloaderMiddleware": 543,
     "diamond_scraper.middlewares.proxy_rotation_middleware.ProxyRotationMiddleware": 543,
+    # Not configured unless INCREMENTAL_ENABLED is set. Below HttpCompressionMiddleware (590), so it hashes
+    # decompressed bodies
+    "diamond_scraper.middlewares.incremental_middleware.IncrementalCrawlMiddleware": 580,
+    # Not configured unless RENDER_ON_DEMAND_ENABLED is set. Above IncrementalCrawlMiddleware, so only the
+    # response that is kept (static or rendered) is hashed
+    "diamond_scraper.middlewares.render_middleware.RenderOnDemandMiddleware": 585,
 }
 
+# ─────────────────────────────────────────────────────────────
+#                          EXTENSIONS
+# ─────────────────────────────────────────────────────────────
+
+EXTENSIONS = {
+    # Not configured unless LOG_QUEUE_ENABLED is set
+    "diamond_scraper.extensions.log_queue.QueueLoggingExtension": 0,
+    # Not configured unless LATENCY_STATS_ENABLED is set
+    "diamond_scraper.extensions.latency_stats.LatencyStatsExtension": 0,
+    # Not configured unless PROCESS_OFFLOAD_ENABLED is set
+    "diamond_scraper.extensions.process_offload.ProcessOffloadExtension": 0,
+}
+
+# Time pipelines, middlewares and spider callbacks into histograms, reported as latency/<component>/p50_ms etc.
+# in crawler stats at spider close
+LATENCY_STATS_ENABLED = False
+
+# Run HTML extraction of spider callbacks in a pool of worker processes, off the reactor thread
+PROCESS_OFFLOAD_ENABLED = False
+PROCESS_OFFLOAD_WORKERS = 0  # Worker processes (0 for one per CPU core)
+PROCESS_OFFLOAD_MAX_IN_FLIGHT = 0  # Responses queued in the pool at once (0 for twice the workers)
+
 # ─────────────────────────────────────────────────────────────
 #                     PLAYWRIGHT HANDLER
 # ─────────────────────────────────────────────────────────────
 
+# Only requests with meta["playwright"] = True are rendered in the browser, the handler downloads everything
+# else with Scrapy's plain HTTP handler
 DOWNLOAD_HANDLERS = {
     "http": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
     "https": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
 }
 
+# Fetch over plain HTTP first and render with Playwright only when the spider's render_selectors are missing
+# from the static response, learning per URL pattern which of the two works
+RENDER_ON_DEMAND_ENABLED = False
+RENDER_ON_DEMAND_LEARN_AFTER = 3  # Escalations, without a working static fetch, before a pattern skips plain HTTP
+RENDER_ON_DEMAND_PROBE_INTERVAL = 50  # Retry a learned pattern over plain HTTP every this many requests (0 disables)
+
 # ─────────────────────────────────────────────────────────────
 #                         PIPELINES
 # ─────────────────────────────────────────────────────────────
 
 ITEM_PIPELINES = {
     # "diamond_scraper.pipelines.core_pipelines.DiamondScraperPipeline": 100,
+    # "diamond_scraper.pipelines.core_pipelines.NormalizationPipeline": 150,
     # "diamond_scraper.pipelines.InvalidDataPipeline": 200,
     "diamond_scraper.pipelines.core_pipelines.DuplicatesPipeline": 300,
     "diamond_scraper.pipelines.db_pipeline.DatabasePipeline": 998,
     # "diamond_scraper.pipelines.TestPipeline": 999,
 }
 
+# DuplicatesPipeline: item key fields per item class (defaults to the item's natural_key, else "timestamp")
+DEDUP_KEY_FIELDS = {}  # e.g. {"IntoliItem": ["userAgentTest"]}
+DEDUP_STORE_CLASS = "diamond_scraper.utils.dedup_store.MemoryDedupStore"
+DEDUP_MAX_ENTRIES = 100000  # Least recently seen keys are evicted past this many
+DEDUP_TTL = 0  # Seconds after which a key is accepted again (0 keeps keys until evicted)
+
+# Set DEDUP_STORE_CLASS to "diamond_scraper.utils.dedup_store.BloomDedupStore" for crawls with tens of millions
+# of items: a scalable Bloom filter using a few bytes per key, at the cost of occasional false duplicates
+DEDUP_BLOOM_CAPACITY = 1000000  # Keys the first filter holds before another (twice as large) one is added
+DEDUP_BLOOM_ERROR_RATE = 0.001  # Upper bound of the overall false positive rate
+
+# InvalidDataPipeline: validate items in micro-batches, numeric fields column-wise with NumPy (optional extra,
+# pip install numpy). Measured gains are small (~1.1x end to end), per-item validation stays the default
+VALIDATION_BATCH_ENABLED = False
+VALIDATION_BATCH_SIZE = 100  # Keep at or below CONCURRENT_ITEMS, or batches only fill up through the timeout
+VALIDATION_BATCH_TIMEOUT = 0.5  # Seconds a partial batch waits before it is validated anyway
+
+# Entries kept by the bounded per-item stats of ValidationLogger (last input/output items, samples of
+# flagged/invalid values), so stats memory stays constant however long the crawl runs
+STATS_SAMPLE_SIZE = 20
+
 # ─────────────────────────────────────────────────────────────
 #                 FEEDS / DATA EXPORT FORMATS
 # ─────────────────────────────────────────────────────────────
 
 FEEDS = {
     "data.jl": {
-        "format": "jsonlines",
+        "format": "fastjsonlines",
         "encoding": "utf8",
-        "indent": 4,
     }
 }
+# High-volume runs: compressed segments rotated by size/age, e.g.
+# FEEDS = {
+#     "rotating:output/data.jl": {
+#         "format": "fastjsonlines",
+#         "encoding": "utf8",
+#         "compression": "gzip",  # or "zstd" (needs zstandard), None to write plain segments
+#         "rotate_bytes": 256 * 1024 * 1024,  # Uncompressed bytes per segment
+#         "rotate_seconds": 3600,
+#     }
+# }
+
+FEED_EXPORTERS = {
+    # Compact JSON Lines encoded with orjson (stdlib fallback)
+    "fastjsonlines": "diamond_scraper.exporters.fast_exporters.FastJsonLinesItemExporter",
+}
+FEED_STORAGES = {
+    # Compressed feed segments rotated by size or age
+    "rotating": "diamond_scraper.exporters.rotating_storage.RotatingFileFeedStorage",
+}
 
 # ─────────────────────────────────────────────────────────────
 #                     HTTP CACHE (DISABLED)
@@ -120,6 +207,15 @@ HTTPCACHE_DIR = "httpcache"
 HTTPCACHE_IGNORE_HTTP_CODES = []
 # HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
 
+# ─────────────────────────────────────────────────────────────
+#                     INCREMENTAL CRAWLING
+# ─────────────────────────────────────────────────────────────
+
+# Conditional requests (ETag / Last-Modified) and content hashes per URL, pages unchanged since the previous run
+# are dropped before parsing and never reach the pipelines
+INCREMENTAL_ENABLED = False
+INCREMENTAL_STATE_PATH = "DWS_incremental_state.json"  # Used without JOBDIR, with it the state lives in JOBDIR
+
 # ─────────────────────────────────────────────────────────────
 #              PLAYWRIGHT & TWISTED ASYNC REACTOR
 # ─────────────────────────────────────────────────────────────
@@ -136,6 +232,14 @@ LOG_LEVEL = "INFO"
 
 LOG_FILE_APPEND = False
 
+# Write log files/console from a background thread (QueueLoggingExtension) instead of the reactor thread
+LOG_QUEUE_ENABLED = False
+LOG_QUEUE_SIZE = 10000  # Records buffered before new ones are dropped (0 for unbounded)
+
+# Per-event limits of the structured item-path logs (see utils/log_utils.EventLogger), keyed by event name
+LOG_EVENT_RATE_LIMITS = {"duplicate_item": 10, "proxy_used": 10}  # Max records per second
+LOG_EVENT_SAMPLE_RATES = {"raw_item": 100, "db_insert_item": 100}  # Log 1 in N records
+
 # ─────────────────────────────────────────────────────────────
 #                  PLAYWRIGHT CONFIGURATION
 # ─────────────────────────────────────────────────────────────
@@ -171,4 +275,64 @@ ENABLE_FALLBACK_PROXY = True
 PROXY_FAILURE_CHECK_ENABLED = True
 FAILURE_THRESHOLD = 3
 
+# ─────────────────────────────────────────────────────────────
+#                      DATABASE SETTINGS
+# ─────────────────────────────────────────────────────────────
+
 # TODO Database local settings
+DB_PATH = "DWS_scraper.db"
+
+# Buffer items per table and write them with executemany instead of one INSERT per item
+DB_BATCH_ENABLED = False
+DB_BATCH_SIZE = 100  # Flush a table buffer once it holds this many items
+DB_BATCH_FLUSH_INTERVAL = 5.0  # Flush a table buffer once its oldest item is this many seconds old (0 disables)
+
+# Stream batches into PostgreSQL with COPY ... FROM STDIN (requires DB_BACKEND=postgres and DB_BATCH_ENABLED)
+DB_COPY_ENABLED = False
+
+# Share a process-wide connection pool between database pipelines instead of one connection each
+DB_POOL_ENABLED = False
+DB_POOL_SIZE = 4  # Maximum open connections per backend and database path
+DB_POOL_TIMEOUT = 30.0  # Seconds to wait for a free connection before failing
+DB_POOL_HEALTH_CHECK_INTERVAL = 30.0  # Idle seconds after which a connection is checked before reuse
+
+# Write items from a dedicated thread fed by a bounded queue, so slow databases don't stall the reactor.
+# Implies batching with the DB_BATCH_* settings above. When the queue is full, new items wait (backpressure).
+DB_WRITER_THREAD_ENABLED = False
+DB_WRITER_QUEUE_SIZE = 1000
+
+# SQLite PRAGMA profile applied at connect time: "default", "safe", "balanced" or "fast" (see db_utils.SQLITE_PROFILES)
+DB_SQLITE_PROFILE = "default"
+DB_SQLITE_PRAGMAS = {}  # Per-pragma overrides, e.g. {"cache_size": -128000}
+
+# Dedup in the database: a unique index on each item's natural key (e.g. StockItem.natural_key) plus
+# INSERT ... ON CONFLICT. Survives restarts and needs no crawler memory, DuplicatesPipeline can then be disabled.
+DB_UPSERT_ENABLED = False
+DB_UPSERT_MODE = "ignore"  # "ignore" keeps the first row (DO NOTHING), "update" keeps the latest (DO UPDATE)
+DB_NATURAL_KEYS = {}  # Per item class overrides, e.g. {"StockItem": ["tickerSymbol", "timestamp"]}
+
+# Create REAL/INTEGER columns for fields declared with Field(sql_type=...) and parse scraped strings into them.
+# Only affects newly created tables, existing TEXT columns keep their type.
+DB_TYPED_COLUMNS = False
+DB_COLUMN_TYPES = {}  # Per item class overrides, e.g. {"StockItem": {"marketCap": "INTEGER"}}
+
+# Secondary indexes per item class, created with the table (and on every partition)
+DB_INDEXES = {
+    "StockItem": [["tickerSymbol", "timestamp"]],
+}
+
+# Time partitioning per item class. "column" holds an ISO timestamp (stamped with the UTC scrape time if unset),
+# "interval" is "daily" or "monthly". SQLite gets one table per partition (stockitem_2025_01_02),
+# PostgreSQL a parent table with native range partitions (TIMESTAMPTZ column). With DB_UPSERT_ENABLED on PostgreSQL
+# the natural key must include the column, e.g. DB_NATURAL_KEYS = {"StockItem": ["tickerSymbol", "scrapedAt"]}.
+DB_PARTITIONS = {
+    # "StockItem": {"column": "scrapedAt", "interval": "daily"},
+}
+
+# Append items to a local length-prefixed JSON spool file while the database is down (or a batch write fails),
+# and replay them once it is back and at the start of the next run. Items are never dropped or blocked on.
+DB_SPOOL_ENABLED = False
+DB_SPOOL_PATH = "DWS_spool.bin"
+DB_SPOOL_FSYNC = False  # fsync every append, survives power loss at the cost of throughput
+DB_SPOOL_RETRY_INTERVAL = 10.0  # Seconds between reconnect attempts while the database is down
+DB_SPOOL_ON_BACKPRESSURE = True  # Spool instead of waiting when the writer thread queue is full
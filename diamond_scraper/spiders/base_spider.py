@@ -1,5 +1,11 @@
+import time
+
 import scrapy
+from lxml import etree
+from parsel.csstranslator import css2xpath
 from diamond_scraper.items import StockItem
+from diamond_scraper.utils import db_utils, offload, watchlist
+from diamond_scraper.utils.parse_utils import split_range
 
 class BaseSpider(scrapy.Spider):
     name = 'base'
@@ -9,60 +15,210 @@ class BaseSpider(scrapy.Spider):
     books_scraped = 0
     max_depth = 3
 
+    # Watchlist mode, enabled with spider arguments, e.g. -a tickers=watchlist.txt -a shard=0 -a shards=4
+    # - tickers: file with one ticker per line, or "db" / "db:<table>" for the tickers already stored
+    # - shard/shards: crawl only the tickers hashing to this shard, one crawl per shard covers the list
+    tickers = None
+    shard = 0
+    shards = 1
+    quote_url = "https://www.marketwatch.com/investing/stock/{ticker}"
+    refresh_started = None
+
+    # Part of the quote page hashed by IncrementalCrawlMiddleware, news and navigation changes don't count
+    incremental_region = "div.region--intraday, div.region--primary"
+
+    # Rendered with Playwright by RenderOnDemandMiddleware only if the static page lacks these (e.g. a JS shell)
+    render_selectors = ["span.company__ticker", "h2.intraday__price bg-quote"]
+
+    custom_settings = {
+        # Keep as many requests in flight as the marketwatch.com DOWNLOAD_SLOTS concurrency (settings.py)
+        "AUTOTHROTTLE_TARGET_CONCURRENCY": 8.0,
+    }
+
     def start_requests(self):
+        if self.tickers:
+            yield from self.watchlist_requests()
+            return
+
         for url in self.urls:
             # yield scrapy.Request(url=url, callback=self.parse)
             self.logger.info(f"Beginning request for url: {url}")
             yield scrapy.Request(url=url, callback=self.parse_market_watch)
 
+    def read_tickers(self):
+        """
+        Yields the tickers of the watchlist source lazily, the file or table is read as requests are scheduled.
+        """
+        if not watchlist.is_db_source(self.tickers):
+            yield from watchlist.read_ticker_file(self.tickers)
+            return
+
+        connection = db_utils.get_db_connection(self.settings.get("DB_PATH"))
+        try:
+            yield from watchlist.read_ticker_table(connection, watchlist.db_source_table(self.tickers))
+        finally:
+            connection.close()
+
+    def watchlist_requests(self):
+        shard, shards = int(self.shard), int(self.shards)
+        self.logger.info(f"Refreshing watchlist {self.tickers}, shard {shard} of {shards}")
+        self.refresh_started = time.monotonic()
+        for ticker in watchlist.shard_tickers(self.read_tickers(), shard, shards):
+            self.crawler.stats.inc_value("custom/watchlist_tickers")
+            yield scrapy.Request(url=self.quote_url.format(ticker=ticker.lower()), callback=self.parse_market_watch)
 
-    def parse_market_watch(self, response):
-        # Basic Identifiers
-        tickerSymbol = response.css("span.company__ticker::text").get()
-        name = response.css("h1.company__name::text").get()
-        currency = response.css("h2.intraday__price sup.character::text").get()
-
-        # Market Data
-        timestamp = response.css("span.timestamp__time bg-quote::text").get()
-        timezone = response.css("span.timestamp__time::text").getall()[-1]
-        price = response.css("h2.intraday__price bg-quote::text").get()
-        priceChange = response.css("h2.intraday__price sup.character::text").get()
-        percentChange = response.css("h2.intraday__price bg-quote::text").get()
-
-        # Trading Data
-        volume = response.css("div.range__header span.primary::text").get()
-        table_items = response.css("div.region.region--primary ul.list.list--kv.list--col50 li.kv__item "
-                                   "span.primary::text").getall()
-        open = table_items[0]
-        dayLow = table_items[1][:table_items[1].index("-")]
-        dayHigh = table_items[1][table_items[1].index("-") + 1:]
-        avgVolume = table_items[15]
-
-        # Company Valuation Metrics
-        marketCap = table_items[3]
-        peRatio = table_items[8]
-        eps = table_items[9]
+    def closed(self, reason):
+        if self.refresh_started is None:
+            return
+        elapsed = time.monotonic() - self.refresh_started
+        self.crawler.stats.set_value("custom/watchlist_refresh_time", elapsed)
+        interval = self.settings.getfloat("WATCHLIST_REFRESH_INTERVAL")
+        if interval and elapsed > interval:
+            self.logger.warning(f"Watchlist refresh took {elapsed:.0f}s, longer than the {interval:.0f}s "
+                                f"WATCHLIST_REFRESH_INTERVAL. Add shards or raise the DOWNLOAD_SLOTS concurrency")
+
+    async def parse_market_watch(self, response):
+        # Runs in the process pool with PROCESS_OFFLOAD_ENABLED, inline otherwise
+        fields = await offload.extract(self, extract_market_watch, response)
 
         self.logger.info("Fields scraped, yielding")
-        item = StockItem(
-            tickerSymbol=tickerSymbol,
-            name=name,
-            currency=currency,
-            timestamp=timestamp,
-            timezone=timezone,
-            price=price,
-            priceChange=priceChange,
-            percentChange=percentChange,
-            open=open,
-            dayLow=dayLow,
-            dayHigh=dayHigh,
-            volume=volume,
-            avgVolume=avgVolume,
-            marketCap=marketCap,
-            peRatio=peRatio,
-            eps=eps,
-        )
-
-        yield item
+        yield StockItem(**fields)
+
+
+def compile_css(css):
+    """
+    Translates a CSS selector (with parsel's ::text support) to XPath and compiles it with lxml.
+    smart_strings=False returns text results as plain strings, without a reference back to their tree.
+    """
+    return etree.XPath(css2xpath(css), smart_strings=False)
+
+
+# The page is walked once to collect the anchor elements below (tag, class token -> region),
+# the compiled queries then only run inside those regions instead of over the whole document
+ANCHORS = {
+    ("span", "company__ticker"): "ticker",
+    ("h1", "company__name"): "name",
+    ("h2", "intraday__price"): "price",
+    ("span", "timestamp__time"): "timestamp",
+    ("div", "range__header"): "range",
+    ("div", "region--primary"): "key_data",  # Also requires the "region" class, see find_anchors()
+}
+ANCHOR_TAGS = tuple({tag for tag, _ in ANCHORS})
+
+# Compiled once at spider load, relative to an anchor element
+TEXT = etree.XPath("text()", smart_strings=False)  # The anchor's own text, like "span.x::text"
+PRICE_SUP = compile_css("sup.character::text")
+BG_QUOTE = compile_css("bg-quote::text")
+PRIMARY = compile_css("span.primary::text")
+
+# Key data list, mapped by label instead of by position
+KEY_DATA_ITEMS = compile_css("ul.list.list--kv.list--col50 li.kv__item")
+KEY_DATA_LABEL = compile_css("small.label::text")
+KEY_DATA_FIELDS = {
+    "Open": "open",
+    "Day Range": "dayRange",
+    "Market Cap": "marketCap",
+    "P/E Ratio": "peRatio",
+    "EPS": "eps",
+    "Average Volume": "avgVolume",
+}
+
+
+def first(results):
+    return results[0] if results else None
+
+
+def last(results):
+    return results[-1] if results else None
+
+
+def find_anchors(root):
+    """
+    Returns {region: [elements in document order]} for the ANCHORS found in a single pass over the page.
+    """
+    anchors = {}
+    for element in root.iter(ANCHOR_TAGS):
+        classes = element.get("class")
+        if not classes:
+            continue
+        classes = classes.split()
+        for token in classes:
+            region = ANCHORS.get((element.tag, token))
+            if region is None or (region == "key_data" and "region" not in classes):
+                continue
+            anchors.setdefault(region, []).append(element)
+    return anchors
+
+
+def select(anchors, region, query):
+    """
+    Runs a compiled query inside every anchor of a region, results in document order.
+    """
+    results = []
+    for element in anchors.get(region, ()):
+        results.extend(query(element))
+    return results
+
+
+def extract_key_data(anchors):
+    """
+    Returns {field: value} for the KEY_DATA_FIELDS labels present in the key data list.
+    """
+    key_data = {}
+    for entry in select(anchors, "key_data", KEY_DATA_ITEMS):
+        label = first(KEY_DATA_LABEL(entry))
+        field = KEY_DATA_FIELDS.get(label.strip()) if label else None
+        if field is not None:
+            key_data[field] = first(PRIMARY(entry))
+    return key_data
+
+
+def extract_market_watch(response):
+    """
+    Extracts the StockItem fields of a MarketWatch quote page.
+    Module-level (picklable) so it can run in an offload worker process.
+    """
+    anchors = find_anchors(response.selector.root)
+
+    # Basic Identifiers
+    tickerSymbol = first(select(anchors, "ticker", TEXT))
+    name = first(select(anchors, "name", TEXT))
+    currency = first(select(anchors, "price", PRICE_SUP))
+
+    # Market Data
+    timestamp = first(select(anchors, "timestamp", BG_QUOTE))
+    timezone = last(select(anchors, "timestamp", TEXT))
+    price = first(select(anchors, "price", BG_QUOTE))
+    priceChange = currency
+    percentChange = price
+
+    # Trading Data
+    volume = first(select(anchors, "range", PRIMARY))
+    key_data = extract_key_data(anchors)
+    open = key_data.get("open")
+    dayLow, dayHigh = split_range(key_data.get("dayRange")) or (None, None)
+    avgVolume = key_data.get("avgVolume")
 
+    # Company Valuation Metrics
+    marketCap = key_data.get("marketCap")
+    peRatio = key_data.get("peRatio")
+    eps = key_data.get("eps")
 
+    return dict(
+        tickerSymbol=tickerSymbol,
+        name=name,
+        currency=currency,
+        timestamp=timestamp,
+        timezone=timezone,
+        price=price,
+        priceChange=priceChange,
+        percentChange=percentChange,
+        open=open,
+        dayLow=dayLow,
+        dayHigh=dayHigh,
+        volume=volume,
+        avgVolume=avgVolume,
+        marketCap=marketCap,
+        peRatio=peRatio,
+        eps=eps,
+    )
@@ -1,6 +1,7 @@
 import scrapy
 from diamond_scraper.items import IntoliItem
 import diamond_scraper.utils.stealth_utils as stealth
+from diamond_scraper.utils import offload, table_mapper
 import random
 from scrapy_playwright.page import PageMethod
 import time
@@ -50,7 +51,7 @@ class IntoliSpider(scrapy.Spider):
             )
             """
 
-    def parse(self, response):
+    async def parse(self, response):
         print("arrived at parse")
         self.logger.info("[INTOLI] Playwright rendering triggered.")
         print(f"[DEBUG] Rendered response length: {len(response.text)}")
@@ -73,107 +74,95 @@ class IntoliSpider(scrapy.Spider):
             fpCollectDump = scrapy.Field()
         """
 
-        def extract_general_table_elements(snippet, default=None):
-            """
-            Extracts test status and value from a <tr> snippet.
-            Returns a dict with 'status' and 'value' keys.
-            """
-            result_cell = snippet.css('td:nth-child(2)')
-            status_class = result_cell.attrib.get('class', '').strip()
-
-            value = result_cell.css('::text').get()
-            return {
-                "status": status_class if status_class else default,
-                "value": value.strip() if value else default
-            }
-        
-        def extract_fingerprint_table_elements(snippet, default=None):
-            result_cell = snippet.css('td:nth-child(2)')
-            status = result_cell.css('::text').get()
-
-            value_cell = snippet.css('td:nth-child(3)')
-            value = value_cell.css('::text').get()
-            return {
-                "status": status if status else default,
-                "value": value.strip() if value else default
-            }
-
-
-        generalTests = response.css('table tr')
+        # Runs in the process pool with PROCESS_OFFLOAD_ENABLED, inline otherwise
         try:
-            userAgentTest = extract_general_table_elements(generalTests[1])
-            webDriverTest = extract_general_table_elements(generalTests[2])
-            webDriverAdvancedTest = extract_general_table_elements(generalTests[3])
-            chromeTest = extract_general_table_elements(generalTests[4])
-            permissionsTest = extract_general_table_elements(generalTests[5])
-            pluginsLengthTest = extract_general_table_elements(generalTests[6])
-            pluginsTypeTest = extract_general_table_elements(generalTests[7])
-            languageTest = extract_general_table_elements(generalTests[8])
-            webGLVendorTest = extract_general_table_elements(generalTests[9])
-            webGLRendererTest = extract_general_table_elements(generalTests[10])
-            brokenImageDimensionsTest = extract_general_table_elements(generalTests[11])
-        except Exception as e:
-            self.logger.warning(f"Failed to extract general tests: {e}")
+            fields = await offload.extract(self, extract_intoli_tests, response)
+        except ValueError as e:
+            self.logger.warning(str(e))
             return
+        yield IntoliItem(**fields)
 
-        fingerprintTests = response.css('[id=fp2] tr')
-        try:
-            phantomUaTest = extract_fingerprint_table_elements(fingerprintTests[0])
-            phantomPropertiesTest = extract_fingerprint_table_elements(fingerprintTests[1])
-            phantomEtslTest = extract_fingerprint_table_elements(fingerprintTests[2])
-            phantomLanguageTest = extract_fingerprint_table_elements(fingerprintTests[3])
-            phantomWebsocketTest = extract_fingerprint_table_elements(fingerprintTests[4])
-            MQ_ScreenTest = extract_fingerprint_table_elements(fingerprintTests[5])
-            phantomOverflowTest = extract_fingerprint_table_elements(fingerprintTests[6])
-            phantomWindowHeightTest = extract_fingerprint_table_elements(fingerprintTests[7])
-            headchrUaTest = extract_fingerprint_table_elements(fingerprintTests[8])
-            headchrChromeObjTest = extract_fingerprint_table_elements(fingerprintTests[9])
-            headchrPermissionsTest = extract_fingerprint_table_elements(fingerprintTests[10])
-            headchrPluginsTest = extract_fingerprint_table_elements(fingerprintTests[11])
-            headchrIframeTest = extract_fingerprint_table_elements(fingerprintTests[12])
-            chromeDebugToolsTest = extract_fingerprint_table_elements(fingerprintTests[13])
-            seleniumDriverTest = extract_fingerprint_table_elements(fingerprintTests[14])
-            batteryTest = extract_fingerprint_table_elements(fingerprintTests[15])
-            memoryTest = extract_fingerprint_table_elements(fingerprintTests[16])
-            transparentPixelTest = extract_fingerprint_table_elements(fingerprintTests[17])
-            sequentumTest = extract_fingerprint_table_elements(fingerprintTests[18])
-            videoCodecsTest = extract_fingerprint_table_elements(fingerprintTests[19])
-        except Exception as e:
-            self.logger.warning(f"Failed to extract fingerprint tests: {e}")
-            return
 
-        item = IntoliItem(
-            userAgentTest=userAgentTest,
-            webDriverTest=webDriverTest,
-            webDriverAdvancedTest=webDriverAdvancedTest,
-            chromeTest=chromeTest,
-            permissionsTest=permissionsTest,
-            pluginsLengthTest=pluginsLengthTest,
-            pluginsTypeTest=pluginsTypeTest,
-            languageTest=languageTest,
-            webGLVendorTest=webGLVendorTest,
-            webGLRendererTest=webGLRendererTest,
-            brokenImageDimensionsTest=brokenImageDimensionsTest,
-
-            phantomUaTest=phantomUaTest,
-            phantomPropertiesTest=phantomPropertiesTest,
-            phantomEtslTest=phantomEtslTest,
-            phantomLanguageTest=phantomLanguageTest,
-            phantomWebsocketTest=phantomWebsocketTest,
-            MQ_ScreenTest=MQ_ScreenTest,
-            phantomOverflowTest=phantomOverflowTest,
-            phantomWindowHeightTest=phantomWindowHeightTest,
-            headchrUaTest=headchrUaTest,
-            headchrChromeObjTest=headchrChromeObjTest,
-            headchrPermissionsTest=headchrPermissionsTest,
-            headchrPluginsTest=headchrPluginsTest,
-            headchrIframeTest=headchrIframeTest,
-            chromeDebugToolsTest=chromeDebugToolsTest,
-            seleniumDriverTest=seleniumDriverTest,
-            batteryTest=batteryTest,
-            memoryTest=memoryTest,
-            transparentPixelTest=transparentPixelTest,
-            sequentumTest=sequentumTest,
-            videoCodecsTest=videoCodecsTest,
-        )
-        yield item
+def read_general_row(cells):
+    """
+    Status (class of the result cell) and value (its text) of a general test row.
+    """
+    result_cell = cells[1]
+    status_class = result_cell.get('class', '').strip()
+    return {
+        "status": status_class if status_class else None,
+        "value": table_mapper.cell_text(result_cell)
+    }
+
+
+def read_fingerprint_row(cells):
+    """
+    Status (second cell) and value (third cell) of a fingerprint test row.
+    """
+    status = table_mapper.TEXT(cells[1])
+    return {
+        "status": status[0] if status and status[0] else None,
+        "value": table_mapper.cell_text(cells[2])
+    }
+
+
+# Row label (first cell) -> IntoliItem field, rows are matched by label so their order doesn't matter
+GENERAL_TESTS = {
+    "User Agent": "userAgentTest",
+    "WebDriver": "webDriverTest",
+    "WebDriver Advanced": "webDriverAdvancedTest",
+    "Chrome": "chromeTest",
+    "Permissions": "permissionsTest",
+    "Plugins Length": "pluginsLengthTest",
+    "Plugins is of type PluginArray": "pluginsTypeTest",
+    "Languages": "languageTest",
+    "WebGL Vendor": "webGLVendorTest",
+    "WebGL Renderer": "webGLRendererTest",
+    "Broken Image Dimensions": "brokenImageDimensionsTest",
+}
+
+# fp-collect table (#fp2)
+FINGERPRINT_TESTS = {
+    "PHANTOM_UA": "phantomUaTest",
+    "PHANTOM_PROPERTIES": "phantomPropertiesTest",
+    "PHANTOM_ETSL": "phantomEtslTest",
+    "PHANTOM_LANGUAGE": "phantomLanguageTest",
+    "PHANTOM_WEBSOCKET": "phantomWebsocketTest",
+    "MQ_SCREEN": "MQ_ScreenTest",
+    "PHANTOM_OVERFLOW": "phantomOverflowTest",
+    "PHANTOM_WINDOW_HEIGHT": "phantomWindowHeightTest",
+    "HEADCHR_UA": "headchrUaTest",
+    "HEADCHR_CHROME_OBJ": "headchrChromeObjTest",
+    "HEADCHR_PERMISSIONS": "headchrPermissionsTest",
+    "HEADCHR_PLUGINS": "headchrPluginsTest",
+    "HEADCHR_IFRAME": "headchrIframeTest",
+    "CHR_DEBUG_TOOLS": "chromeDebugToolsTest",
+    "SELENIUM_DRIVER": "seleniumDriverTest",
+    "CHR_BATTERY": "batteryTest",
+    "CHR_MEMORY": "memoryTest",
+    "TRANSPARENT_PIXEL": "transparentPixelTest",
+    "SEQUENTUM": "sequentumTest",
+    "VIDEO_CODECS": "videoCodecsTest",
+}
+
+# The general tests table is the first one on the page, the fp-collect table has its own WEBDRIVER etc. rows
+INTOLI_TABLES = (table_mapper.TableMapper()
+                 .add_table("general", "table", GENERAL_TESTS, read_general_row)
+                 .add_table("fingerprint", "#fp2", FINGERPRINT_TESTS, read_fingerprint_row))
+
+
+def extract_intoli_tests(response):
+    """
+    Extracts the IntoliItem fields from the bot.sannysoft.com result tables, in one pass over their rows.
+    Module-level (picklable) so it can run in an offload worker process, raises ValueError if a table is incomplete.
+    """
+    try:
+        fields = INTOLI_TABLES.map(response.selector.root)
+    except IndexError as e:
+        raise ValueError(f"Failed to extract tests, row with too few cells: {e}") from e
+
+    missing = INTOLI_TABLES.missing(fields)
+    if missing:
+        raise ValueError("Failed to extract " + "; ".join(f"{name} tests: missing {', '.join(labels)}"
+                                                          for name, labels in missing.items()))
+    return fields
@@ -0,0 +1,110 @@
+import numpy as np
+
+# Comparison operators usable in numeric constraints
+OPERATORS = {
+    ">=": np.greater_equal,
+    ">": np.greater,
+    "<=": np.less_equal,
+    "<": np.less,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+
+def to_float_array(values: list) -> (np.ndarray, dict):
+    """
+    Converts a column of scraped values to float64 the way float() converts each value.
+
+    :return: (array, errors) where errors maps the index of every value float() rejects to its exception,
+             those slots hold NaN
+    """
+    # numpy converts None to NaN instead of failing like float(None), so those columns take the slow path
+    if None not in values:
+        try:
+            return np.array(values, dtype=np.float64), {}
+        except (TypeError, ValueError):
+            pass
+
+    array = np.empty(len(values), dtype=np.float64)
+    errors = {}
+    for index, value in enumerate(values):
+        try:
+            array[index] = float(value)
+        except Exception as e:
+            array[index] = np.nan
+            errors[index] = e
+    return array, errors
+
+
+def in_item_order(values: dict, adapter) -> dict:
+    """
+    Orders recorded fields like the item, as per-item validation records them while walking its fields.
+    """
+    if len(values) < 2:
+        return values
+    return {key: values[key] for key in adapter if key in values}
+
+
+class BatchValidator:
+    """
+    Validates micro-batches of items with a ValidationLogger, one field (column) at a time.
+
+    - constraints map a field to (operator, bound), e.g. {"price": (">=", 0)} stands for the scalar rule
+      lambda x: (float(x) >= 0, x): values failing the comparison or float() are invalid.
+      These columns are converted and compared with NumPy in one go
+    - Other rules run value by value, but only over the fields that have a rule
+    - validate_batch() returns the same (item, {"flagged": ..., "invalid": ...}) pairs as calling
+      validate_item() with the scalar rules on every item
+
+    Default rules of the ValidationLogger would have to run on every field,
+    so with default rules the batch falls back to validate_item() per item.
+    """
+
+    def __init__(self, validation_logger, rules: dict[str, callable], constraints: dict[str, tuple]):
+        self.validation_logger = validation_logger
+        self.rules = rules
+        self.constraints = constraints
+        self.scalar_rules = {field: rule for field, rule in rules.items() if field not in constraints}
+
+        for operator, _ in constraints.values():
+            if operator not in OPERATORS:
+                raise KeyError(f"Invalid constraint operator: {operator}")
+
+    def validate_batch(self, items: list) -> list[tuple[dict, dict[str, dict]]]:
+        validation_logger = self.validation_logger
+        if validation_logger.default_rules:
+            return [validation_logger.validate_item(item, self.rules) for item in items]
+
+        adapters = [validation_logger.adapt_item(item) for item in items]
+        flagged = [{} for _ in adapters]
+        invalid = [{} for _ in adapters]
+
+        chains, _ = validation_logger.get_compiled_rules(self.scalar_rules)
+        for field, chain in chains.items():
+            for adapter, flagged_values, invalid_values in zip(adapters, flagged, invalid):
+                if field in adapter:
+                    validation_logger.apply_chain(adapter, field, adapter[field], chain, flagged_values,
+                                                  invalid_values)
+
+        for field, (operator, bound) in self.constraints.items():
+            indexes = [index for index, adapter in enumerate(adapters) if field in adapter]
+            if not indexes:
+                continue
+            values = [adapters[index][field] for index in indexes]
+            array, errors = to_float_array(values)
+            failed = ~OPERATORS[operator](array, bound)
+
+            for position in np.flatnonzero(failed).tolist():
+                value = values[position]
+                if position in errors:
+                    validation_logger.logger.error("Error validating item %s: %s, Exception: %s",
+                                                   field, value, errors[position])
+                else:
+                    validation_logger.log_event("FIELD_FAILURE", "Field {} has failed validation", field)
+                invalid[indexes[position]][field] = value
+
+        return [
+            (validation_logger.unadapt_item(adapter),
+             {"flagged": in_item_order(flagged_values, adapter), "invalid": in_item_order(invalid_values, adapter)})
+            for adapter, flagged_values, invalid_values in zip(adapters, flagged, invalid)
+        ]
@@ -3,15 +3,64 @@ import traceback
 from itemadapter import ItemAdapter
 import sqlite3
 import psycopg2
+import atexit
+import csv
+import datetime
+import io
 import json
 import os
+import threading
+import time
 import traceback
 import logging
+from collections import deque
+from contextlib import contextmanager
+from diamond_scraper.utils import log_utils
+from diamond_scraper.utils.parse_utils import SQL_TYPE_PARSERS
 
 logger = logging.getLogger(__name__)
 
-
-def generate_create_table(item, table_name=None, override_types=None):
+# NULL marker used in COPY payloads, empty strings stay empty strings
+COPY_NULL = "\\N"
+
+# log_db_action() actions fired once per stored row, logged at DEBUG so INFO logs stay quiet on the item path
+DB_ROW_ACTIONS = {"INSERT_ITEM"}
+
+# Lower-cased fragments of sqlite3.OperationalError messages worth retrying (see is_transient_error()):
+# locked/busy database, unopenable file, disk I/O error, full disk ("database or disk is full")
+SQLITE_TRANSIENT_MESSAGES = ("locked", "busy", "unable to open", "disk i/o", "disk is full")
+
+# PRAGMA sets applied to SQLite connections at connect time, selected with the DB_SQLITE_PROFILE setting
+SQLITE_PROFILES = {
+    # sqlite3 defaults: rollback journal, synchronous=FULL
+    "default": {},
+    # WAL keeps readers unblocked during writes, FULL still fsyncs every commit
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,  # Negative values are KiB
+        "temp_store": "MEMORY",
+    },
+    # WAL + NORMAL only fsyncs at checkpoints, a power loss can drop the last commits but never corrupts
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+    # No fsync at all, for throwaway or easily re-scraped data
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256000,
+        "mmap_size": 1073741824,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def generate_create_table(item, table_name=None, override_types=None, partition_column=None):
     """
     Accepts a Scrapy item or adapter and returns a SQL statement string:
     CREATE TABLE IF NOT EXISTS ...
@@ -19,6 +68,7 @@ def generate_create_table(item, table_name=None, override_types=None):
     - Detects data types for fields if possible
     - Uses item class name as table name if none provided
     - Infers field type from instance, can be overridden if needed
+    - Declares a PostgreSQL range-partitioned table if partition_column is given
     """
 
     adapter = ItemAdapter(item)
@@ -33,13 +83,7 @@ def generate_create_table(item, table_name=None, override_types=None):
 
     for field_name, value in adapter.items():
         # Attempt type inference
-        sql_type = "TEXT"
-        if isinstance(value, bool):
-            sql_type = "BOOLEAN"
-        elif isinstance(value, int):
-            sql_type = "INTEGER"
-        elif isinstance(value, float):
-            sql_type = "REAL"
+        sql_type = infer_sql_type(value)
 
         if field_name in override_types:
             sql_type = override_types[field_name]
@@ -47,12 +91,37 @@ def generate_create_table(item, table_name=None, override_types=None):
         command += f"{field_name} {sql_type},"
 
     # Remove trailing comma and close command
-    command = command[:-1] + ");"
-    return command
+    command = command[:-1] + ")"
+    if partition_column:
+        command += f" PARTITION BY RANGE ({partition_column})"
+    return command + ";"
 
     pass
 
 
+def infer_sql_type(value):
+    """
+    Returns the SQL column type matching a Python value, defaulting to TEXT.
+    """
+    if isinstance(value, bool):
+        return "BOOLEAN"
+    elif isinstance(value, int):
+        return "INTEGER"
+    elif isinstance(value, float):
+        return "REAL"
+    return "TEXT"
+
+
+def encode_value(value):
+    """
+    Converts a field value into something the DB driver can bind.
+    Dicts and lists are JSON-encoded, everything else is passed through.
+    """
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
 def generate_insert_sql(item, table_name=None, backend="sqlite"):
     """
     Returns (sql_string, values_tuple) for inserting the item into the specified table.
@@ -70,9 +139,7 @@ def generate_insert_sql(item, table_name=None, backend="sqlite"):
     for field_name, value in adapter.items():
         field_names.append(field_name)
         # JSON-encode if dict or list
-        if isinstance(value, (dict, list)):
-            value = json.dumps(value)
-        values.append(value)
+        values.append(encode_value(value))
 
     columns = ", ".join(field_names)
     # Choose placeholders
@@ -85,7 +152,7 @@ def generate_insert_sql(item, table_name=None, backend="sqlite"):
     return command, tuple(values)
 
 
-def initialize_table(cursor, item, table_name=None, override_types=None, spider=None):
+def initialize_table(cursor, item, table_name=None, override_types=None, spider=None, partition_column=None):
     """
     Ensures the table exists for this item by:
     1. Building the CREATE TABLE IF NOT EXISTS statement via generate_create_table()
@@ -96,8 +163,9 @@ def initialize_table(cursor, item, table_name=None, override_types=None, spider=
         item: The item or adapter representing the schema.
         table_name: The SQL table name to create if missing.
         override_types: Dict for manually overriding certain field types
+        partition_column: PostgreSQL only, creates the table as a parent partitioned by this column
     """
-    command = generate_create_table(item, table_name, override_types)
+    command = generate_create_table(item, table_name, override_types, partition_column)
     try:
         cursor.execute(command)
         log_db_action(spider, "CREATE_TABLE", table_name, item=item)
@@ -105,24 +173,388 @@ def initialize_table(cursor, item, table_name=None, override_types=None, spider=
         log_db_action(spider, "CREATE_TABLE_FAILED", table_name, item=item, error=e)
 
 
-def insert_item(cursor, item, table_name, spider=None, log=True, backend="sqlite"):
+class TableSchema:
+    """
+    Cached schema for one (item class, table, backend) combination.
+
+    Holds the item fields written so far and a precompiled INSERT template covering all of them,
+    so the hot write path only has to extract values. Fields missing from an item are bound as NULL.
+
+    If a natural key is given, the template becomes an upsert (INSERT ... ON CONFLICT) backed by a
+    unique index on the key columns, so duplicates are resolved by the database instead of the crawler.
+
+    Fields with a REAL/INTEGER column type are parsed (currency, magnitude suffixes, percentages) before
+    binding, values that can't be parsed are stored as NULL and counted in unparsed_values.
+    """
+
+    def __init__(self, table_name, backend, existing_columns, natural_key=None, conflict_action="ignore",
+                 column_types=None):
+        self.table_name = table_name
+        self.backend = backend
+        self.existing_columns = {column.lower() for column in existing_columns}
+        self.column_types = column_types or {}
+        self.fields = []
+        self.field_parsers = []  # Parser per entry of self.fields, None for untyped fields
+        self.field_set = set()
+        self.unparsed_values = 0
+        self.insert_sql = None
+        self.natural_key = tuple(natural_key or ())
+        self.conflict_action = conflict_action  # "ignore" -> DO NOTHING, "update" -> DO UPDATE
+
+    def ensure_fields(self, cursor, adapter, override_types=None, spider=None):
+        """
+        Adds any item fields not seen before to the template.
+        Columns missing from the table are added with ALTER TABLE once, instead of re-running DDL per item.
+        """
+        new_fields = [field_name for field_name in adapter.keys() if field_name not in self.field_set]
+        if not new_fields:
+            return
+
+        override_types = {**self.column_types, **(override_types or {})}
+        for field_name in new_fields:
+            if field_name.lower() not in self.existing_columns:
+                sql_type = override_types.get(field_name, infer_sql_type(adapter[field_name]))
+                self.add_column(cursor, field_name, sql_type, item=adapter.item, spider=spider)
+
+            self.fields.append(field_name)
+            self.field_parsers.append(SQL_TYPE_PARSERS.get(override_types.get(field_name)))
+            self.field_set.add(field_name)
+
+        self.insert_sql = self.build_insert_sql()
+
+    def add_column(self, cursor, field_name, sql_type, item=None, spider=None):
+        try:
+            cursor.execute(f"ALTER TABLE {self.table_name} ADD COLUMN {field_name} {sql_type};")
+            log_db_action(spider, "ADD_COLUMN", self.table_name, item=item)
+        except Exception as e:
+            log_db_action(spider, "ADD_COLUMN_FAILED", self.table_name, item=item, error=e)
+        self.existing_columns.add(field_name.lower())
+
+    def ensure_unique_index(self, cursor, item=None, spider=None):
+        """
+        Creates the unique index backing ON CONFLICT for the natural key.
+        If the index can't be created (e.g. the table already holds duplicates), upserts are disabled
+        and the schema falls back to plain inserts.
+        """
+        if not self.natural_key:
+            return
+
+        for field_name in self.natural_key:
+            if field_name.lower() not in self.existing_columns:
+                self.add_column(cursor, field_name, "TEXT", item=item, spider=spider)
+
+        index_name = f"ux_{self.table_name}_{'_'.join(self.natural_key)}".lower()
+        try:
+            cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} "
+                           f"ON {self.table_name} ({', '.join(self.natural_key)});")
+            log_db_action(spider, "CREATE_UNIQUE_INDEX", self.table_name, item=item)
+        except Exception as e:
+            log_db_action(spider, "CREATE_UNIQUE_INDEX_FAILED", self.table_name, item=item, error=e)
+            self.natural_key = ()
+
+        if self.fields:
+            self.insert_sql = self.build_insert_sql()
+
+    def ensure_indexes(self, cursor, indexes, item=None, spider=None):
+        """
+        Creates secondary indexes, given as lists of column names, e.g. [["tickerSymbol", "timestamp"]].
+        """
+        for index_columns in indexes or ():
+            for field_name in index_columns:
+                if field_name.lower() not in self.existing_columns:
+                    self.add_column(cursor, field_name, "TEXT", item=item, spider=spider)
+
+            index_name = f"ix_{self.table_name}_{'_'.join(index_columns)}".lower()
+            try:
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} "
+                               f"ON {self.table_name} ({', '.join(index_columns)});")
+                log_db_action(spider, "CREATE_INDEX", self.table_name, item=item)
+            except Exception as e:
+                log_db_action(spider, "CREATE_INDEX_FAILED", self.table_name, item=item, error=e)
+
+    def build_conflict_clause(self):
+        if not self.natural_key:
+            return ""
+
+        key_columns = ", ".join(self.natural_key)
+        updates = [f"{field_name} = excluded.{field_name}" for field_name in self.fields
+                   if field_name not in self.natural_key]
+        if self.conflict_action == "update" and updates:
+            return f" ON CONFLICT ({key_columns}) DO UPDATE SET {', '.join(updates)}"
+        return f" ON CONFLICT ({key_columns}) DO NOTHING"
+
+    def build_insert_sql(self):
+        placeholder = "%s" if self.backend == "postgres" else "?"
+        columns = ", ".join(self.fields)
+        placeholders = ", ".join([placeholder] * len(self.fields))
+        return f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders}){self.build_conflict_clause()};"
+
+    def values(self, item):
+        """
+        Returns the values tuple for the INSERT template, in template column order.
+        """
+        adapter = ItemAdapter(item)
+        values = []
+        for field_name, parser in zip(self.fields, self.field_parsers):
+            value = adapter.get(field_name)
+            if parser is not None and value is not None:
+                parsed = parser(value)
+                if parsed is None:
+                    self.unparsed_values += 1
+                value = parsed
+            values.append(encode_value(value))
+        return tuple(values)
+
+
+class SchemaRegistry:
+    """
+    Registry of TableSchema objects keyed by (item class, table, backend).
+
+    Each table is created once, on the first item of its class, and every later item reuses the
+    cached INSERT template.
+    """
+
+    def __init__(self):
+        self.schemas = {}
+
+    def get_schema(self, cursor, item, table_name=None, backend="sqlite", override_types=None, spider=None,
+                   create=True, natural_key=None, conflict_action="ignore", indexes=None, partition_column=None):
+        """
+        Returns the TableSchema for this item, creating the table (if create is set) on first use.
+        Passing a natural_key (see get_natural_key) turns the INSERT template into an upsert.
+        override_types (see get_column_types) sets column types and parses values into them.
+        indexes are created along with the table, partition_column creates a PostgreSQL partitioned parent.
+        """
+        if not table_name:
+            table_name = item.__class__.__name__.lower()
+
+        key = (item.__class__, table_name, backend)
+        schema = self.schemas.get(key)
+        if schema is None:
+            if create:
+                initialize_table(cursor, item, table_name, override_types, spider=spider,
+                                 partition_column=partition_column)
+            schema = TableSchema(table_name, backend, get_table_columns(cursor, table_name, backend),
+                                 natural_key=natural_key, conflict_action=conflict_action,
+                                 column_types=override_types)
+            schema.ensure_unique_index(cursor, item=item, spider=spider)
+            schema.ensure_indexes(cursor, indexes, item=item, spider=spider)
+            self.schemas[key] = schema
+
+        schema.ensure_fields(cursor, ItemAdapter(item), override_types, spider=spider)
+        return schema
+
+    def clear(self):
+        self.schemas.clear()
+
+
+def get_column_types(item, overrides=None):
+    """
+    Returns {field: SQL type} as declared with Field(sql_type=...) on the item class,
+    with per class name overrides (e.g. the DB_COLUMN_TYPES setting) applied on top.
+    """
+    fields = getattr(item.__class__, "fields", {})
+    column_types = {field_name: meta["sql_type"] for field_name, meta in fields.items() if "sql_type" in meta}
+    column_types.update((overrides or {}).get(item.__class__.__name__, {}))
+    return column_types
+
+
+def get_partition(table_name, when, interval="daily"):
+    """
+    Routes a point in time to its partition.
+
+    - when: datetime/date or ISO-8601 string (only the date part is used)
+    - interval: "daily" (stockitem_2025_01_02) or "monthly" (stockitem_2025_01)
+
+    Returns (partition_table, range_start, range_end), range bounds as ISO dates with range_end exclusive.
+    """
+    if isinstance(when, str):
+        when = datetime.date.fromisoformat(when[:10])
+    elif isinstance(when, datetime.datetime):
+        when = when.date()
+
+    if interval == "daily":
+        start = when
+        end = start + datetime.timedelta(days=1)
+        suffix = start.strftime("%Y_%m_%d")
+    elif interval == "monthly":
+        start = when.replace(day=1)
+        end = (start + datetime.timedelta(days=32)).replace(day=1)
+        suffix = start.strftime("%Y_%m")
+    else:
+        raise ValueError(f"Unknown partition interval: {interval}")
+
+    return f"{table_name}_{suffix}", start.isoformat(), end.isoformat()
+
+
+def create_partition(cursor, parent_table, partition_table, range_start, range_end, spider=None):
+    """
+    PostgreSQL only: attaches a partition covering [range_start, range_end) to a partitioned parent table.
+    Indexes declared on the parent are created on the partition automatically.
+    Bounds are UTC midnights, like the dates get_partition() takes from the stamped UTC times.
+    """
+    try:
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {partition_table} PARTITION OF {parent_table} "
+                       f"FOR VALUES FROM ('{range_start}T00:00:00+00:00') TO ('{range_end}T00:00:00+00:00');")
+        log_db_action(spider, "CREATE_PARTITION", partition_table)
+    except Exception as e:
+        log_db_action(spider, "CREATE_PARTITION_FAILED", partition_table, error=e)
+
+
+def get_natural_key(item, overrides=None):
+    """
+    Returns the natural key fields of an item class, as declared by its `natural_key` attribute
+    or overridden per class name (e.g. the DB_NATURAL_KEYS setting). Returns None if there is no key.
+    """
+    overrides = overrides or {}
+    key = overrides.get(item.__class__.__name__, getattr(item.__class__, "natural_key", None))
+    return tuple(key) if key else None
+
+
+def insert_item(cursor, item, table_name, spider=None, log=True, backend="sqlite", schema=None, raise_errors=False):
     """
     Execution wrapper that:
-    - Calls generate_insert_sql() to build insert SQL + values
+    - Uses the cached template of the given TableSchema, or calls generate_insert_sql() to build insert SQL + values
     - Executes insert using cursor
     - Optionally logs the result via log_db_action()
+    - Re-raises transient errors (see is_transient_error()) if raise_errors is set, so the caller can spool the item
     """
-    sql, vals = generate_insert_sql(item, table_name, backend=backend)
+    if schema is not None:
+        sql, vals = schema.insert_sql, schema.values(item)
+    else:
+        sql, vals = generate_insert_sql(item, table_name, backend=backend)
     try:
         cursor.execute(sql, vals)
         if log:
             log_db_action(spider, "INSERT_ITEM", table_name, item=item)
+        return True
     except Exception as e:
         if log:
             log_db_action(spider, "INSERT_FAILED", table_name, item=item, error=e)
+        if raise_errors and is_transient_error(e):
+            raise
+        return False
+
+
+def insert_items(cursor, items, table_name, spider=None, log=True, backend="sqlite", schema=None,
+                 raise_errors=False):
+    """
+    Batch execution wrapper that:
+    - Uses the cached template of the given TableSchema for every item, or calls generate_insert_sql()
+      for every item and groups rows sharing the same statement
+    - Executes each group with a single cursor.executemany() call, all-or-nothing (see group_transaction())
+    - Falls back to row-by-row inserts via insert_item() if a group fails, so only the bad rows are lost
+    - Optionally logs the result via log_db_action()
+    - Re-raises transient errors if raise_errors is set, like insert_item()
+
+    Returns the number of rows written.
+    """
+    grouped_items = {}
+    if schema is not None:
+        grouped_items[schema.insert_sql] = ([schema.values(item) for item in items], items)
+    else:
+        for item in items:
+            sql, vals = generate_insert_sql(item, table_name, backend=backend)
+            rows, group = grouped_items.setdefault(sql, ([], []))
+            rows.append(vals)
+            group.append(item)
+
+    inserted = 0
+    for sql, (rows, group) in grouped_items.items():
+        try:
+            with group_transaction(cursor):
+                cursor.executemany(sql, rows)
+            inserted += len(rows)
+            if log:
+                log_db_action(spider, "INSERT_BATCH", table_name, item=items[0], rows=len(rows))
+            continue
+        except Exception as e:
+            if log:
+                log_db_action(spider, "INSERT_BATCH_FAILED", table_name, item=items[0], error=e, rows=len(rows))
+            if raise_errors and is_transient_error(e):
+                raise
+
+        # The group was rolled back, retry the rows individually to keep the good ones
+        for item in group:
+            if insert_item(cursor, item, table_name, spider=spider, log=log, backend=backend, schema=schema,
+                           raise_errors=raise_errors):
+                inserted += 1
+    return inserted
+
+
+@contextmanager
+def group_transaction(cursor):
+    """
+    Makes the statements of the block all-or-nothing without ending the surrounding batch:
+    a SAVEPOINT inside the open transaction (SQLite batches, see batch_transaction()),
+    or a transaction of its own on autocommit PostgreSQL connections, where every statement commits by itself.
+    """
+    connection = cursor.connection
+    if not isinstance(connection, sqlite3.Connection) and getattr(connection, "autocommit", False):
+        statements = ("BEGIN", "COMMIT", ("ROLLBACK",))
+    else:
+        statements = ("SAVEPOINT insert_group", "RELEASE SAVEPOINT insert_group",
+                      ("ROLLBACK TO SAVEPOINT insert_group", "RELEASE SAVEPOINT insert_group"))
+    begin, commit, rollback = statements
+    cursor.execute(begin)
+    try:
+        yield
+    except Exception:
+        for statement in rollback:
+            cursor.execute(statement)
+        raise
+    cursor.execute(commit)
 
 
-def log_db_action(spider, action, table, item=None, error=None):
+def copy_items(cursor, items, table_name, schema, spider=None, log=True, raise_errors=False):
+    """
+    PostgreSQL bulk loader that:
+    - Builds a CSV payload from the TableSchema template (dict/list fields JSON-encoded like generate_insert_sql())
+    - Streams it into the table with a single COPY ... FROM STDIN
+      (through a temporary staging table and INSERT ... ON CONFLICT if the schema has a natural key)
+    - Falls back to row-by-row inserts via insert_item() if COPY fails for the batch
+      (transient errors are re-raised if raise_errors is set, like insert_item())
+
+    Returns the number of rows written.
+    """
+    payload = io.StringIO()
+    writer = csv.writer(payload)
+    for item in items:
+        writer.writerow([COPY_NULL if value is None else value for value in schema.values(item)])
+    payload.seek(0)
+
+    columns = ", ".join(schema.fields)
+    try:
+        if schema.natural_key:
+            # COPY can't resolve conflicts, so load a staging table and upsert from it
+            staging_table = f"{table_name}_staging"
+            cursor.execute(f"DROP TABLE IF EXISTS {staging_table};")
+            cursor.execute(f"CREATE TEMP TABLE {staging_table} (LIKE {table_name} INCLUDING DEFAULTS);")
+            cursor.copy_expert(f"COPY {staging_table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+                               payload)
+            cursor.execute(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {staging_table}"
+                           f"{schema.build_conflict_clause()};")
+        else:
+            cursor.copy_expert(f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+                               payload)
+        if log:
+            log_db_action(spider, "COPY_BATCH", table_name, item=items[0], rows=len(items))
+        return len(items)
+    except Exception as e:
+        if log:
+            log_db_action(spider, "COPY_BATCH_FAILED", table_name, item=items[0], error=e, rows=len(items))
+
+    # COPY is all-or-nothing, so retry the rows individually to keep the good ones
+    cursor.connection.rollback()
+    inserted = 0
+    for item in items:
+        if insert_item(cursor, item, table_name, spider=spider, log=log, backend="postgres", schema=schema,
+                       raise_errors=raise_errors):
+            inserted += 1
+    return inserted
+
+
+def log_db_action(spider, action, table, item=None, error=None, rows=None):
     """
     Logs a structured DB event for debugging/monitoring.
 
@@ -130,20 +562,31 @@ def log_db_action(spider, action, table, item=None, error=None):
     - action: INSERT, INSERT_FAILED, CREATE_TABLE etc
     - table: the target table name
     - item: optional Scrapy item (for type or summary)
+    - rows: optional row count for batch actions
+
+    Per-row actions (DB_ROW_ACTIONS) are logged at DEBUG, other successes at INFO and failures at ERROR.
+    Records go through the spider's EventLogger as event "db_<action>", so they are rate limited/sampled by
+    LOG_EVENT_RATE_LIMITS / LOG_EVENT_SAMPLE_RATES and cost nothing when their level is disabled.
     """
-    msg = f"[DB:{action}] table={table}"
+    fields = {"table": table}
     if item:
-        msg += f" item={item.__class__.__name__}"
+        fields["item"] = item.__class__.__name__
+    if rows is not None:
+        fields["rows"] = rows
+
     if spider and hasattr(spider, 'logger'):
-        if not error:
-            spider.logger.info(msg)
+        event_logger = log_utils.get_event_logger(spider)
+        if error:
+            event_logger.error(f"db_{action.lower()}", "DB action %s failed, Exception: %s", action, error, **fields)
+        elif action in DB_ROW_ACTIONS:
+            event_logger.debug(f"db_{action.lower()}", "DB action %s", action, **fields)
         else:
-            spider.logger.error(f"{msg}\nException: {error})")
+            event_logger.info(f"db_{action.lower()}", "DB action %s", action, **fields)
     else:
         if not error:
-            print(msg)
+            logger.debug("[DB:%s]%s", action, log_utils.EventFields(fields))
         else:
-            print(f"{msg}\nException: {error}")
+            logger.error("[DB:%s]%s\nException: %s", action, log_utils.EventFields(fields), error)
 
 
 def clear_table(cursor, table_name, spider=None):
@@ -174,7 +617,58 @@ def get_existing_tables(cursor):
     return [row[0] for row in cursor.fetchall()]
 
 
-def get_db_connection(db_path=None):
+def get_table_columns(cursor, table_name, backend="sqlite"):
+    """
+    Returns the column names of a table, or an empty list if the table does not exist.
+    PostgreSQL folds unquoted identifiers, so names may come back lowercased.
+    """
+    if backend == "postgres":
+        cursor.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = %s ORDER BY ordinal_position",
+            (table_name.lower(),)
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    cursor.execute(f"PRAGMA table_info({table_name})")
+    return [row[1] for row in cursor.fetchall()]
+
+
+def resolve_sqlite_pragmas(profile="default", overrides=None):
+    """
+    Returns the PRAGMA dict for a named SQLite profile with any per-pragma overrides applied on top.
+    """
+    if profile not in SQLITE_PROFILES:
+        raise KeyError(f"Unknown SQLite profile: {profile}")
+    return {**SQLITE_PROFILES[profile], **(overrides or {})}
+
+
+def apply_sqlite_pragmas(connection, pragmas):
+    """
+    Executes each PRAGMA on an SQLite connection, e.g. {"journal_mode": "WAL"} -> PRAGMA journal_mode=WAL
+    """
+    for name, value in pragmas.items():
+        connection.execute(f"PRAGMA {name}={value}")
+
+
+@contextmanager
+def batch_transaction(connection):
+    """
+    Wraps one batch of writes in a transaction that is committed on success and rolled back on error.
+
+    SQLite gets an explicit BEGIN so the batch boundary is the transaction boundary even if the connection
+    runs in autocommit mode. PostgreSQL connections keep their autocommit behaviour and are only committed.
+    """
+    if isinstance(connection, sqlite3.Connection) and not connection.in_transaction:
+        connection.execute("BEGIN")
+    try:
+        yield
+    except Exception:
+        connection.rollback()
+        raise
+    connection.commit()
+
+
+def get_db_connection(db_path=None, check_same_thread=True, sqlite_pragmas=None):
     """
     Open a database connection based on the DB_BACKEND environment variable.
 
@@ -192,6 +686,10 @@ def get_db_connection(db_path=None):
         DB_USER (str): Username
         DB_PASSWORD (str): Password
 
+    SQLite connections can be shared across threads by passing check_same_thread=False,
+    the caller is then responsible for serializing access (e.g. through ConnectionPool).
+    sqlite_pragmas (see SQLITE_PROFILES / resolve_sqlite_pragmas) are applied right after connecting.
+
     Returns:
         A connection object for the selected database backend.
     """
@@ -219,17 +717,203 @@ def get_db_connection(db_path=None):
     elif db_backend == "sqlite":
         print("Using SQLite database")
         if db_path:
-            connection = sqlite3.connect(db_path)
+            connection = sqlite3.connect(db_path, check_same_thread=check_same_thread)
         else:
-            connection = sqlite3.connect("DWS_scraper.db")
+            connection = sqlite3.connect("DWS_scraper.db", check_same_thread=check_same_thread)
+        apply_sqlite_pragmas(connection, sqlite_pragmas or {})
         return connection
     else:
         logger.warning(f"Unknown DB_BACKEND='{db_backend}', defaulting to SQLite file='DWS_scraper.db'")
         try:
-            connection = sqlite3.connect("DWS_scraper.db")
+            connection = sqlite3.connect("DWS_scraper.db", check_same_thread=check_same_thread)
+            apply_sqlite_pragmas(connection, sqlite_pragmas or {})
             return connection
         except Exception as e:
             logger.error("Unable to connect to SQLite database")
             traceback.print_exc()
 
 
+def is_connection_alive(connection):
+    """
+    Runs a trivial query to check that a connection is still usable.
+    """
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+        cursor.close()
+        return True
+    except Exception:
+        return False
+
+
+def is_transient_error(error):
+    """
+    True for errors caused by the database being unavailable (lost connection, locked or full database)
+    rather than by the data, i.e. errors worth retrying the same rows for later.
+
+    - SQLite raises OperationalError for schema and syntax errors too ("no such column"), only the messages in
+      SQLITE_TRANSIENT_MESSAGES count
+    - psycopg2 OperationalError / InterfaceError are connection-class errors (server gone, connection closed)
+    """
+    if isinstance(error, sqlite3.OperationalError):
+        message = str(error).lower()
+        return any(fragment in message for fragment in SQLITE_TRANSIENT_MESSAGES)
+    return isinstance(error, (psycopg2.OperationalError, psycopg2.InterfaceError))
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of database connections shared by every pipeline in the process.
+
+    - Opens connections lazily through get_db_connection(), never more than max_size at once
+    - Health-checks connections that sat idle longer than health_check_interval and reconnects broken ones
+    - Tracks wait time and utilisation so pipelines can expose them in crawler stats
+    """
+
+    def __init__(self, db_path=None, max_size=4, timeout=30.0, health_check_interval=30.0, sqlite_pragmas=None):
+        self.db_path = db_path
+        self.sqlite_pragmas = sqlite_pragmas
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self.condition = threading.Condition()
+        self.idle = deque()  # (connection, released_at) pairs
+        self.size = 0  # Connections currently open, idle or borrowed
+        self.in_use = 0
+        self.closed = False
+
+        # Usage statistics
+        self.peak_in_use = 0
+        self.acquisitions = 0
+        self.reconnects = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def acquire(self):
+        """
+        Borrows a connection, waiting up to timeout seconds if the pool is exhausted.
+        Raises TimeoutError if no connection frees up in time.
+        Blocks the calling thread, so pipelines call it from a worker thread, never the reactor thread.
+        """
+        start = time.monotonic()
+        with self.condition:
+            while not self.idle and self.size >= self.max_size:
+                remaining = self.timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    raise TimeoutError(f"No database connection available after {self.timeout}s "
+                                       f"(pool size {self.max_size})")
+                self.condition.wait(remaining)
+
+            connection, released_at = self.idle.popleft() if self.idle else (None, None)
+            if connection is None:
+                self.size += 1  # Reserve the slot before connecting outside the lock
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+        try:
+            if connection is None:
+                connection = self._connect()
+            elif time.monotonic() - released_at >= self.health_check_interval \
+                    and not is_connection_alive(connection):
+                logger.warning("Pooled database connection failed health check, reconnecting")
+                self._close_quietly(connection)
+                connection = self._connect()
+                self.reconnects += 1
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.in_use -= 1
+                self.condition.notify()
+            raise
+
+        wait_time = time.monotonic() - start
+        with self.condition:
+            self.acquisitions += 1
+            self.wait_time_total += wait_time
+            self.wait_time_max = max(self.wait_time_max, wait_time)
+        return connection
+
+    def release(self, connection, discard=False):
+        """
+        Returns a borrowed connection. Broken connections should be released with discard=True,
+        which closes them and frees the slot for a fresh connection.
+        """
+        if not discard:
+            try:
+                # Never hand out a connection with an open or failed transaction
+                connection.rollback()
+            except Exception:
+                discard = True
+
+        with self.condition:
+            self.in_use -= 1
+            if discard or self.closed:
+                self.size -= 1
+                self._close_quietly(connection)
+            else:
+                self.idle.append((connection, time.monotonic()))
+            self.condition.notify()
+
+    def record_reconnect(self):
+        """
+        Counts a broken connection a pipeline replaced, pipelines call it from their own threads.
+        """
+        with self.condition:
+            self.reconnects += 1
+
+    def utilisation(self):
+        return self.in_use / self.max_size if self.max_size else 0.0
+
+    def close(self):
+        """
+        Closes idle connections, borrowed ones are closed when they are released.
+        """
+        with self.condition:
+            self.closed = True
+            while self.idle:
+                connection, _ = self.idle.popleft()
+                self.size -= 1
+                self._close_quietly(connection)
+
+    def _connect(self):
+        # The pool serializes access, so SQLite connections may move between threads
+        return get_db_connection(db_path=self.db_path, check_same_thread=False, sqlite_pragmas=self.sqlite_pragmas)
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+_connection_pools = {}
+_connection_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path=None, max_size=4, timeout=30.0, health_check_interval=30.0, sqlite_pragmas=None):
+    """
+    Returns the process-wide ConnectionPool for the current DB_BACKEND and db_path, creating it on first use.
+    Later callers share the existing pool and its size limit.
+    """
+    key = (os.getenv("DB_BACKEND", "sqlite"), db_path)
+    with _connection_pools_lock:
+        pool = _connection_pools.get(key)
+        if pool is None or pool.closed:
+            pool = ConnectionPool(db_path, max_size=max_size, timeout=timeout,
+                                  health_check_interval=health_check_interval, sqlite_pragmas=sqlite_pragmas)
+            _connection_pools[key] = pool
+        return pool
+
+
+@atexit.register
+def close_connection_pools():
+    """
+    Closes every process-wide pool, runs automatically at interpreter exit.
+    """
+    with _connection_pools_lock:
+        for pool in _connection_pools.values():
+            pool.close()
+        _connection_pools.clear()
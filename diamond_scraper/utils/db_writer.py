@@ -0,0 +1,73 @@
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Queue sentinel telling the writer thread to flush and exit
+_STOP = object()
+
+
+class DatabaseWriter(threading.Thread):
+    """
+    Background thread that drains a bounded queue of items and hands them to the database pipeline,
+    so cursor.execute and commit never run on the reactor thread.
+
+    The thread only calls back into the pipeline:
+    - store_item(item) for every dequeued item (buffering/flushing stays in the pipeline)
+    - flush_expired() whenever the queue has been idle for flush_interval seconds
+    - flush_all() once before exiting
+    - on_dequeue() after taking an item off a full queue, so blocked producers can be released
+    """
+
+    def __init__(self, store_item, flush_expired, flush_all, flush_interval=5.0, queue_size=1000, on_dequeue=None):
+        super().__init__(name="DatabaseWriter", daemon=True)
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.store_item = store_item
+        self.flush_expired = flush_expired
+        self.flush_all = flush_all
+        self.flush_interval = flush_interval if flush_interval > 0 else None
+        self.on_dequeue = on_dequeue
+
+    def submit(self, item):
+        """
+        Queues an item without blocking. Returns False if the queue is full.
+        """
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+
+    def stop(self):
+        """
+        Waits for every queued item to be written, flushes pending batches and ends the thread.
+        Blocks, so it should be run off the reactor thread (e.g. with deferToThread).
+        """
+        self.queue.put(_STOP)
+        self.join()
+
+    def run(self):
+        while True:
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._call(self.flush_expired)
+                continue
+
+            if item is _STOP:
+                self._call(self.flush_all)
+                return
+
+            if self.on_dequeue is not None:
+                self.on_dequeue()
+            self._call(self.store_item, item)
+            self._call(self.flush_expired)
+
+    @staticmethod
+    def _call(function, *args):
+        # A failing write must not kill the thread, later items still need to be drained
+        try:
+            function(*args)
+        except Exception:
+            logger.exception("Database writer thread failed to process a batch")
@@ -0,0 +1,264 @@
+import abc
+import hashlib
+import json
+import math
+import os
+import struct
+import time
+from collections import OrderedDict
+
+# Magic bytes and header of a serialized BloomDedupStore: magic, then the byte length of its JSON metadata
+BLOOM_MAGIC = b"DWSBLOOM"
+BLOOM_HEADER = struct.Struct(">8sI")
+
+
+class DedupStore(abc.ABC):
+    """
+    Interface of the stores DuplicatesPipeline uses to remember which item keys it has seen.
+    Implementations are selected with DEDUP_STORE_CLASS and built with from_settings(), a class missing
+    seen/load/save fails right there instead of on the first item.
+
+    - seen(key) checks a key and records it in one step, returning True if it was already seen
+    - load(path)/save(path) persist the state, so paused and resumed (JOBDIR) runs keep it
+    - stats() returns the numbers reported under custom/dedup_* in crawler stats
+    """
+
+    # File name of the persisted state inside JOBDIR
+    state_file = "dedup_state.json"
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls()
+
+    @abc.abstractmethod
+    def seen(self, key):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def load(self, path):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def save(self, path):
+        raise NotImplementedError
+
+    def stats(self):
+        return {}
+
+
+class MemoryDedupStore(DedupStore):
+    """
+    Exact dedup store with a bounded memory footprint.
+
+    - Keeps at most max_entries keys, evicting the least recently seen one first (LRU)
+    - Forgets keys ttl seconds after they were first seen (0 disables expiry), so polling crawls
+      accept the same key again once it is stale
+    - Persists as JSON, expiry uses wall-clock time so it carries over between runs
+    """
+
+    def __init__(self, max_entries=100000, ttl=0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> wall-clock time it was first seen, least recently seen first
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(max_entries=settings.getint('DEDUP_MAX_ENTRIES', 100000),
+                   ttl=settings.getfloat('DEDUP_TTL', 0))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def seen(self, key):
+        now = time.time()
+        first_seen = self.entries.get(key)
+        if first_seen is not None:
+            if not self.is_expired(first_seen, now):
+                self.entries.move_to_end(key)
+                return True
+            del self.entries[key]
+            self.expirations += 1
+
+        self.entries[key] = now
+        self.evict(now)
+        return False
+
+    def is_expired(self, first_seen, now):
+        return 0 < self.ttl <= now - first_seen
+
+    def evict(self, now):
+        """
+        Drops expired keys from the cold end of the LRU order, then the least recently seen keys over max_entries.
+        """
+        while self.entries:
+            key, first_seen = next(iter(self.entries.items()))
+            if not self.is_expired(first_seen, now):
+                break
+            del self.entries[key]
+            self.expirations += 1
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def load(self, path):
+        with open(path, "r", encoding="utf-8") as state_file:
+            state = json.load(state_file)
+        now = time.time()
+        for key, first_seen in state["entries"]:
+            if not self.is_expired(first_seen, now):
+                self.entries[tuple(key)] = first_seen
+        self.evict(now)
+
+    def save(self, path):
+        # Written next to the old state and swapped in, so an interrupted save keeps the previous state
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as state_file:
+            json.dump({"entries": [[list(key), first_seen] for key, first_seen in self.entries.items()]}, state_file)
+        os.replace(temp_path, path)
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over a bytearray, sized for capacity keys at error_rate false positives.
+    Positions come from one blake2b digest split into two 64-bit hashes (double hashing).
+    """
+
+    def __init__(self, capacity, error_rate, count=0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = count
+
+    def positions(self, hash1, hash2):
+        return [(hash1 + i * hash2) % self.num_bits for i in range(self.num_hashes)]
+
+    def contains(self, positions):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in positions)
+
+    def add(self, positions):
+        bits = self.bits
+        for position in positions:
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def fill_ratio(self):
+        set_bits = bin(int.from_bytes(self.bits, "big")).count("1")
+        return set_bits / self.num_bits
+
+    def estimated_error_rate(self):
+        return self.fill_ratio() ** self.num_hashes
+
+
+class BloomDedupStore(DedupStore):
+    """
+    Probabilistic dedup store for crawls too large for an exact set.
+
+    - Scalable Bloom filter: once a filter holds its capacity, a new one is added with growth times
+      the capacity and a tightened error rate, keeping the overall false positive rate below error_rate
+    - A false positive drops a new item as a duplicate, keys are never forgotten (no TTL/LRU)
+    - Persists as a small binary file: header, JSON metadata, then the raw bit arrays
+    """
+
+    state_file = "dedup_bloom.bin"
+
+    # Filter n gets error_rate * (1 - TIGHTENING) * TIGHTENING ** n, these sum up to at most error_rate
+    TIGHTENING = 0.5
+
+    def __init__(self, capacity=1000000, error_rate=0.001, growth=2):
+        self.initial_capacity = capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.filters = []
+        self.add_filter()
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(capacity=settings.getint('DEDUP_BLOOM_CAPACITY', 1000000),
+                   error_rate=settings.getfloat('DEDUP_BLOOM_ERROR_RATE', 0.001))
+
+    def __len__(self):
+        return sum(bloom.count for bloom in self.filters)
+
+    def add_filter(self):
+        n = len(self.filters)
+        self.filters.append(BloomFilter(self.initial_capacity * self.growth ** n,
+                                        self.error_rate * (1 - self.TIGHTENING) * self.TIGHTENING ** n))
+
+    def seen(self, key):
+        digest = hashlib.blake2b("\x1f".join(key).encode("utf-8"), digest_size=16).digest()
+        hash1 = int.from_bytes(digest[:8], "big")
+        hash2 = int.from_bytes(digest[8:], "big") | 1
+
+        positions = None
+        for bloom in self.filters:
+            positions = bloom.positions(hash1, hash2)
+            if bloom.contains(positions):
+                return True
+
+        current = self.filters[-1]
+        if current.count >= current.capacity:
+            self.add_filter()
+            current = self.filters[-1]
+            positions = current.positions(hash1, hash2)
+        current.add(positions)
+        return False
+
+    def load(self, path):
+        with open(path, "rb") as state_file:
+            magic, meta_length = BLOOM_HEADER.unpack(state_file.read(BLOOM_HEADER.size))
+            if magic != BLOOM_MAGIC:
+                raise ValueError(f"{path} is not a Bloom dedup state file")
+            meta = json.loads(state_file.read(meta_length))
+
+            self.initial_capacity = meta["capacity"]
+            self.error_rate = meta["error_rate"]
+            self.growth = meta["growth"]
+            self.filters = []
+            for filter_meta in meta["filters"]:
+                bloom = BloomFilter(filter_meta["capacity"], filter_meta["error_rate"], count=filter_meta["count"])
+                bloom.bits = bytearray(state_file.read(len(bloom.bits)))
+                self.filters.append(bloom)
+
+    def save(self, path):
+        meta = json.dumps({
+            "capacity": self.initial_capacity,
+            "error_rate": self.error_rate,
+            "growth": self.growth,
+            "filters": [{"capacity": bloom.capacity, "error_rate": bloom.error_rate, "count": bloom.count}
+                        for bloom in self.filters],
+        }).encode("utf-8")
+
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as state_file:
+            state_file.write(BLOOM_HEADER.pack(BLOOM_MAGIC, len(meta)))
+            state_file.write(meta)
+            for bloom in self.filters:
+                state_file.write(bloom.bits)
+        os.replace(temp_path, path)
+
+    def stats(self):
+        # Chance that a new key hits any filter, given how full each one currently is
+        miss_all = 1.0
+        for bloom in self.filters:
+            miss_all *= 1 - bloom.estimated_error_rate()
+        current = self.filters[-1]
+        return {
+            "entries": len(self),
+            "bloom_filters": len(self.filters),
+            "bloom_bytes": sum(len(bloom.bits) for bloom in self.filters),
+            "bloom_fill": round(current.fill_ratio(), 4),
+            "bloom_estimated_fp_rate": 1 - miss_all,
+        }
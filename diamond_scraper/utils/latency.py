@@ -0,0 +1,129 @@
+import functools
+import time
+import weakref
+from bisect import bisect_left
+
+from twisted.internet.defer import Deferred
+
+# Histogram bucket bounds in seconds: 1µs to ~134s, 8 buckets per doubling (each bucket within ~9% of a value)
+BUCKETS_PER_DOUBLING = 8
+BUCKET_BOUNDS = [1e-6 * 2 ** (i / BUCKETS_PER_DOUBLING) for i in range(27 * BUCKETS_PER_DOUBLING + 1)]
+
+# Percentiles reported per component
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """
+    Fixed-size log-bucketed histogram of durations in seconds.
+
+    - record() is a bisect and a few additions, memory stays constant however many values are recorded
+    - percentile() returns the upper bound of the bucket holding the percentile, capped at the largest value seen
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent):
+        if not self.count:
+            return 0.0
+        rank = percent / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                bound = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+
+class LatencyRecorder:
+    """
+    Latency histograms per component name, e.g. "pipeline/DuplicatesPipeline.process_item".
+    """
+
+    def __init__(self):
+        self.histograms = {}
+
+    def record(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def summary(self):
+        """
+        Returns {name: {"count", "total_s", "max_ms", "p50_ms", ...}}, slowest components (by total time) first.
+        """
+        summary = {}
+        for name, histogram in sorted(self.histograms.items(), key=lambda entry: -entry[1].total):
+            stats = {"count": histogram.count, "total_s": round(histogram.total, 6),
+                     "max_ms": round(histogram.max * 1000, 3)}
+            for percent in PERCENTILES:
+                stats[f"p{percent}_ms"] = round(histogram.percentile(percent) * 1000, 3)
+            summary[name] = stats
+        return summary
+
+
+_recorders = weakref.WeakKeyDictionary()
+
+
+def register_recorder(crawler, recorder):
+    _recorders[crawler] = recorder
+
+
+def get_recorder(spider):
+    """
+    Returns the LatencyRecorder of the spider's crawler, or None when latency stats are disabled.
+    """
+    crawler = getattr(spider, "crawler", None)
+    return _recorders.get(crawler) if crawler is not None else None
+
+
+def timed(category):
+    """
+    Decorates a pipeline/middleware method taking the spider as its last positional argument, recording its
+    duration under "<category>/<Class>.<method>" while latency stats are enabled.
+
+    Methods returning a Deferred (backpressure, micro-batches) are timed until the Deferred fires.
+    With latency stats disabled the only overhead is one dict lookup per call.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            recorder = get_recorder(args[-1] if args else kwargs.get("spider"))
+            if recorder is None:
+                return method(self, *args, **kwargs)
+
+            name = f"{category}/{type(self).__name__}.{method.__name__}"
+            start = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+            except BaseException:
+                recorder.record(name, time.perf_counter() - start)
+                raise
+            if isinstance(result, Deferred):
+                def record(outcome):
+                    recorder.record(name, time.perf_counter() - start)
+                    return outcome
+
+                return result.addBoth(record)
+            recorder.record(name, time.perf_counter() - start)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,108 @@
+import logging
+import time
+import weakref
+
+
+class EventFields:
+    """
+    key=value rendering of a structured log event's fields, done in __str__ so it only happens
+    once a handler actually formats the record.
+    """
+
+    __slots__ = ("fields", "suppressed")
+
+    def __init__(self, fields, suppressed=0):
+        self.fields = fields
+        self.suppressed = suppressed
+
+    def __str__(self):
+        text = "".join(f" {key}={value!r}" for key, value in self.fields.items())
+        if self.suppressed:
+            text += f" (+{self.suppressed} suppressed)"
+        return text
+
+
+class EventLogger:
+    """
+    Structured logging for the item path: every record is an event name, a %-style message and key=value fields.
+
+    - The level is checked before anything else, a disabled event costs one isEnabledFor() call
+    - Message args and fields are never formatted here, logging does it when (and if) a handler emits the record
+    - rate_limits caps events to N records per second per event name, sample_rates logs 1 in N of an event,
+      the number of records skipped in between is appended to the next one that gets through
+
+    Events without a limit or sample rate are always logged.
+    """
+
+    def __init__(self, logger, rate_limits=None, sample_rates=None):
+        self.logger = logger
+        self.rate_limits = rate_limits or {}
+        self.sample_rates = sample_rates or {}
+        self.windows = {}  # event -> [window start, records logged in window]
+        self.counters = {}  # event -> occurrences, for sampling
+        self.suppressed = {}  # event -> records skipped since the last one logged
+
+    @classmethod
+    def from_settings(cls, logger, settings):
+        return cls(logger,
+                   rate_limits=settings.getdict('LOG_EVENT_RATE_LIMITS'),
+                   sample_rates=settings.getdict('LOG_EVENT_SAMPLE_RATES'))
+
+    def log(self, level, event, msg, *args, **fields):
+        if not self.logger.isEnabledFor(level):
+            return
+        if not self.allow(event):
+            self.suppressed[event] = self.suppressed.get(event, 0) + 1
+            return
+        suppressed = self.suppressed.pop(event, 0)
+        self.logger.log(level, "[%s] " + msg + "%s", event, *args, EventFields(fields, suppressed))
+
+    def allow(self, event):
+        sample_rate = self.sample_rates.get(event)
+        if sample_rate:
+            count = self.counters.get(event, 0)
+            self.counters[event] = count + 1
+            if count % sample_rate:
+                return False
+
+        rate_limit = self.rate_limits.get(event)
+        if rate_limit:
+            now = time.monotonic()
+            window = self.windows.get(event)
+            if window is None or now - window[0] >= 1.0:
+                window = self.windows[event] = [now, 0]
+            if window[1] >= rate_limit:
+                return False
+            window[1] += 1
+        return True
+
+    def debug(self, event, msg, *args, **fields):
+        self.log(logging.DEBUG, event, msg, *args, **fields)
+
+    def info(self, event, msg, *args, **fields):
+        self.log(logging.INFO, event, msg, *args, **fields)
+
+    def warning(self, event, msg, *args, **fields):
+        self.log(logging.WARNING, event, msg, *args, **fields)
+
+    def error(self, event, msg, *args, **fields):
+        self.log(logging.ERROR, event, msg, *args, **fields)
+
+
+_event_loggers = weakref.WeakKeyDictionary()
+
+
+def get_event_logger(spider):
+    """
+    Returns the EventLogger of a spider, built from its settings on first use,
+    so every component logging the same event shares one rate limit.
+    """
+    event_logger = _event_loggers.get(spider)
+    if event_logger is None:
+        settings = getattr(spider, "settings", None)
+        if settings is not None:
+            event_logger = EventLogger.from_settings(spider.logger, settings)
+        else:
+            event_logger = EventLogger(spider.logger)
+        _event_loggers[spider] = event_logger
+    return event_logger
@@ -0,0 +1,105 @@
+import multiprocessing
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+from scrapy.http import HtmlResponse
+from scrapy.utils.defer import maybe_deferred_to_future
+from twisted.internet import defer
+
+
+def run_extractor(extractor, url, body, encoding):
+    """
+    Worker side of an offloaded extraction: rebuilds the response and runs the extractor on it.
+
+    extractor must be a module-level function taking a response and returning picklable data (e.g. a dict of
+    item fields), as it is sent to the worker by reference and its result is sent back pickled.
+    """
+    return extractor(HtmlResponse(url=url, body=body, encoding=encoding))
+
+
+class ProcessOffloader:
+    """
+    Runs CPU-heavy work in a pool of worker processes, returning Deferreds to the reactor.
+
+    - At most max_in_flight tasks are submitted at once, further calls wait on a DeferredSemaphore,
+      so a burst of responses can't pile up unbounded bodies in the pool's queue
+    - Workers are spawned rather than forked, a forked child would inherit the running reactor and its threads
+    """
+
+    def __init__(self, max_workers=None, max_in_flight=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or self.max_workers * 2
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        self.semaphore = defer.DeferredSemaphore(self.max_in_flight)
+
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+
+    def submit(self, function, *args):
+        """
+        Runs function(*args) in a worker once a slot is free, returns a Deferred firing with its result.
+        """
+        return self.semaphore.run(self._submit, function, *args)
+
+    def _submit(self, function, *args):
+        from twisted.internet import reactor
+
+        deferred = defer.Deferred()
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        future = self.executor.submit(function, *args)
+        # Done callbacks run in the executor's management thread, results are handed back on the reactor thread
+        future.add_done_callback(lambda done: reactor.callFromThread(self._resolve, deferred, done))
+        return deferred
+
+    def _resolve(self, deferred, future):
+        self.in_flight -= 1
+        error = future.exception()
+        if error is not None:
+            self.failed += 1
+            deferred.errback(error)
+        else:
+            self.completed += 1
+            deferred.callback(future.result())
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self):
+        return {
+            "workers": self.max_workers,
+            "completed": self.completed,
+            "failed": self.failed,
+            "peak_in_flight": self.peak_in_flight,
+        }
+
+
+_offloaders = weakref.WeakKeyDictionary()
+
+
+def register_offloader(crawler, offloader):
+    _offloaders[crawler] = offloader
+
+
+def get_offloader(spider):
+    """
+    Returns the ProcessOffloader of the spider's crawler, or None when PROCESS_OFFLOAD_ENABLED is off.
+    """
+    crawler = getattr(spider, "crawler", None)
+    return _offloaders.get(crawler) if crawler is not None else None
+
+
+async def extract(spider, extractor, response):
+    """
+    Runs extractor(response) in the process pool if offloading is enabled, otherwise inline.
+    Meant to be awaited from async spider callbacks, e.g. fields = await offload.extract(self, extract_fields, response)
+    """
+    offloader = get_offloader(spider)
+    if offloader is None:
+        return extractor(response)
+    return await maybe_deferred_to_future(
+        offloader.submit(run_extractor, extractor, response.url, response.body, response.encoding))
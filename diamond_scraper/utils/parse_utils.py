@@ -0,0 +1,135 @@
+import re
+
+# Multipliers for the magnitude suffixes MarketWatch uses ("95.3M", "$1.2B")
+MAGNITUDE_SUFFIXES = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+
+# A whole numeric string: optional leading label ("Volume: "), sign, accounting parentheses, currency symbol,
+# thousands separators, exponent, magnitude suffix and percent sign. Matched with fullmatch(), so trailing text
+# ("12xyz", "Q3 2024") makes the value unparseable instead of yielding its first digits.
+NUMBER_PATTERN = re.compile(
+    r"(?:[A-Za-z][A-Za-z /.&']*:\s*)?"
+    r"(?P<sign>[-+−])?\s?(?P<open>\()?[$€£¥]?(?P<inner_sign>[-+−])?"
+    r"(?P<number>(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?(?:e[-+]?\d+)?|\.\d+)"
+    r"\s?(?P<suffix>[KMBT])?\s?(?P<percent>%)?(?P<close>\))?",
+    re.IGNORECASE
+)
+
+# Plain decimals ("245.10") make up most scraped values, float() handles them without the regex
+PLAIN_NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+# Separator of "low - high" ranges: a dash surrounded by spaces, or a bare dash between two numbers
+# ("245.01-251.20"), so the sign of a negative bound isn't mistaken for the separator
+RANGE_SEPARATOR_PATTERN = re.compile(r"\s+[-–—]\s+|(?<=[\d%KMBTkmbt])[-–—](?=[$€£¥+\d.])")
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def parse_number(value):
+    """
+    Parses a scraped numeric string into a float.
+
+    - "$1.2B" -> 1200000000.0, "Volume: 95.3M" -> 95300000.0, "-$2.10" -> -2.1
+    - Accounting parentheses are negative: "(1.5)" -> -1.5
+    - Percentages keep their percent units: "12.5%" -> 12.5
+    - Numbers are returned unchanged, anything else ("N/A", "", None, "12xyz", "Dec 5, 2025") returns None
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    value = str(value).strip()
+    if PLAIN_NUMBER_PATTERN.fullmatch(value):
+        return float(value)
+
+    match = NUMBER_PATTERN.fullmatch(value)
+    if not match or bool(match.group("open")) != bool(match.group("close")):
+        return None
+
+    number = float(match.group("number").replace(",", ""))
+    suffix = match.group("suffix")
+    if suffix:
+        number *= MAGNITUDE_SUFFIXES[suffix.upper()]
+    if match.group("sign") in ("-", "−") or match.group("inner_sign") in ("-", "−") or match.group("open"):
+        number = -number
+    return number
+
+
+def parse_integer(value):
+    """
+    Same as parse_number(), rounded to an int ("95.3M" -> 95300000).
+    """
+    number = parse_number(value)
+    return None if number is None else int(round(number))
+
+
+# Parsers used to coerce values before they are stored in typed columns
+SQL_TYPE_PARSERS = {
+    "REAL": parse_number,
+    "INTEGER": parse_integer,
+}
+
+
+def parse_percent(value):
+    """
+    Parses a percentage, keeping percent units: "12.5%" -> 12.5, "-0.8 %" -> -0.8.
+    """
+    return parse_number(value)
+
+
+def split_range(value):
+    """
+    Splits a "low - high" range string into its two raw bounds ("245.01 - 251.20" -> ("245.01", "251.20")),
+    or returns None if the value isn't a range.
+    """
+    if value is None:
+        return None
+    parts = RANGE_SEPARATOR_PATTERN.split(str(value).strip(), maxsplit=1)
+    if len(parts) != 2:
+        return None
+    return parts[0].strip(), parts[1].strip()
+
+
+def parse_range(value):
+    """
+    Parses a "low - high" range into a (low, high) tuple of floats: "$1.2B - $3.4B" -> (1200000000.0, 3400000000.0).
+    Returns None if the value isn't a range or a bound can't be parsed.
+    """
+    bounds = split_range(value)
+    if bounds is None:
+        return None
+    low, high = parse_number(bounds[0]), parse_number(bounds[1])
+    if low is None or high is None:
+        return None
+    return low, high
+
+
+def normalize_text(value):
+    """
+    Strips a text value and collapses inner whitespace: " Tesla\n  Inc. " -> "Tesla Inc.".
+    """
+    if value is None:
+        return None
+    return WHITESPACE_PATTERN.sub(" ", str(value)).strip() or None
+
+
+def normalize_symbol(value):
+    """
+    Normalizes a ticker symbol: " tsla " -> "TSLA".
+    """
+    text = normalize_text(value)
+    return text.upper() if text else None
+
+
+# Normalizers selectable with Field(normalizer=...), see NormalizationPipeline.
+# "currency" and "magnitude" name the shape of the scraped string, both go through parse_number()
+NORMALIZERS = {
+    "text": normalize_text,
+    "symbol": normalize_symbol,
+    "number": parse_number,
+    "integer": parse_integer,
+    "currency": parse_number,
+    "percent": parse_percent,
+    "magnitude": parse_number,
+    "range": parse_range,
+}
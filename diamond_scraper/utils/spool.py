@@ -0,0 +1,133 @@
+import json
+import logging
+import os
+import struct
+import threading
+
+from itemadapter import ItemAdapter
+from scrapy.utils.misc import load_object
+
+logger = logging.getLogger(__name__)
+
+# Every record is prefixed with its byte length as a 4 byte big-endian unsigned int
+RECORD_HEADER = struct.Struct(">I")
+
+
+class ItemSpool:
+    """
+    Append-only local file holding items that could not be written to the database.
+
+    Records are length-prefixed JSON objects: {"item_class": "module.Class", "fields": {...}}
+    - append() can be called from the reactor and the writer thread at the same time
+    - drain() moves the spool aside and yields its items back; the moved file is only deleted once every
+      item was taken, so a run interrupted mid-replay replays the rest on the next drain()
+    - A record cut short by a crash (torn tail) is skipped, every record before it is kept
+    """
+
+    def __init__(self, path, fsync=False):
+        self.path = path
+        self.replay_path = path + ".replay"
+        self.fsync = fsync
+        self.lock = threading.Lock()
+        self.pending = count_records(self.path) + count_records(self.replay_path)
+
+    def __len__(self):
+        return self.pending
+
+    def append(self, items):
+        """
+        Appends items to the spool in a single write. Returns the number of bytes written.
+        """
+        payload = bytearray()
+        for item in items:
+            record = json.dumps({
+                "item_class": f"{item.__class__.__module__}.{item.__class__.__qualname__}",
+                "fields": ItemAdapter(item).asdict(),
+            }, default=str, separators=(",", ":")).encode("utf-8")
+            payload += RECORD_HEADER.pack(len(record))
+            payload += record
+
+        with self.lock:
+            with open(self.path, "ab") as spool_file:
+                spool_file.write(payload)
+                if self.fsync:
+                    spool_file.flush()
+                    os.fsync(spool_file.fileno())
+            self.pending += len(items)
+        return len(payload)
+
+    def drain(self):
+        """
+        Yields every spooled item, oldest first, rebuilt as its original item class.
+        Items appended while draining are kept for the next drain().
+        """
+        for _ in range(2):  # An interrupted replay first, then the current spool
+            with self.lock:
+                if not os.path.exists(self.replay_path):
+                    if not os.path.exists(self.path):
+                        return
+                    os.replace(self.path, self.replay_path)
+
+            for record in read_records(self.replay_path):
+                item = load_item(record)
+                if item is not None:
+                    yield item
+
+            with self.lock:
+                os.remove(self.replay_path)
+                self.pending = count_records(self.path)
+
+
+def read_records(path):
+    """
+    Yields the decoded records of a spool file, stopping at a torn tail.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as spool_file:
+        while True:
+            header = spool_file.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                break
+            (length,) = RECORD_HEADER.unpack(header)
+            data = spool_file.read(length)
+            if len(data) < length:
+                logger.warning(f"Spool {path} ends with a truncated record, skipping it")
+                break
+            try:
+                yield json.loads(data)
+            except ValueError as e:
+                logger.error(f"Skipping unreadable spool record in {path}: {e}")
+
+
+def count_records(path):
+    """
+    Counts the complete records of a spool file by walking the length prefixes.
+    """
+    if not os.path.exists(path):
+        return 0
+    count = 0
+    size = os.path.getsize(path)
+    with open(path, "rb") as spool_file:
+        while True:
+            header = spool_file.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                break
+            (length,) = RECORD_HEADER.unpack(header)
+            if spool_file.tell() + length > size:
+                break
+            spool_file.seek(length, os.SEEK_CUR)
+            count += 1
+    return count
+
+
+def load_item(record):
+    """
+    Rebuilds an item from a spool record, or returns None if its class can't be restored.
+    """
+    try:
+        item_class = load_object(record["item_class"])
+        return item_class(**record["fields"])
+    except Exception as e:
+        logger.error(f"Unable to restore spooled {record.get('item_class')} item: {e}")
+        return None
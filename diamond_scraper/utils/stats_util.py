@@ -1,3 +1,8 @@
+import heapq
+import random
+from collections import deque
+
+
 def get_stat(spider, stat_name: str, default=None):
     """
     Fetches the current value of a tracked statistic.
@@ -12,10 +17,18 @@ def increment_stat(spider, stat_name: str, value: int = 1):
     spider.crawler.stats.inc_value(stat_name, count=value)
 
 
+def max_stat(spider, stat_name: str, value):
+    """
+    Stores the value if it is larger than the current value of the statistic.
+    """
+    spider.crawler.stats.max_value(stat_name, value)
+
+
 def append_to_stat(spider, stat_name: str, data: dict):
     """
     Appends a dictionary to a list-based statistic.
     Ensures stats are stored as lists and retains previous entries.
+    The list grows for the whole run, prefer the bounded helpers below for per-item data.
     """
     current = get_stat(spider, stat_name, default=[])
     if not isinstance(current, list):
@@ -23,3 +36,98 @@ def append_to_stat(spider, stat_name: str, data: dict):
 
     current.append(data)
     spider.crawler.stats.set_value(stat_name, current)
+
+
+def append_to_ring(spider, stat_name: str, data, size: int = 20):
+    """
+    Appends to a ring buffer statistic, a deque keeping only the last `size` entries.
+    """
+    ring = get_stat(spider, stat_name)
+    if not isinstance(ring, deque):
+        ring = deque(maxlen=size)
+        spider.crawler.stats.set_value(stat_name, ring)
+    ring.append(data)
+
+
+class ReservoirSample:
+    """
+    Uniform random sample of at most `size` entries out of everything added (reservoir sampling, Algorithm R).
+    """
+
+    def __init__(self, size: int, rng: random.Random = None):
+        self.size = size
+        self.items = []
+        self.seen = 0
+        self.random = rng or random.Random()
+
+    def add(self, data):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(data)
+        else:
+            # Every entry seen so far ends up in the sample with the same probability, size / seen
+            index = self.random.randrange(self.seen)
+            if index < self.size:
+                self.items[index] = data
+
+    def __repr__(self):
+        return f"{self.items!r} (sampled from {self.seen})"
+
+
+def add_to_sample(spider, stat_name: str, data, size: int = 20):
+    """
+    Adds to a reservoir sample statistic, keeping `size` entries picked uniformly from the whole run.
+    """
+    sample = get_stat(spider, stat_name)
+    if not isinstance(sample, ReservoirSample):
+        sample = ReservoirSample(size)
+        spider.crawler.stats.set_value(stat_name, sample)
+    sample.add(data)
+
+
+class TopK:
+    """
+    Approximate k most frequent values in constant memory (Space-Saving algorithm).
+    At most `capacity` values are counted, a new value replaces the least counted one and inherits its count,
+    so counts can be overestimated for rare values but frequent ones are never missed.
+    """
+
+    def __init__(self, k: int, capacity: int = None):
+        self.k = k
+        self.capacity = capacity or k * 10
+        self.counts = {}
+
+    def add(self, value, count: int = 1):
+        counts = self.counts
+        if value in counts:
+            counts[value] += count
+        elif len(counts) < self.capacity:
+            counts[value] = count
+        else:
+            evicted = min(counts, key=counts.get)
+            counts[value] = counts.pop(evicted) + count
+
+    def most_common(self) -> list:
+        return heapq.nlargest(self.k, self.counts.items(), key=lambda entry: entry[1])
+
+    def __repr__(self):
+        return repr(self.most_common())
+
+
+def add_to_top_k(spider, stat_name: str, value, k: int = 10):
+    """
+    Counts a value in a top-k statistic, keeping the k most frequent values of the run.
+    """
+    top_k = get_stat(spider, stat_name)
+    if not isinstance(top_k, TopK):
+        top_k = TopK(k)
+        spider.crawler.stats.set_value(stat_name, top_k)
+    top_k.add(value)
+
+
+def count_by_field(spider, stat_name: str, fields):
+    """
+    Increments one counter per field, stored as "<stat_name>/<field>".
+    """
+    for field in fields:
+        spider.crawler.stats.inc_value(f"{stat_name}/{field}")
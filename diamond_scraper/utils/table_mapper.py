@@ -0,0 +1,98 @@
+import re
+
+from lxml import etree
+from parsel.csstranslator import css2xpath
+
+# Direct text nodes of an element, like the CSS "::text" pseudo-element
+TEXT = etree.XPath("text()", smart_strings=False)
+
+# Trailing "(Old)" / "(New)" style annotations, stripped from labels
+LABEL_ANNOTATION = re.compile(r"\s*\([^)]*\)\s*$")
+
+
+def normalize_label(label):
+    """
+    Lower-cases a row label, collapses whitespace and drops a trailing parenthesized annotation,
+    so "User Agent <span>(Old)</span>" and "user agent" map to the same field.
+    """
+    label = " ".join(label.split()).lower()
+    return LABEL_ANNOTATION.sub("", label)
+
+
+def cell_text(cell, default=None):
+    """
+    First direct text node of a cell (stripped), or default.
+    """
+    texts = TEXT(cell)
+    return texts[0].strip() if texts and texts[0] else default
+
+
+class TableMapper:
+    """
+    Maps the rows of one or more HTML tables to item fields by row label, in a single pass over each table's rows.
+
+    Tables are declared with add_table(name, root, labels, reader):
+    - root is a CSS selector for the table element, the first match on the page is read
+    - labels maps row labels (as normalize_label() returns them) to field names
+    - reader(cells) turns the <td>/<th> elements of a matching row into the field value
+    The label is the text of a row's first cell. Every table only matches its own labels, so a row of one table
+    never fills a field of another. Rows with an unknown label (headers, new tests) are skipped and the first row
+    per label wins, so reordered or added rows don't shift any field.
+    """
+
+    def __init__(self):
+        self.tables = {}  # name -> {"root": compiled selector, "labels": {label: field}, "reader": reader}
+
+    def add_table(self, name, root, labels, reader):
+        """
+        Declares a table, raises ValueError for a duplicate table name, two labels normalizing to the same one,
+        or a field already mapped by another table.
+        """
+        if name in self.tables:
+            raise ValueError(f"Table {name} is already declared")
+        fields = {field: table for table, declared in self.tables.items() for field in declared["labels"].values()}
+        normalized = {}
+        for label, field in labels.items():
+            key = normalize_label(label)
+            if key in normalized:
+                raise ValueError(f"Table {name}: label {label!r} duplicates the label of {normalized[key]}")
+            if field in fields:
+                raise ValueError(f"Table {name}: field {field} is already mapped by table {fields[field]}")
+            normalized[key] = field
+        self.tables[name] = {"root": etree.XPath(css2xpath(root)), "labels": normalized, "reader": reader}
+        return self
+
+    def map(self, root):
+        """
+        Returns {field: value} for every declared row found in its table below root (an lxml element).
+        """
+        fields = {}
+        for table in self.tables.values():
+            elements = table["root"](root)
+            if not elements:
+                continue
+            labels, reader = table["labels"], table["reader"]
+            remaining = len(labels)
+            for row in elements[0].iter("tr"):
+                cells = [cell for cell in row if cell.tag in ("td", "th")]
+                if not cells:
+                    continue
+                field = labels.get(normalize_label(cells[0].text_content()))
+                if field is None or field in fields:
+                    continue
+                fields[field] = reader(cells)
+                remaining -= 1
+                if not remaining:
+                    break
+        return fields
+
+    def missing(self, fields):
+        """
+        Returns {table name: [labels]} of the declared rows absent from a map() result, empty if complete.
+        """
+        missing = {}
+        for name, table in self.tables.items():
+            absent = [label for label, field in table["labels"].items() if field not in fields]
+            if absent:
+                missing[name] = absent
+        return missing
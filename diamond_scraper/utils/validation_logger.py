@@ -1,8 +1,24 @@
+import logging
+from collections.abc import MutableMapping
 from enum import Enum
 from itemadapter import ItemAdapter
 from scrapy.exceptions import DropItem
 import diamond_scraper.utils.stats_util as stats_util
 
+# Numeric levels for the "level" names of logging rules, unknown names log at info like before
+LOG_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "warn": logging.WARNING,
+    "error": logging.ERROR,
+    "exception": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
+# Compiled rule sets kept per ValidationLogger before the cache is reset (pipelines building rules per item)
+MAX_COMPILED_RULE_SETS = 32
+
 class ValidationLogger:
     def __init__(self, spider, enable_logging=False, pipline_name=None, logging_rules=None, threshold_rules=None,
                  default_rules=None):
@@ -32,6 +48,7 @@ class ValidationLogger:
             "ITEM_OUTPUT": {"log": True, "level": "debug", "store": False},  # Processed item after validation
             "FLAGGED_ITEMS": {"log": True, "level": "debug", "store": True},  # Stores flagged items
             "DROPPED_ITEMS": {"log": True, "level": "debug", "store": True},  # Stores dropped items
+            "INVALID_ITEMS": {"log": True, "level": "debug", "store": True},  # Stores invalid values
         }
 
         # Defines thresholds for validation failures before item is dropped, set value to None to never drop items
@@ -58,6 +75,21 @@ class ValidationLogger:
                 if key not in THRESHOLD_RULES:
                     raise KeyError(f"Invalid threshold rule: {key}")
 
+        # Resolved once, so per-item logging is a dict lookup and a level check
+        # spider.logger builds a new adapter on every access
+        self.logger = spider.logger
+        self.log_levels = {event: LOG_LEVELS.get(config.get("level", "info"), logging.INFO)
+                           for event, config in self.logging_rules.items() if config.get("log", False)}
+        self.stored_events = {event for event, config in self.logging_rules.items() if config.get("store", False)}
+
+        # Stored items are kept in bounded stats (ring buffers, reservoir samples), sized by STATS_SAMPLE_SIZE
+        settings = getattr(spider, "settings", None)
+        self.sample_size = settings.getint("STATS_SAMPLE_SIZE", 20) if settings is not None else 20
+
+        # Rule chains compiled per rule set, see get_compiled_rules()
+        self.default_chain = tuple(self.default_rules.values())
+        self.compiled_rules = {}
+
     def process_item(self, item: dict, rules: dict[str, callable]) -> dict:
         """
         High-level flow method that:
@@ -92,69 +124,103 @@ class ValidationLogger:
         :return: Dict containing failed validations and modified values (if applicable)
         """
 
-        self.log_event("ITEM_INPUT", "Item input before validation: {}", item)
-
-        if self.logging_rules.get("ITEM_INPUT", {}).get("store", False):
-            stats_util.append_to_stat(self.spider, "ITEM_INPUT", item)
-
-        adapter = ItemAdapter(item)
+        adapter = self.adapt_item(item)
+        chains, fallback_chain = self.get_compiled_rules(rules, use_universal_default_rules)
         flagged_values = {}
         invalid_values = {}
 
-        # Helper function to process validation results
-        def _process_validation_result(field, result):
-            """
-            Determines whether a field is clean, suspicious, or invalid.
-            - result must be either (is_valid, new_value) or just a boolean.
-            """
-            if isinstance(result, tuple):
-                is_valid, new_value = result
-                if is_valid is None:
-                    flagged_values[field] = adapter[field]  # Suspicious but not invalid
-                    self.log_event("FIELD_FLAGGED", "Field {} has been flagged as suspicious", field)
-                elif not is_valid:
-                    invalid_values[field] = adapter[field]  # Invalid and should be dropped
-                    self.log_event("FIELD_FAILURE", "Field {} has failed validation", field)
-                else:
-                    adapter[field] = new_value  # Valid and can be cleaned
-            elif isinstance(result, bool):
-                if not result:
-                    invalid_values[field] = adapter[field]  # Invalid field
-                    self.log_event("FIELD_FAILURE", "Field {} has failed validation", field)
-            elif result is None:
-                flagged_values[field] = adapter[field]  # Suspicious but not invalid
-                self.log_event("FIELD_FLAGGED", "Field {} has been flagged as suspicious", field)
-            else:
-                raise ValueError(f"Invalid return type from validation rule for {field}")
-
-        # Apply validation rules to each field
+        # Apply each field's rule chain
         for key, value in adapter.items():
-            try:
-                if key in rules:
-                    # Apply default rules if enabled
-                    if use_universal_default_rules:
-                        for function in self.default_rules.values():
-                            _process_validation_result(key, function(value))
+            chain = chains.get(key, fallback_chain)
+            if chain:
+                self.apply_chain(adapter, key, value, chain, flagged_values, invalid_values)
+
+        return self.unadapt_item(adapter), {"flagged": flagged_values, "invalid": invalid_values}
 
-                    _process_validation_result(key, rules[key](value))
+    def adapt_item(self, item) -> MutableMapping:
+        """
+        Logs (and stores) the input item and returns the mapping validation rules write to.
+        """
+        self.log_event("ITEM_INPUT", "Item input before validation: {}", item)
 
-                # Apply default rules if they are not ignored and no custom rule exists
-                elif not use_universal_default_rules:
-                    for function in self.default_rules.values():
-                        _process_validation_result(key, function(value))
+        if "ITEM_INPUT" in self.stored_events:
+            stats_util.append_to_ring(self.spider, "ITEM_INPUT", item, self.sample_size)
 
-            except Exception as e:
-                self.spider.logger.error(f"Error validating item {key}: {value}, Exception: {e}")
-                invalid_values[key] = value  # Treat validation failure as failed if exception occurs
+        # Dicts and Scrapy Items are mutable mappings already, other item types need an adapter
+        return item if type(item) is dict or isinstance(item, MutableMapping) else ItemAdapter(item)
 
-        # Un-adapt the item
+    def unadapt_item(self, adapter: MutableMapping) -> dict:
+        """
+        Returns the validated item as a dict, logging (and storing) it.
+        """
         item = dict(adapter)
         self.log_event("ITEM_OUTPUT", "Item output after validation: {}", item)
 
-        if self.logging_rules.get("ITEM_OUTPUT", {}).get("store", False):
-            stats_util.append_to_stat(self.spider, "ITEM_OUTPUT", item)
+        if "ITEM_OUTPUT" in self.stored_events:
+            stats_util.append_to_ring(self.spider, "ITEM_OUTPUT", item, self.sample_size)
+
+        return item
+
+    def apply_chain(self, adapter: MutableMapping, key: str, value, chain: tuple, flagged_values: dict,
+                    invalid_values: dict) -> None:
+        """
+        Runs a field's rule chain, recording the field in flagged_values/invalid_values or writing back
+        its cleaned value. Results are either (is_valid, new_value) or just a boolean.
+        """
+        try:
+            for function in chain:
+                result = function(value)
+                if isinstance(result, tuple):
+                    is_valid, new_value = result
+                    if is_valid is None:
+                        flagged_values[key] = adapter[key]  # Suspicious but not invalid
+                        self.log_event("FIELD_FLAGGED", "Field {} has been flagged as suspicious", key)
+                    elif not is_valid:
+                        invalid_values[key] = adapter[key]  # Invalid and should be dropped
+                        self.log_event("FIELD_FAILURE", "Field {} has failed validation", key)
+                    else:
+                        adapter[key] = new_value  # Valid and can be cleaned
+                elif isinstance(result, bool):
+                    if not result:
+                        invalid_values[key] = adapter[key]  # Invalid field
+                        self.log_event("FIELD_FAILURE", "Field {} has failed validation", key)
+                elif result is None:
+                    flagged_values[key] = adapter[key]  # Suspicious but not invalid
+                    self.log_event("FIELD_FLAGGED", "Field {} has been flagged as suspicious", key)
+                else:
+                    raise ValueError(f"Invalid return type from validation rule for {key}")
+
+        except Exception as e:
+            self.logger.error("Error validating item %s: %s, Exception: %s", key, value, e)
+            invalid_values[key] = value  # Treat validation failure as failed if exception occurs
+
+    def get_compiled_rules(self, rules: dict[str, callable], use_universal_default_rules=True) \
+            -> (dict[str, tuple], tuple):
+        """
+        Flattens a rule set and the default rules into the chain of callables each field runs,
+        compiled once per rule set instead of re-deciding for every field of every item.
 
-        return item, {"flagged": flagged_values, "invalid": invalid_values}
+        :return: (field -> chain, chain for fields without a rule)
+        Rule sets are expected not to change once used, a change in their size triggers a recompile.
+        """
+        cache_key = (id(rules), use_universal_default_rules)
+        cached = self.compiled_rules.get(cache_key)
+        # The cache holds a reference to the rules, so their id can't be reused by another dict
+        if cached is not None and cached[0] is rules and cached[1] == len(rules):
+            return cached[2], cached[3]
+
+        if use_universal_default_rules:
+            # Default rules run before the custom rule, fields without one are left alone
+            chains = {field: self.default_chain + (rule,) for field, rule in rules.items()}
+            fallback_chain = ()
+        else:
+            chains = {field: (rule,) for field, rule in rules.items()}
+            fallback_chain = self.default_chain
+
+        if len(self.compiled_rules) >= MAX_COMPILED_RULE_SETS:
+            self.compiled_rules.clear()
+        self.compiled_rules[cache_key] = (rules, len(rules), chains, fallback_chain)
+        return chains, fallback_chain
 
     def should_drop_item(self, validation_results: dict) -> bool:
         """
@@ -215,17 +281,22 @@ class ValidationLogger:
 
         self.log_event("INVALID_ITEMS", "Invalid values: {}", invalid_values)
 
-        if self.logging_rules.get("TOTAL_FLAGGED", {}).get("store", False):
+        if "TOTAL_FLAGGED" in self.stored_events:
             stats_util.increment_stat(self.spider, StatEnum.TOTAL_FLAGGED.value, num_flagged_items)
 
-        if self.logging_rules.get("TOTAL_INVALID", {}).get("store", False):
+        if "TOTAL_INVALID" in self.stored_events:
             stats_util.increment_stat(self.spider, StatEnum.TOTAL_INVALID.value, num_invalid_items)
 
-        if self.logging_rules.get("FLAGGED_ITEMS", {}).get("store", False):
-            stats_util.append_to_stat(self.spider, StatEnum.FLAGGED_ITEMS.value, flagged_values)
+        # Constant memory however long the run: a sample of examples, counts per field, the most common bad values
+        if "FLAGGED_ITEMS" in self.stored_events and flagged_values:
+            stats_util.add_to_sample(self.spider, StatEnum.FLAGGED_ITEMS.value, flagged_values, self.sample_size)
+            stats_util.count_by_field(self.spider, StatEnum.FLAGGED_FIELDS.value, flagged_values)
 
-        if self.logging_rules.get("INVALID_ITEMS", {}).get("store", False):
-            stats_util.append_to_stat(self.spider, StatEnum.INVALID_ITEMS.value, invalid_values)
+        if "INVALID_ITEMS" in self.stored_events and invalid_values:
+            stats_util.add_to_sample(self.spider, StatEnum.INVALID_ITEMS.value, invalid_values, self.sample_size)
+            stats_util.count_by_field(self.spider, StatEnum.INVALID_FIELDS.value, invalid_values)
+            for field, value in invalid_values.items():
+                stats_util.add_to_top_k(self.spider, StatEnum.INVALID_VALUES_TOP.value, f"{field}={value!r}")
 
     def log_event(self, event_name: str, message_template: str, *args, **kwargs):
         """
@@ -235,20 +306,12 @@ class ValidationLogger:
         :param args: Positional arguments for formatting.
         :param kwargs: Keyword arguments for formatting.
         """
-
-        if not self.enable_logging:
+        # Events that aren't logged, or are below the logger's level, are never formatted
+        level = self.log_levels.get(event_name)
+        if level is None or not self.logger.isEnabledFor(level):
             return
 
-        log_config = self.logging_rules.get(event_name, {"log": False, "level": "info"})
-
-        if log_config.get("log", False):
-            log_level = log_config.get("level", "info")
-
-            # Dynamically format message with provided arguments
-            formatted_message = message_template.format(*args, **kwargs)
-
-            # Log according to provided specifications
-            getattr(self.spider.logger, log_level, self.spider.logger.info)(formatted_message)
+        self.logger.log(level, message_template.format(*args, **kwargs))
 
 
 def track_db_event(self, event: Enum, message: str = None, level: str = "info"):
@@ -295,6 +358,7 @@ class StatEnum(Enum):
     # Field-level tracking
     FLAGGED_FIELDS = "custom/flagged_fields"
     INVALID_FIELDS = "custom/invalid_fields"
+    INVALID_VALUES_TOP = "custom/invalid_values_top"
 
     # Debugging and Item Flow Tracking
     ITEM_INPUT = "custom/item_input"
@@ -308,3 +372,29 @@ class StatEnum(Enum):
     DB_TABLE_CREATE_FAILED = "custom/db_table_create_failed"
     DB_INSERT_SUCCESS = "custom/db_insert_success"
     DB_INSERT_FAILED = "custom/db_insert_failed"
+    DB_VALUES_UNPARSED = "custom/db_values_unparsed"
+
+    # Database batch tracking
+    DB_ROWS_INSERTED = "custom/db_rows_inserted"
+    DB_BATCHES_FLUSHED = "custom/db_batches_flushed"
+    DB_BATCH_SIZE_MAX = "custom/db_batch_size_max"
+    DB_FLUSH_LATENCY_MS_TOTAL = "custom/db_flush_latency_ms_total"
+    DB_FLUSH_LATENCY_MS_MAX = "custom/db_flush_latency_ms_max"
+
+    # Database connection pool tracking
+    DB_POOL_WAIT_MS_TOTAL = "custom/db_pool_wait_ms_total"
+    DB_POOL_WAIT_MS_MAX = "custom/db_pool_wait_ms_max"
+    DB_POOL_SIZE = "custom/db_pool_size"
+    DB_POOL_PEAK_IN_USE = "custom/db_pool_peak_in_use"
+    DB_POOL_UTILISATION = "custom/db_pool_utilisation"
+    DB_POOL_RECONNECTS = "custom/db_pool_reconnects"
+
+    # Database writer thread tracking
+    DB_WRITER_QUEUE_MAX = "custom/db_writer_queue_max"
+    DB_WRITER_BACKPRESSURE = "custom/db_writer_backpressure"
+
+    # Database spool tracking
+    DB_ITEMS_SPOOLED = "custom/db_items_spooled"
+    DB_ITEMS_REPLAYED = "custom/db_items_replayed"
+    DB_SPOOL_BYTES = "custom/db_spool_bytes"
+    DB_SPOOL_PENDING = "custom/db_spool_pending"
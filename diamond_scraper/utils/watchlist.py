@@ -0,0 +1,105 @@
+import hashlib
+import re
+
+import psycopg2
+
+from diamond_scraper.utils import db_utils
+
+# Ticker source read from the database instead of a file, "db" or "db:<table>"
+DB_SOURCE = "db"
+DB_DEFAULT_TABLE = "stockitem"  # Table the DB pipeline stores StockItems in (or its partitions, see ticker_tables)
+
+
+def read_ticker_file(path):
+    """
+    Yields the tickers of a watchlist file one at a time, without loading the whole file.
+
+    - One ticker per line, blank lines and lines starting with # are skipped
+    - Tickers are stripped and upper-cased
+    """
+    with open(path, encoding="utf-8") as watchlist:
+        for line in watchlist:
+            ticker = line.strip()
+            if ticker and not ticker.startswith("#"):
+                yield ticker.upper()
+
+
+def read_ticker_table(connection, table, column="tickerSymbol", batch_size=1000):
+    """
+    Yields the distinct tickers stored in a database column, batch_size at a time.
+
+    - Each batch is one short, fully fetched keyset query (WHERE column > last ORDER BY column LIMIT n), so no
+      statement stays open while the spider consumes the tickers. On SQLite an open SELECT holds a SHARED lock,
+      and the DatabasePipeline writing to the same file would fail with "database is locked"
+    - On SQLite with DB_PARTITIONS the rows live in per-day/month tables (see ticker_tables()), read together
+    """
+    postgres = isinstance(connection, psycopg2.extensions.connection)
+    placeholder = "%s" if postgres else "?"
+    tables = [table] if postgres else ticker_tables(connection, table)
+    source = " UNION ".join(f"SELECT {column} FROM {name} WHERE {column} > {placeholder}" for name in tables)
+    query = f"SELECT DISTINCT {column} FROM ({source}) AS tickers ORDER BY {column} LIMIT {batch_size}"
+
+    last = ""
+    while True:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(query, (last,) * len(tables))
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        if not rows:
+            return
+        for (ticker,) in rows:
+            yield str(ticker).strip().upper()
+        if len(rows) < batch_size:
+            return
+        last = rows[-1][0]
+
+
+def ticker_tables(connection, table):
+    """
+    SQLite tables holding the rows of a table: the table itself, or its time partitions (stockitem_2025_01_02,
+    stockitem_2025_01) when DB_PARTITIONS split it. Unknown tables are returned as is, so the query reports them.
+    """
+    cursor = connection.cursor()
+    try:
+        existing = db_utils.get_existing_tables(cursor)
+    finally:
+        cursor.close()
+    if table in existing:
+        return [table]
+    partition = re.compile(rf"{re.escape(table)}_\d{{4}}_\d{{2}}(?:_\d{{2}})?")
+    return sorted(name for name in existing if partition.fullmatch(name)) or [table]
+
+
+def is_db_source(source):
+    return source == DB_SOURCE or source.startswith(f"{DB_SOURCE}:")
+
+
+def db_source_table(source):
+    return source[len(DB_SOURCE) + 1:] or DB_DEFAULT_TABLE
+
+
+def shard_of(ticker, shards):
+    """
+    Stable shard number of a ticker in [0, shards), the same in every process and on every node
+    (unlike hash(), which is salted per interpreter).
+    """
+    digest = hashlib.md5(ticker.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shards
+
+
+def shard_tickers(tickers, shard=0, shards=1):
+    """
+    Filters a ticker iterable down to the given shard, lazily and without duplicates.
+    Running one crawl per shard number (0 .. shards - 1) covers every ticker exactly once.
+    """
+    if not 0 <= shard < shards:
+        raise ValueError(f"Shard {shard} is outside of 0..{shards - 1}")
+    seen = set()
+    for ticker in tickers:
+        if ticker in seen:
+            continue
+        seen.add(ticker)
+        if shards == 1 or shard_of(ticker, shards) == shard:
+            yield ticker
@@ -12,6 +12,7 @@ def parse_arguments():
 
     Supports:
     - Multiple spider names
+    - Spider arguments via `-a`
     - Logging control
     - Output destination and format
     - Dynamic Scrapy settings via `-s`
@@ -24,6 +25,10 @@ def parse_arguments():
     # Required positional arg: one or more spiders
     parser.add_argument('spiders', nargs='+', help='Spiders to run')
 
+    # Spider arguments
+    parser.add_argument('-a', '--spider-args', nargs='+',
+                        help='Spider arguments (e.g. -a tickers=watchlist.txt shard=0 shards=4)')
+
     # Optional settings overrides
     parser.add_argument('-s', '--settings', nargs='+', help='Override Scrapy settings (e.g. -s LOG_LEVEL=DEBUG)')
 
@@ -86,7 +91,7 @@ def run_spider(spider_name: str, args, env_settings: dict):
 
     Responsibilities:
     1. Build the base Scrapy CLI command.
-    2. Add output destination and format.
+    2. Add spider arguments, output destination and format.
     3. Inject Scrapy settings from both CLI and setup_environment().
     4. Respect CLI flags like --job-dir, --no-cache, and --dry-run.
     5. Execute or print the command based on --dry-run.
@@ -99,6 +104,10 @@ def run_spider(spider_name: str, args, env_settings: dict):
 
     command = ['scrapy', 'crawl', spider_name]
 
+    #  Spider arguments
+    for spider_arg in (args.spider_args or []):
+        command.extend(['-a', spider_arg])
+
     #  Output file logic 
     if args.output:
         command.extend(['-o', args.output])